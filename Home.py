@@ -1,6 +1,8 @@
 import streamlit as st
 from services.database_manager import DatabaseManager
 from services.auth_manager import AuthManager
+from services.session_store import SessionStore
+from services.password_strength import SCORE_LABELS
 
 
 st.set_page_config(page_title="Login / Register", page_icon="🔑", layout="centered")
@@ -18,6 +20,18 @@ if "username" not in st.session_state:
 
 st.title("🔐 Welcome")
 
+#connecting database through DatabaseManager class
+db = DatabaseManager()
+#ensure all tables (including sessions) are created, once per server process
+db.ensure_tables()
+#creating an instance of authentification
+auth_model = AuthManager(db=db)
+
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+
 # If already logged in, go straight to dashboard (optional)
 if st.session_state.logged_in:
     st.success(f"Already logged in as **{st.session_state.username}**.")
@@ -27,18 +41,14 @@ if st.session_state.logged_in:
     # Sidebar logout button
     with st.sidebar:
         if st.button("Log out   ➜]"):
+            auth_model.end_session(st.session_state.get("session_token"))
+            st.session_state.session_token = None
             st.session_state.logged_in = False
             st.session_state.username = ""
             st.info("You have been logged out.")
             st.switch_page("Home.py")
     st.stop() # Don’t show login/register again
 
-#connecting database through DatabaseManager class
-db = DatabaseManager()
-#creating an instance of authentification
-auth_model = AuthManager(db=db)
-
-
 # ---------- Tabs: Login / Register ----------
 tab_login, tab_register = st.tabs(["Login", "Register"])
 
@@ -52,13 +62,20 @@ with tab_login:
     if st.button("Log in", type="primary"):
     # Simple credential check (for teaching only – not secure!)
         users = st.session_state.users
-        login = auth_model.login_user(login_username, login_password)
-        if login == "username":
+        #client address for per-client rate limiting (not available on older Streamlit versions)
+        client_id = getattr(getattr(st, "context", None), "ip_address", None)
+        login = auth_model.login_user(login_username, login_password, client_id=client_id)
+        if login == "rate_limited":
+            st.error("Too many login attempts. Please wait a moment and try again.")
+        elif login == "busy":
+            st.warning("The server is busy checking other logins. Please try again in a few seconds.")
+        elif login == "username":
             st.error("Invalid username.")
         elif login == False:
             st.error("Invalid password")
         else:
             st.session_state.logged_in = True
+            st.session_state.session_token = auth_model.create_session(login_username)
             st.session_state.show_login_success = True
             st.session_state.username = login_username
             st.success(f"Welcome back, {login_username}! 🎉 ")
@@ -72,13 +89,15 @@ with tab_register:
     new_username = st.text_input("Choose a username", key="register_username").strip().capitalize()
     new_password = st.text_input("Choose a password", type="password", key="register_password")
     confirm_password = st.text_input("Confirm password", type="password", key="register_confirm")  
-    new_role = st.selectbox("Choose a role", ["User", "Admin", "Analyst", "Cyber Security Specialist", "Data Science Specialist", "It Specialist"])
+    new_role = st.selectbox("Choose a role", AuthManager.ROLES)
 
-    if st.button("💪🛡️Check Password Strength🛡️💪"):
-        if new_password:
-            st.info(auth_model.check_password_strength(new_password))
-        else:
-            st.error("❌Please enter password to check.❌")
+    #live password strength, recomputed on every rerun of the page
+    if new_password:
+        strength = auth_model.estimate_password_strength(new_password, new_username)
+        st.progress(strength.score / 4, text=f"💪🛡️Password strength: {SCORE_LABELS[strength.score]}🛡️💪")
+        st.caption(f"Estimated time to crack: {strength.crack_time_offline} from a stolen hash, {strength.crack_time_online} by trying logins.")
+        for tip in strength.feedback:
+            st.caption(f"💡{tip}")
 
     if st.button("Create account"):
         # Basic checks – again, just for teaching
@@ -96,6 +115,8 @@ with tab_register:
                 st.error("Your username must satisfy these conditions: username must have from 3 to 20 characters.\nUsername must be only letters or numbers.")
             elif state == "password":
                 st.error("Your password must satisfy these conditions: password must have from 8 to 24 characters long.\nPassword must contain at least one upper letter, one lower letter, one number, and one special character.")
+            elif state == "breached":
+                st.error("This password is one of the most used or appeared in a data breach. Choose another one.")
             else:
                 # "Save" user in our simple in-memory store
                 st.session_state.users[new_username] = new_password
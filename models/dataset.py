@@ -1,5 +1,9 @@
 from services.database_manager import DatabaseManager
+from models.records import DatasetRecord
+from services.time_series import bucket_expression, fill_periods
+from services.data_validation import ingest_csv_once
 from datetime import date
+from typing import Iterator
 import pandas as pd
 from pathlib import Path
 
@@ -66,6 +70,19 @@ class Dataset:
             ]
         )
 
+    #ITERATE DATASET RECORDS
+    def iter_dataset_records(self, batch_size: int = 1000) -> Iterator[DatasetRecord]:
+        """Yield all datasets as lightweight records, fetched from the database in batches."""
+        rows = self.__db.iter_rows(
+            """
+            SELECT id, dataset_name, category, source, last_updated, record_count, file_size_mb, created_at
+            FROM datasets_metadata
+            ORDER BY id DESC
+            """,
+            batch_size=batch_size,
+        )
+        return map(DatasetRecord._make, rows)
+
     #UPDATE RECORD COUNT
     def update_dataset_record_count(self, dataset_id, new_record_count):
         """Update the record count of a dataset."""
@@ -150,6 +167,161 @@ class Dataset:
         # Convert to DataFrame
         return pd.DataFrame(rows, columns=["category", "count"])
 
+    #GET STORAGE SUMMARY
+    def get_storage_summary(self, group_by: str = "category", as_of: str | None = None) -> pd.DataFrame:
+        """
+        Returns storage statistics per category or source, computed in SQL:
+        total/median/p90/max size in MB, total records and average staleness in days since last_updated.
+        """
+        valid_groups = ["category", "source"]
+        if group_by not in valid_groups:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_groups}")
+
+        query = f"""
+        WITH ranked AS (
+            SELECT {group_by} AS grp, file_size_mb, record_count,
+                   julianday(COALESCE(?, 'now')) - julianday(last_updated) AS stale_days,
+                   ROW_NUMBER() OVER (PARTITION BY {group_by} ORDER BY file_size_mb) AS rn,
+                   COUNT(*) OVER (PARTITION BY {group_by}) AS n
+            FROM datasets_metadata
+        )
+        SELECT grp,
+               MAX(n),
+               ROUND(SUM(file_size_mb), 2),
+               ROUND(MAX(CASE WHEN rn = (n * 50 + 99) / 100 THEN file_size_mb END), 2),
+               ROUND(MAX(CASE WHEN rn = (n * 90 + 99) / 100 THEN file_size_mb END), 2),
+               ROUND(MAX(file_size_mb), 2),
+               SUM(record_count),
+               CAST(AVG(stale_days) AS INTEGER)
+        FROM ranked
+        GROUP BY grp
+        ORDER BY SUM(file_size_mb) DESC
+        """
+        rows = self.__db.fetch_all(query, (as_of,))
+        return pd.DataFrame(
+            rows,
+            columns=[group_by, "datasets", "total_mb", "median_mb", "p90_mb", "max_mb", "total_records", "avg_stale_days"]
+        )
+
+    #GET STORAGE GROWTH
+    def get_storage_growth(self, granularity: str = "month", group_by: str | None = None, measure: str = "size_mb") -> pd.DataFrame:
+        """
+        Returns cumulative growth over time, built from the record count changes in the history table,
+        so records added after a dataset was created show up on the day they were added.
+        measure "records" sums the record counts; "size_mb" converts them to MB with each dataset's
+        current size per record (datasets without a record count contribute nothing).
+        The result is indexed by period, with one "total_mb"/"total_records" column or one column per group_by value.
+        """
+        valid_groups = ["category", "source"]
+        if group_by is not None and group_by not in valid_groups:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_groups}")
+        valid_measures = {
+            "size_mb": "h.delta * d.file_size_mb / NULLIF(d.record_count, 0)",
+            "records": "h.delta",
+        }
+        if measure not in valid_measures:
+            raise ValueError(f"Column '{measure}' is not valid. Choose from {list(valid_measures)}")
+
+        group_column = f"d.{group_by}" if group_by else ("'total_mb'" if measure == "size_mb" else "'total_records'")
+        query = f"""
+        SELECT {bucket_expression(granularity, "h.day")} AS period, {group_column} AS series,
+               COALESCE(SUM({valid_measures[measure]}), 0)
+        FROM dataset_record_history h
+        JOIN datasets_metadata d ON d.id = h.dataset_id
+        GROUP BY period, series
+        ORDER BY period
+        """
+        rows = self.__db.fetch_all(query)
+        df = pd.DataFrame(rows, columns=["period", "series", "added"])
+        added = df.pivot(index="period", columns="series", values="added").fillna(0)
+        added.columns.name = None
+        return fill_periods(added, granularity).cumsum().round(2)
+
+    #GET STALE AND LARGE DATASETS
+    def get_stale_large_datasets(self, min_stale_days: int = 365, min_size_mb: float = 0, top_k: int = 10, as_of: str | None = None) -> pd.DataFrame:
+        """
+        Returns the datasets not updated for at least min_stale_days, ranked by
+        size * staleness (MB-days), i.e. the most storage kept for the longest without updates.
+        """
+        rows = self.__db.fetch_all(
+            """
+            SELECT id, dataset_name, category, source, last_updated, record_count, file_size_mb,
+                   CAST(julianday(COALESCE(?, 'now')) - julianday(last_updated) AS INTEGER) AS stale_days
+            FROM datasets_metadata
+            WHERE last_updated <= date(COALESCE(?, 'now'), '-' || ? || ' days')
+              AND file_size_mb >= ?
+            ORDER BY file_size_mb * (julianday(COALESCE(?, 'now')) - julianday(last_updated)) DESC
+            LIMIT ?
+            """,
+            (as_of, as_of, int(min_stale_days), min_size_mb, as_of, top_k),
+        )
+        df = pd.DataFrame(
+            rows,
+            columns=["id", "dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb", "stale_days"]
+        )
+        df["mb_days"] = (df["file_size_mb"] * df["stale_days"]).round(0)
+        return df
+
+    #GET RECORD COUNT HISTORY
+    def get_record_count_history(self, dataset_id: int) -> pd.DataFrame:
+        """Returns the record count of a dataset on each day it changed, rebuilt from the stored deltas."""
+        rows = self.__db.fetch_all(
+            """
+            SELECT day, delta, SUM(delta) OVER (ORDER BY day) AS record_count
+            FROM dataset_record_history
+            WHERE dataset_id = ?
+            ORDER BY day
+            """,
+            (dataset_id,)
+        )
+        return pd.DataFrame(rows, columns=["day", "delta", "record_count"])
+
+    #GET GROWTH RATES
+    def get_growth_rates(self, group_by: str = "dataset_name", days: int = 90, forecast_days: int = 90, as_of: str | None = None) -> pd.DataFrame:
+        """
+        Returns the record count growth of each dataset (or category/source) over the last `days` days:
+        counts at the start and end of the window, records added per day and a linear forecast
+        of the count `forecast_days` after the end of the window.
+        """
+        valid_columns = ["dataset_name", "category", "source"]
+        if group_by not in valid_columns:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_columns}")
+
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT d.{group_by},
+                   SUM(CASE WHEN h.day <= date(COALESCE(?, 'now'), '-' || ? || ' days') THEN h.delta ELSE 0 END) AS start_count,
+                   SUM(h.delta) AS end_count
+            FROM dataset_record_history h
+            JOIN datasets_metadata d ON d.id = h.dataset_id
+            WHERE h.day <= date(COALESCE(?, 'now'))
+            GROUP BY d.{group_by}
+            """,
+            (as_of, int(days), as_of)
+        )
+        df = pd.DataFrame(rows, columns=[group_by, "start_count", "end_count"])
+        df["change"] = df["end_count"] - df["start_count"]
+        df["per_day"] = (df["change"] / max(days, 1)).round(2)
+        #growth relative to the start count, empty when the group started from zero
+        df["growth_pct"] = (df["change"] * 100 / df["start_count"].where(df["start_count"] != 0)).round(2)
+        df["forecast_count"] = (df["end_count"] + df["per_day"] * forecast_days).round(0)
+        return df.sort_values("per_day", ascending=False).reset_index(drop=True)
+
+    #GET DATASET PROFILES
+    def get_dataset_profiles(self) -> pd.DataFrame:
+        """Returns the stored file profiles (format, rows, size, content hash) of local datasets."""
+        rows = self.__db.fetch_all(
+            """
+            SELECT dataset_name, file_format, row_count, size_bytes, content_hash, profiled_at, path
+            FROM dataset_profiles
+            ORDER BY profiled_at DESC, dataset_name
+            """
+        )
+        return pd.DataFrame(
+            rows,
+            columns=["dataset_name", "file_format", "row_count", "size_bytes", "content_hash", "profiled_at", "path"]
+        )
+
     #MIGRATE CSV DATASETS TO DB
     def migrate_datasets(self):
         """Migrates all datasets info from the CSV file."""
@@ -159,19 +331,8 @@ class Dataset:
         DATA_DIR.mkdir(parents=True, exist_ok=True)
         DB_PATH = DATA_DIR / "datasets_metadata.csv"
 
-        df = pd.read_csv(DB_PATH)
-
-        if not df.empty:
-            for index, row in df.iterrows():
-                Dataset.insert_dataset(
-                    self,
-                    dataset_name=row["dataset_name"],
-                    category=row["category"],
-                    source=row["source"],
-                    last_updated=str(row["last_updated"]),
-                    record_count=int(row["record_count"]),
-                    file_size_mb=float(row["file_size_mb"]),
-                    created_at=str(row["created_at"])
-                )
-            return True
-        return False
\ No newline at end of file
+        #loaded once (datasets have no unique key), validated in chunks and bulk inserted
+        report = ingest_csv_once(self.__db, "dataset", DB_PATH)
+        if report is not None and not report.rejected.empty:
+            print(f"⚠️ {len(report.rejected)} dataset rows rejected: {report.rejected['reason'].value_counts().to_dict()}")
+        return report is not None and report.rows_read > 0
\ No newline at end of file
@@ -1,10 +1,19 @@
-from services.database_manager import DatabaseManager
+from services.database_manager import DatabaseManager, build_filter_clause
+from models.records import TicketRecord
+from services.time_series import bucket_expression, fill_periods
+from services.similarity_index import get_similarity_index
+from services.data_validation import ingest_csv_once
+from services.duplicate_detector import DuplicateDetector
 from pathlib import Path
+from typing import Iterable, Iterator
 import pandas as pd
 
 class ITTicket:
     """Represents an IT Tickets in the platform"""
 
+    #columns the duplicate index signs (see DuplicateDetector.DOMAINS)
+    DUPLICATE_TEXT_COLUMNS = ("subject", "description")
+
     #creating variables of the class
     def __init__(self, ticket_id: int, title: str, priority: str, status: str, assighned_to: str, db: DatabaseManager):
         self.__id = ticket_id
@@ -86,11 +95,28 @@ class ITTicket:
             ],
         )
     
+    #ITERATE TICKET RECORDS
+    def iter_ticket_records(self, batch_size: int = 1000) -> Iterator[TicketRecord]:
+        """Yield all tickets as lightweight records, fetched from the database in batches."""
+        rows = self.__db.iter_rows(
+            """
+            SELECT id, ticket_id, priority, status, category, subject, description,
+                   created_date, resolved_date, assigned_to, created_at
+            FROM it_tickets
+            ORDER BY id DESC
+            """,
+            batch_size=batch_size,
+        )
+        return map(TicketRecord._make, rows)
+
     #UPDATE TICKET
     def update_ticket(self, ticket_id: int, column: str, new_value) -> int:
         """Update a specific column of a ticket."""
         query = f"UPDATE it_tickets SET {column} = ? WHERE id = ?"
         result = self.__db.execute_query(query, (new_value, ticket_id))
+        #the duplicate index is signed from the subject and description
+        if result.rowcount and column in self.DUPLICATE_TEXT_COLUMNS:
+            DuplicateDetector(self.__db).reindex_records("ticket", [ticket_id])
         return result.rowcount
         
     #UPDATE STATUS
@@ -102,6 +128,47 @@ class ITTicket:
         )
         return result.rowcount
 
+    #BULK UPDATE TICKETS
+    def bulk_update_tickets(self, column: str, new_value, ticket_ids: Iterable[int] | None = None, filters: dict | None = None) -> int:
+        """
+        Sets one column on many tickets in a single transaction.
+        Targets the given ticket ids (the id column), or every ticket matching the filters ({column: value}).
+        Returns the number of updated tickets.
+        """
+        #validate column name
+        valid_columns = ["priority", "status", "category", "subject", "description", "created_date", "resolved_date", "assigned_to", "created_at"]
+        if column not in valid_columns:
+            raise ValueError(f"Column '{column}' is not valid. Choose from {valid_columns}")
+
+        #update by ids
+        if ticket_ids is not None:
+            ticket_ids = [int(ticket_id) for ticket_id in ticket_ids]
+            result = self.__db.execute_many(
+                f"UPDATE it_tickets SET {column} = ? WHERE id = ?",
+                ((new_value, ticket_id) for ticket_id in ticket_ids),
+            )
+            if column in self.DUPLICATE_TEXT_COLUMNS:
+                DuplicateDetector(self.__db).reindex_records("ticket", ticket_ids)
+            return result.rowcount
+
+        #update by filter, never the whole table by accident
+        if not filters:
+            raise ValueError("Provide ticket_ids or at least one filter.")
+        where, params = build_filter_clause(filters, valid_columns)
+        result = self.__db.execute_query(
+            f"UPDATE it_tickets SET {column} = ? WHERE {where}",
+            (new_value, *params),
+        )
+        #the update trigger dropped the old signatures of the matched tickets
+        if column in self.DUPLICATE_TEXT_COLUMNS:
+            DuplicateDetector(self.__db).index_new_records("ticket")
+        return result.rowcount
+
+    #BULK UPDATE STATUS
+    def bulk_update_ticket_status(self, ticket_ids: Iterable[int], new_status: str) -> int:
+        """Update the status of many tickets at once."""
+        return self.bulk_update_tickets("status", new_status, ticket_ids=ticket_ids)
+
     #DELETE TICKET
     def delete_ticket(self, ticket_id: int) -> int:
         """Delete a ticket from the database."""
@@ -145,6 +212,150 @@ class ITTicket:
             ],
         )
     
+    #GET TICKET TIME SERIES
+    def get_ticket_time_series(self, start: str | None = None, end: str | None = None, granularity: str = "day", group_by: str | None = None, metric: str = "opened") -> pd.DataFrame:
+        """
+        Returns tickets opened/closed per day/week/month read from the daily rollup table.
+        Without group_by the result has "opened" and "closed" columns,
+        with group_by it has one column per group_by value for the chosen metric.
+        """
+        valid_groups = ["category", "priority", "status"]
+        if group_by is not None and group_by not in valid_groups:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_groups}")
+        if metric not in ["opened", "closed"]:
+            raise ValueError("Metric must be 'opened' or 'closed'.")
+
+        period = bucket_expression(granularity)
+        if group_by is None:
+            query = f"""
+            SELECT {period} AS period, SUM(opened) AS opened, SUM(closed) AS closed
+            FROM ticket_daily_rollup
+            WHERE day != '' AND day >= COALESCE(?, day) AND day <= COALESCE(?, day)
+            GROUP BY period
+            ORDER BY period
+            """
+            rows = self.__db.fetch_all(query, (start, end))
+            series = pd.DataFrame(rows, columns=["period", "opened", "closed"]).set_index("period")
+        else:
+            query = f"""
+            SELECT {period} AS period, {group_by} AS series, SUM({metric}) AS count
+            FROM ticket_daily_rollup
+            WHERE day != '' AND day >= COALESCE(?, day) AND day <= COALESCE(?, day)
+            GROUP BY period, series
+            HAVING SUM({metric}) > 0
+            ORDER BY period
+            """
+            rows = self.__db.fetch_all(query, (start, end))
+            df = pd.DataFrame(rows, columns=["period", "series", "count"])
+            series = df.pivot(index="period", columns="series", values="count").fillna(0).astype(int)
+            series.columns.name = None
+        return fill_periods(series, granularity, start, end)
+
+    #GET SLA TARGETS
+    def get_sla_targets(self) -> pd.DataFrame:
+        """Returns the resolution target (in days) of each priority."""
+        rows = self.__db.fetch_all("SELECT priority, target_days FROM sla_targets ORDER BY target_days")
+        return pd.DataFrame(rows, columns=["priority", "target_days"])
+
+    #SET SLA TARGET
+    def set_sla_target(self, priority: str, target_days: float) -> int:
+        """Creates or changes the resolution target of a priority."""
+        result = self.__db.execute_query(
+            """
+            INSERT INTO sla_targets (priority, target_days) VALUES (?, ?)
+            ON CONFLICT (priority) DO UPDATE SET target_days = excluded.target_days
+            """,
+            (priority, target_days),
+        )
+        return result.rowcount
+
+    #GET SLA STATS
+    def get_sla_stats(self, group_by: str = "priority", as_of: str | None = None) -> pd.DataFrame:
+        """
+        Returns time-to-resolution statistics (in days) per priority, category or assignee, computed in SQL.
+        Median and p90 use the nearest-rank method. "breaches" counts resolved tickets that took longer
+        than their priority's SLA target, "open_breaches" counts unresolved tickets already past it.
+        Tickets whose priority has no SLA target count as resolved but never as breaches.
+        """
+        valid_groups = ["priority", "category", "assigned_to"]
+        if group_by not in valid_groups:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_groups}")
+
+        query = f"""
+        WITH resolved AS (
+            SELECT t.{group_by} AS grp,
+                   julianday(t.resolved_date) - julianday(t.created_date) AS days,
+                   s.target_days
+            FROM it_tickets t
+            LEFT JOIN sla_targets s ON s.priority = t.priority
+            WHERE t.resolved_date IS NOT NULL
+              AND julianday(t.resolved_date) >= julianday(t.created_date)
+        ),
+        ranked AS (
+            SELECT grp, days, target_days,
+                   ROW_NUMBER() OVER (PARTITION BY grp ORDER BY days) AS rn,
+                   COUNT(*) OVER (PARTITION BY grp) AS n
+            FROM resolved
+        ),
+        stats AS (
+            SELECT grp,
+                   MAX(n) AS resolved,
+                   MAX(CASE WHEN rn = (n * 50 + 99) / 100 THEN days END) AS median_days,
+                   MAX(CASE WHEN rn = (n * 90 + 99) / 100 THEN days END) AS p90_days,
+                   AVG(days) AS mean_days,
+                   COALESCE(SUM(days > target_days), 0) AS breaches
+            FROM ranked
+            GROUP BY grp
+        ),
+        open_breaches AS (
+            SELECT t.{group_by} AS grp, COUNT(*) AS open_breaches
+            FROM it_tickets t
+            JOIN sla_targets s ON s.priority = t.priority
+            WHERE t.resolved_date IS NULL
+              AND t.status NOT IN ('Resolved', 'Closed')
+              AND julianday(COALESCE(?, 'now')) - julianday(t.created_date) > s.target_days
+            GROUP BY t.{group_by}
+        )
+        SELECT stats.grp, resolved, ROUND(median_days, 2), ROUND(p90_days, 2), ROUND(mean_days, 2),
+               breaches, ROUND(breaches * 100.0 / resolved, 1), COALESCE(open_breaches, 0)
+        FROM stats
+        LEFT JOIN open_breaches ON open_breaches.grp IS stats.grp
+        ORDER BY p90_days DESC
+        """
+        rows = self.__db.fetch_all(query, (as_of,))
+        return pd.DataFrame(
+            rows,
+            columns=[group_by, "resolved", "median_days", "p90_days", "mean_days", "breaches", "breach_rate_pct", "open_breaches"]
+        )
+
+    #FIND SIMILAR TICKETS
+    def find_similar_tickets(self, ticket_row_id: int | None = None, text: str | None = None, top_k: int = 5) -> pd.DataFrame:
+        """
+        Returns the top K past tickets most similar to a ticket (by its id column) or to a free text,
+        ranked by TF-IDF cosine score.
+        """
+        index = get_similarity_index("ticket", self.__db)
+        if ticket_row_id is not None:
+            matches = index.similar_to(int(ticket_row_id), top_k)
+        else:
+            matches = index.query(text or "", top_k)
+        columns = ["id", "score", "ticket_id", "priority", "status", "category", "subject", "resolved_date", "assigned_to"]
+        if not matches:
+            return pd.DataFrame(columns=columns)
+
+        scores = dict(matches)
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT id, ticket_id, priority, status, category, subject, resolved_date, assigned_to
+            FROM it_tickets
+            WHERE id IN ({', '.join('?' for _ in scores)})
+            """,
+            list(scores),
+        )
+        df = pd.DataFrame(rows, columns=["id", "ticket_id", "priority", "status", "category", "subject", "resolved_date", "assigned_to"])
+        df.insert(1, "score", df["id"].map(scores))
+        return df.sort_values("score", ascending=False)[columns]
+
     #MIGRATE CSV TICKETS TO DB
     def migrate_tickets(self) -> bool:
         """Migrates all tickets from CSV into the database."""
@@ -152,30 +363,10 @@ class ITTicket:
         DATA_DIR = BASE_DIR / "database"
         DB_PATH = DATA_DIR / "it_tickets.csv"
 
-        df = pd.read_csv(DB_PATH)
-
-        if df.empty:
-            return False
-
-        for _, row in df.iterrows():
-            # check if ticket_id already exists
-            existing = self.__db.fetch_all(
-                "SELECT 1 FROM it_tickets WHERE ticket_id = ?", (row["ticket_id"],)
-            )
-            if existing:
-                continue  # skip duplicates
-
-            self.insert_ticket(
-                ticket_id=row["ticket_id"],
-                priority=row["priority"],
-                status=row["status"],
-                category=row["category"],
-                subject=row["subject"],
-                description=row["description"],
-                created_date=str(row["created_date"]),
-                resolved_date=str(row["resolved_date"]) if not pd.isna(row["resolved_date"]) else None,
-                assigned_to=row["assigned_to"],
-                created_at=str(row["created_at"]),
-            )
-
-        return True
\ No newline at end of file
+        #loaded once, validated in chunks and bulk inserted; tickets already in the database are skipped
+        report = ingest_csv_once(self.__db, "ticket", DB_PATH)
+        if report is not None and not report.rejected.empty:
+            print(f"⚠️ {len(report.rejected)} ticket rows rejected: {report.rejected['reason'].value_counts().to_dict()}")
+        #build the duplicate index here rather than on the first check in the page
+        DuplicateDetector(self.__db).index_new_records("ticket")
+        return report is not None and report.rows_read > 0
\ No newline at end of file
@@ -0,0 +1,59 @@
+from typing import NamedTuple
+
+# =======================
+# LIGHTWEIGHT ROW RECORDS
+# =======================
+# Tuple-backed records (no __dict__, no database handle) built straight from cursor rows.
+# Field order matches the SELECT column lists used by the iter_*_records functions.
+
+class IncidentRecord(NamedTuple):
+    """Read-only row of the cyber_incidents table."""
+    id: int
+    date: str
+    incident_type: str
+    severity: str
+    status: str
+    description: str
+    reported_by: str | None
+    created_at: str
+
+
+class TicketRecord(NamedTuple):
+    """Read-only row of the it_tickets table."""
+    id: int
+    ticket_id: str
+    priority: str
+    status: str
+    category: str
+    subject: str
+    description: str
+    created_date: str
+    resolved_date: str | None
+    assigned_to: str
+    created_at: str
+
+
+class DatasetRecord(NamedTuple):
+    """Read-only row of the datasets_metadata table."""
+    id: int
+    dataset_name: str
+    category: str
+    source: str
+    last_updated: str
+    record_count: int
+    file_size_mb: float
+    created_at: str
+
+
+class UserRecord(NamedTuple):
+    """Read-only row of the users table (without the password hash)."""
+    id: int
+    username: str
+    role: str
+
+
+class Principal(NamedTuple):
+    """Identity of a user as cached for authentication: username, password hash and role."""
+    username: str
+    password_hash: str
+    role: str
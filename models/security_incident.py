@@ -1,10 +1,34 @@
-from services.database_manager import DatabaseManager
+from services.database_manager import DatabaseManager, build_filter_clause
+from models.records import IncidentRecord
+from services.time_series import bucket_expression, fill_periods
+from services.similarity_index import get_similarity_index
+from services.anomaly_detector import IncidentRateDetector
+from services.duplicate_detector import DuplicateDetector
+from services.data_validation import ingest_csv_once
 from pathlib import Path
+from typing import Iterable, Iterator
 import pandas as pd
 
 class SecurityIncident:
     """Represents a cybersecurity incident in the platform."""
 
+    #integer level of each severity (lowercase keys)
+    SEVERITY_LEVELS = {
+        "low": 1,
+        "medium": 2,
+        "high": 3,
+        "critical": 4,
+    }
+    #how much each status still contributes to risk (closed incidents carry none)
+    STATUS_RISK_WEIGHTS = {
+        "Open": 1.0,
+        "Investigating": 0.75,
+        "Resolved": 0.25,
+        "Closed": 0.0,
+    }
+    #columns the duplicate index signs (see DuplicateDetector.DOMAINS)
+    DUPLICATE_TEXT_COLUMNS = ("incident_type", "description")
+
     #creating variables of the class
     def __init__(self, incident_id: int, incident_type: str, severity: str, status: str, description: str, reported_by: str, created_at: str, db: DatabaseManager):
         self.__id = incident_id
@@ -15,6 +39,8 @@ class SecurityIncident:
         self.__reported_by = reported_by
         self.__created_at = created_at
         self.__db = db
+        #one detector for every insert made through this model
+        self.__rate_detector = IncidentRateDetector(db)
 
     def get_id(self) -> str:
         """Returns id of the incident."""
@@ -38,13 +64,7 @@ class SecurityIncident:
 
     def get_severity_level(self) -> int:
         """Return an integer severity level."""
-        mapping = {
-            "low": 1,
-            "medium": 2,
-            "high": 3,
-            "critical": 4,
-        }
-        return mapping.get(self.__severity.lower(), 0)
+        return self.SEVERITY_LEVELS.get(self.__severity.lower(), 0)
     
     #self description
     def __str__(self) -> str:
@@ -65,6 +85,8 @@ class SecurityIncident:
             """,
             (date, incident_type, severity, status, description, reported_by, created_at),
         )
+        #keep the running incident rate up to date
+        self.__rate_detector.observe(date, incident_type, severity)
         return result.lastrowid
     
     #UPDATE INCIDENT BY USER INPUT
@@ -72,6 +94,9 @@ class SecurityIncident:
         """Update any incident based on user input."""
         query = f"UPDATE cyber_incidents SET {column} = ? WHERE id = ?"
         result = self.__db.execute_query(query, (new_value, incident_id))
+        #the duplicate index is signed from the type and description
+        if result.rowcount and column in self.DUPLICATE_TEXT_COLUMNS:
+            DuplicateDetector(self.__db).reindex_records("incident", [incident_id])
         return result.rowcount
     
     #UPDATE INCIDENT
@@ -83,6 +108,47 @@ class SecurityIncident:
         )
         return result.rowcount
     
+    #BULK UPDATE INCIDENTS
+    def bulk_update_incidents(self, column: str, new_value, incident_ids: Iterable[int] | None = None, filters: dict | None = None) -> int:
+        """
+        Sets one column on many incidents in a single transaction.
+        Targets the given incident ids, or every incident matching the filters ({column: value}).
+        Returns the number of updated incidents.
+        """
+        #validate column name
+        valid_columns = ["date", "incident_type", "severity", "status", "description", "reported_by", "created_at"]
+        if column not in valid_columns:
+            raise ValueError(f"Column '{column}' is not valid. Choose from {valid_columns}")
+
+        #update by ids
+        if incident_ids is not None:
+            incident_ids = [int(incident_id) for incident_id in incident_ids]
+            result = self.__db.execute_many(
+                f"UPDATE cyber_incidents SET {column} = ? WHERE id = ?",
+                ((new_value, incident_id) for incident_id in incident_ids),
+            )
+            if column in self.DUPLICATE_TEXT_COLUMNS:
+                DuplicateDetector(self.__db).reindex_records("incident", incident_ids)
+            return result.rowcount
+
+        #update by filter, never the whole table by accident
+        if not filters:
+            raise ValueError("Provide incident_ids or at least one filter.")
+        where, params = build_filter_clause(filters, valid_columns)
+        result = self.__db.execute_query(
+            f"UPDATE cyber_incidents SET {column} = ? WHERE {where}",
+            (new_value, *params),
+        )
+        #the update trigger dropped the old signatures of the matched incidents
+        if column in self.DUPLICATE_TEXT_COLUMNS:
+            DuplicateDetector(self.__db).index_new_records("incident")
+        return result.rowcount
+
+    #BULK UPDATE STATUS
+    def bulk_update_incident_status(self, incident_ids: Iterable[int], new_status: str) -> int:
+        """Update the status of many incidents at once."""
+        return self.bulk_update_incidents("status", new_status, incident_ids=incident_ids)
+
     #DELETE INCIDENT
     def delete_incident(self, incident_id: int) -> int:
         """Delete an incident."""
@@ -113,6 +179,19 @@ class SecurityIncident:
             ]
         )
     
+    #ITERATE INCIDENT RECORDS
+    def iter_incident_records(self, batch_size: int = 1000) -> Iterator[IncidentRecord]:
+        """Yield all incidents as lightweight records, fetched from the database in batches."""
+        rows = self.__db.iter_rows(
+            """
+            SELECT id, date, incident_type, severity, status, description, reported_by, created_at
+            FROM cyber_incidents
+            ORDER BY id DESC
+            """,
+            batch_size=batch_size,
+        )
+        return map(IncidentRecord._make, rows)
+
     #GET INCIDENT BY TYPE COUNT
     def get_incidents_by_type_count(self) -> pd.DataFrame:
         query = """
@@ -148,6 +227,97 @@ class SecurityIncident:
         rows = self.__db.fetch_all(query, (min_count,))
         return pd.DataFrame(rows, columns=["incident_type", "count"])
 
+    #GET RISK QUEUE
+    def get_risk_queue(self, top_k: int = 10, max_age_days: int = 365, as_of: str | None = None) -> pd.DataFrame:
+        """
+        Returns the top K incidents ranked by risk score, computed in a single SQL query.
+        risk = severity level * status weight * (1 + capped age / max_age_days) * (1 + share of incidents with the same type)
+        Incidents whose status carries no risk weight (e.g. Closed) are left out.
+        """
+        #CASE expressions built from the mappings, values passed as parameters
+        severity_case = " ".join("WHEN ? THEN ?" for _ in self.SEVERITY_LEVELS)
+        status_case = " ".join("WHEN ? THEN ?" for _ in self.STATUS_RISK_WEIGHTS)
+        severity_params = [item for pair in self.SEVERITY_LEVELS.items() for item in pair]
+        status_params = [item for pair in self.STATUS_RISK_WEIGHTS.items() for item in pair]
+
+        query = f"""
+        WITH scored AS (
+            SELECT id, date, incident_type, severity, status, description,
+                   CASE lower(severity) {severity_case} ELSE 0 END AS severity_level,
+                   CASE status {status_case} ELSE 0 END AS status_weight,
+                   COALESCE(MAX(julianday(COALESCE(?, date('now'))) - julianday(date), 0), 0) AS age_days,
+                   COUNT(*) OVER (PARTITION BY incident_type) * 1.0 / COUNT(*) OVER () AS type_share
+            FROM cyber_incidents
+        )
+        SELECT id, date, incident_type, severity, status, description,
+               CAST(age_days AS INTEGER) AS age_days,
+               ROUND(type_share, 3) AS type_share,
+               ROUND(severity_level * status_weight * (1 + MIN(age_days, ?) / ?) * (1 + type_share), 3) AS risk_score
+        FROM scored
+        WHERE status_weight > 0
+        ORDER BY risk_score DESC, age_days DESC, id DESC
+        LIMIT ?
+        """
+        params = (*severity_params, *status_params, as_of, max_age_days, float(max_age_days), top_k)
+        rows = self.__db.fetch_all(query, params)
+        return pd.DataFrame(
+            rows,
+            columns=["id", "date", "incident_type", "severity", "status", "description", "age_days", "type_share", "risk_score"]
+        )
+
+    #GET INCIDENT TIME SERIES
+    def get_incident_time_series(self, start: str | None = None, end: str | None = None, granularity: str = "day", group_by: str | None = None) -> pd.DataFrame:
+        """
+        Returns incident counts per day/week/month read from the daily rollup table.
+        The result is indexed by period, with one "count" column or one column per group_by value.
+        """
+        valid_groups = ["incident_type", "severity", "status"]
+        if group_by is not None and group_by not in valid_groups:
+            raise ValueError(f"Column '{group_by}' is not valid. Choose from {valid_groups}")
+
+        group_column = group_by or "'count'"
+        query = f"""
+        SELECT {bucket_expression(granularity)} AS period, {group_column} AS series, SUM(count) AS count
+        FROM incident_daily_rollup
+        WHERE day != '' AND day >= COALESCE(?, day) AND day <= COALESCE(?, day)
+        GROUP BY period, series
+        HAVING SUM(count) > 0
+        ORDER BY period
+        """
+        rows = self.__db.fetch_all(query, (start, end))
+        df = pd.DataFrame(rows, columns=["period", "series", "count"])
+        series = df.pivot(index="period", columns="series", values="count").fillna(0).astype(int)
+        series.columns.name = None
+        return fill_periods(series, granularity, start, end)
+
+    #FIND SIMILAR INCIDENTS
+    def find_similar_incidents(self, incident_id: int | None = None, text: str | None = None, top_k: int = 5) -> pd.DataFrame:
+        """
+        Returns the top K past incidents most similar to an incident (by id) or to a free text,
+        ranked by TF-IDF cosine score.
+        """
+        index = get_similarity_index("incident", self.__db)
+        if incident_id is not None:
+            matches = index.similar_to(int(incident_id), top_k)
+        else:
+            matches = index.query(text or "", top_k)
+        columns = ["id", "score", "date", "incident_type", "severity", "status", "description"]
+        if not matches:
+            return pd.DataFrame(columns=columns)
+
+        scores = dict(matches)
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT id, date, incident_type, severity, status, description
+            FROM cyber_incidents
+            WHERE id IN ({', '.join('?' for _ in scores)})
+            """,
+            list(scores),
+        )
+        df = pd.DataFrame(rows, columns=["id", "date", "incident_type", "severity", "status", "description"])
+        df.insert(1, "score", df["id"].map(scores))
+        return df.sort_values("score", ascending=False)[columns]
+
     #MIGRATE CSV FILE INTO DB
     def migrate_incidents(self) -> bool:
         """Migrates all incidents from CSV file into the database."""
@@ -155,21 +325,15 @@ class SecurityIncident:
         DATA_DIR = BASE_DIR / "database"
         DB_PATH = DATA_DIR / "cyber_incidents.csv"
 
-        df = pd.read_csv(DB_PATH)
- 
-        if df.empty:
-            return False
-        #migration loop
-        for item, row in df.iterrows():
-            self.insert_incident(
-                date=str(row["date"]),
-                incident_type=row["incident_type"],
-                severity=row["severity"],
-                status=row["status"],
-                description=row["description"],
-                reported_by=row.get("reported_by"),
-                created_at=row["created_at"]
-            )
-        return True
+        #loaded once (incidents have no unique key), validated in chunks and bulk inserted
+        report = ingest_csv_once(self.__db, "incident", DB_PATH)
+        if report is not None and not report.rejected.empty:
+            print(f"⚠️ {len(report.rejected)} incident rows rejected: {report.rejected['reason'].value_counts().to_dict()}")
+        #bulk inserts skip observe(), so the incident rate state is rebuilt once
+        if report is not None and report.inserted:
+            IncidentRateDetector(self.__db).backfill()
+        #build the duplicate index here rather than on the first check in the page
+        DuplicateDetector(self.__db).index_new_records("incident")
+        return report is not None and report.rows_read > 0
     
     
\ No newline at end of file
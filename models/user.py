@@ -1,49 +1,59 @@
 import bcrypt
 from services.database_manager import DatabaseManager
+from services.principal_cache import get_principal_cache
 class User:
     """Represents a user in the Multi-Domain Intelligence Platform."""
 
-    def __init__(self, username: str, password_hash: str, role: str, db: DatabaseManager = DatabaseManager()):
+    def __init__(self, username: str, password_hash: str, role: str, db: DatabaseManager | None = None):
         self.__username = username
         self.__password_hash = password_hash
         self.__role = role
-        self.__db = DatabaseManager()
+        #reuse the caller's connection instead of opening a new one per user
+        self.__db = db if db is not None else DatabaseManager()
 
     def get_username(self) -> str:
         return self.__username
-    
+
+    def get_password_hash(self) -> str:
+        return self.__password_hash
+
     def get_role(self, username: str):
         """
         Returns the role of a user using the username.
         Returns None if the username does not exist.
         """
-        row = self.__db.fetch_one(
-            "SELECT role FROM users WHERE username = ?", (username,)
-        )
-        if row:
-            return row[0]  # the role
+        principal = get_principal_cache().get(self.__db, username)
+        if principal:
+            return principal.role
         return None
-    
+
+    def is_admin(self, username: str) -> bool:
+        """
+        Returns True if the user has the admin role.
+        Roles are compared case-insensitively ("Admin" from the Register tab, "admin" from users.txt).
+        """
+        role = self.get_role(username)
+        return (role or "").strip().lower() == "admin"
+
     #CHECKING PASSWORD
     def verify_password(self, username: str, plain_text_password: str) -> bool:
         """Verify password by fetching hash from database using username."""
-        
-        #Get stored password hash from DB
-        row = self.__db.fetch_one(
-            "SELECT password_hash FROM users WHERE username = ?",
-            (username,)
-        )
-        #checking if user does not exist
-        if row is None:
-            return False
 
-        stored_hash = row[0]
+        #Get stored password hash (this user's own hash, or the cached one)
+        if username == self.__username and self.__password_hash:
+            stored_hash = self.__password_hash
+        else:
+            principal = get_principal_cache().get(self.__db, username)
+            #checking if user does not exist
+            if principal is None:
+                return False
+            stored_hash = principal.password_hash
 
         #Comparing passwords using bcrypt
         return bcrypt.checkpw(
             plain_text_password.encode("utf-8"),
             stored_hash.encode("utf-8")
         )
-    
+
     def __str__(self) -> str:
         return f"User({self.__username}, role={self.__role})"
@@ -1,6 +1,8 @@
 import streamlit as st
 import datetime
 from services.database_manager import DatabaseManager
+from services.session_store import SessionStore
+from services.correlation_engine import CorrelationEngine
 
 st.set_page_config(page_title="Hub", page_icon="📋", layout="wide")
 
@@ -12,8 +14,13 @@ if "username" not in st.session_state:
 
 #connecting database through DatabaseManager class
 db = DatabaseManager()
-#ensure all tables are created
-db.create_all_tables()
+#ensure all tables are created, once per server process
+db.ensure_tables()
+
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
 
 # Guard: if not logged in, send user back
 if not st.session_state.logged_in:
@@ -26,6 +33,8 @@ if not st.session_state.logged_in:
 # Sidebar logout button
 with st.sidebar:
     if st.button("Log out   ➜]"):
+        SessionStore(db).revoke(st.session_state.get("session_token"))
+        st.session_state.session_token = None
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.info("You have been logged out.")
@@ -95,3 +104,32 @@ with col3:
     if choose_tickets:
         st.switch_page("pages/4_IT_Tickets.py")
 
+#CORRELATED EVENTS
+st.divider()
+st.subheader("🔗 Correlated incidents and tickets")
+st.caption("IT tickets opened around the date of a cyber incident.")
+
+col_before, col_after, col_options = st.columns(3)
+with col_before:
+    days_before = st.slider("Days before incident", 0, 30, 1)
+with col_after:
+    days_after = st.slider("Days after incident", 0, 30, 3)
+with col_options:
+    severities = st.multiselect("Incident severity", ["Low", "Medium", "High", "Critical"], default=["High", "Critical"])
+    use_categories = st.checkbox("Only related ticket categories", value=True)
+
+correlation_model = CorrelationEngine(db=db)
+correlated = correlation_model.correlate(
+    days_before=days_before,
+    days_after=days_after,
+    incident_filters={"severity": severities} if severities else None,
+    use_categories=use_categories,
+)
+
+if correlated.empty:
+    st.info("No correlated events found for these settings.")
+else:
+    st.metric("Correlated pairs", len(correlated))
+    st.dataframe(correlation_model.summarize(correlated), use_container_width=True)
+    with st.expander("Correlated events"):
+        st.dataframe(correlated, hide_index=True, use_container_width=True)
@@ -1,8 +1,14 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 from services.database_manager import DatabaseManager
+from services.session_store import SessionStore
 from services.ai_assistant import CyberSecurityAI
 from models.security_incident import SecurityIncident
+from services.duplicate_detector import DuplicateDetector
+from services.anomaly_detector import IncidentRateDetector
+from services.arrow_io import ArrowIO
+from services.export_service import TableExporter
+import pyarrow as pa
 
 
 
@@ -16,6 +22,8 @@ if "username" not in st.session_state:
 
 #connecting database through DatabaseManager class
 db = DatabaseManager()
+#ensure all tables are created, once per server process
+db.ensure_tables()
 #creating an instance of a incident
 cyber_model = SecurityIncident(incident_id=0, incident_type="Phishing", severity="High", status="Open", description="User received a suspicious email requesting credentials.", reported_by="John Doe", created_at="2025-01-01 10:00:00", db=db)
 #making sure all incidents are migrated
@@ -29,6 +37,11 @@ if "incidents_loaded" not in st.session_state or "incidents" not in st.session_s
 else:
     df = st.session_state.incidents
 
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+
 # Guard: if not logged in, send user back
 if not st.session_state.logged_in:
     st.error("You must be logged in to view the Cyber Incidents.")
@@ -95,6 +108,49 @@ with tab_dashboard:
     ax.set_title(f"Top {top_n} {group_column} distribution")
     st.pyplot(graph2)
 
+    #INCIDENTS OVER TIME
+    st.subheader("📈 Incidents over time")
+    col_granularity, col_group = st.columns(2)
+    with col_granularity:
+        granularity = st.selectbox("Granularity", ["day", "week", "month"], index=1, key="incident_granularity")
+    with col_group:
+        series_group = st.selectbox("Split by", ["None", "incident_type", "severity", "status"], key="incident_series_group")
+    incident_series = cyber_model.get_incident_time_series(
+        granularity=granularity,
+        group_by=None if series_group == "None" else series_group,
+    )
+    if incident_series.empty:
+        st.info("No incident dates to chart yet.")
+    else:
+        st.line_chart(incident_series)
+
+    #INCIDENT RATE ANOMALIES
+    st.subheader("📡 Incident rate anomalies")
+    rate_detector = IncidentRateDetector(db=db)
+    alerts = rate_detector.get_alerts()
+    if alerts.empty:
+        st.success("No unusual incident volume today.")
+    else:
+        st.error(f"⚠️ Unusual incident volume for {len(alerts)} incident type/severity pair(s):")
+        st.dataframe(alerts, hide_index=True)
+
+    if st.button("Scan history for spikes"):
+        history_anomalies = rate_detector.backfill()
+        if history_anomalies.empty:
+            st.info("No spikes found in the incident history.")
+        else:
+            st.dataframe(history_anomalies, hide_index=True)
+
+    #RISK QUEUE
+    st.subheader("🚨 Risk queue")
+    st.caption("Open incidents ranked by severity, status, age and how common their type is.")
+    risk_top_k = st.slider("Number of incidents to show", 5, 100, 10, key="risk_top_k")
+    risk_df = cyber_model.get_risk_queue(top_k=risk_top_k)
+    if risk_df.empty:
+        st.info("No open incidents to rank.")
+    else:
+        st.dataframe(risk_df, hide_index=True)
+
 #============================================================================================================================================
 # CRUD Functions
 #============================================================================================================================================
@@ -133,6 +189,13 @@ with tab_CRUD:
                     )
                     st.success(f"✅ Incident successfully added with ID: {new_id}✅")
 
+                    #POSSIBLE DUPLICATES
+                    #compares against the index built during migration, then adds this incident to it
+                    duplicates = DuplicateDetector(db=db).check_new_record("incident", new_id, f"{incident_type} {description}")
+                    if not duplicates.empty:
+                        st.warning(f"⚠️ {len(duplicates)} possible duplicate(s) of this incident:")
+                        st.dataframe(duplicates, hide_index=True)
+
         #DELETE INCIDENT
         with st.expander("🗑️ Delete Incident"):
             with st.form("Delete Incident Form"):
@@ -178,6 +241,56 @@ with tab_CRUD:
                 else:
                     st.error("❌ Incident ID not found.❌")
 
+        #BULK STATUS UPDATE
+        with st.expander("🗂️ Bulk Status Update"):
+            with st.form("Bulk Status Update Form"):
+                #user chooses which incidents to update
+                target = st.radio("Update", ["Selected incidents", "All incidents with status"], horizontal=True)
+                selected_ids = st.multiselect("Incident IDs", df["id"].tolist())
+                current_status = st.selectbox("Current status", ["Open", "Investigating", "Resolved", "Closed"])
+                bulk_status = st.selectbox("New status", ["Open", "Investigating", "Resolved", "Closed"])
+
+                bulk_update_button = st.form_submit_button("Apply to all")
+
+            if bulk_update_button:
+                if target == "Selected incidents":
+                    if not selected_ids:
+                        st.error("❌ Please select at least one incident.❌")
+                        rows = 0
+                    else:
+                        rows = cyber_model.bulk_update_incident_status(selected_ids, bulk_status)
+                else:
+                    rows = cyber_model.bulk_update_incidents("status", bulk_status, filters={"status": current_status})
+
+                if rows > 0:
+                    st.success(f"✅ {rows} incident(s) set to '{bulk_status}'.✅")
+                else:
+                    st.warning("❌ No incidents were updated.❌")
+
+        #Importing incidents from a Parquet or Arrow IPC file
+        with st.expander("📦 Import Parquet / Arrow File"):
+            with st.form("import incident file form"):
+                uploaded_file = st.file_uploader("Parquet or Arrow IPC file", type=["parquet", "arrow", "feather"])
+                keep_ids = st.checkbox("Keep IDs from the file (rows with existing IDs are skipped)")
+                import_button = st.form_submit_button("Import")
+
+            if import_button:
+                if uploaded_file is None:
+                    st.error("❌ Please choose a file to import. ❌")
+                else:
+                    try:
+                        report = ArrowIO(db).import_file("incident", uploaded_file, keep_ids=keep_ids)
+                    except (ValueError, pa.ArrowException) as error:
+                        st.error(f"❌ Import failed: {error} ❌")
+                    else:
+                        st.success(f"✅ {report.inserted} of {report.rows_read} incident(s) imported from {uploaded_file.name}. ✅")
+                        if report.skipped:
+                            st.info(f"{report.skipped} row(s) skipped, they are already in the database.")
+                        if not report.rejected.empty:
+                            st.warning(f"⚠️{len(report.rejected)} rows were rejected.⚠️")
+                            st.dataframe(report.rejected)
+                        st.session_state.incidents = cyber_model.get_all_incidents()
+
     with col2:
         #INCIDENTS COUNT BY TYPE
         with st.expander("📊 Incident Count by Type"):
@@ -215,6 +328,26 @@ with tab_CRUD:
                     st.dataframe(df)
                     st.bar_chart(df.set_index("incident_type"))
 
+        #Exporting incidents as compressed CSV or Parquet
+        with st.expander("⬇️ Export Incidents"):
+            with st.form("export incidents form"):
+                export_format = st.selectbox("File format", ["csv", "parquet"], format_func=lambda f: "CSV (gzip)" if f == "csv" else "Parquet")
+                export_severity = st.multiselect("Severity (empty = all)", sorted(st.session_state.incidents["severity"].dropna().unique()))
+                export_status = st.multiselect("Status (empty = all)", sorted(st.session_state.incidents["status"].dropna().unique()))
+                export_button = st.form_submit_button("Prepare export")
+
+            if export_button:
+                filters = {}
+                if export_severity:
+                    filters["severity"] = export_severity
+                if export_status:
+                    filters["status"] = export_status
+                exporter = TableExporter(db)
+                export_data, exported = exporter.export_bytes("incident", file_format=export_format, filters=filters)
+                file_name, mime = exporter.file_info("incidents", export_format)
+                st.success(f"✅ {exported} incidents ready for download. ✅")
+                st.download_button("Download", data=export_data, file_name=file_name, mime=mime)
+
         #getting all incidents
         with st.expander("📊View all incidents"):
             df_all = cyber_model.get_all_incidents()
@@ -287,6 +420,14 @@ with tab_ai:
             st.write(f"**Description:** {incident['description']}")
             st.write(f"**Reported by:** {incident['reported_by']}")
 
+            #similar past incidents
+            with st.expander("🔗 Similar past incidents"):
+                similar = cyber_model.find_similar_incidents(incident_id=int(incident["id"]), top_k=5)
+                if similar.empty:
+                    st.info("No similar incidents found.")
+                else:
+                    st.dataframe(similar, hide_index=True)
+
             # Button to analyze with AI
             if st.button("🤖 Analyze with AI"):
                 with st.spinner("AI analyzing incident..."):
@@ -359,6 +500,8 @@ with tab_ai:
 # Sidebar logout button
 with st.sidebar:
     if st.button("Log out   ➜]"):
+        SessionStore(db).revoke(st.session_state.get("session_token"))
+        st.session_state.session_token = None
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.info("You have been logged out.")
@@ -1,6 +1,12 @@
 import streamlit as st
+from pathlib import Path
 from models.dataset import Dataset
 from services.database_manager import DatabaseManager
+from services.session_store import SessionStore
+from services.dataset_profiler import DatasetProfiler
+from services.arrow_io import ArrowIO
+from services.export_service import TableExporter
+import pyarrow as pa
 from services.ai_assistant import DatasetsMetadataAI
 import matplotlib.pyplot as plt
 
@@ -9,6 +15,8 @@ st.set_page_config(page_title="📁Datasets Dashboard📁", page_icon="📁📋"
 
 #connecting database through DatabaseManager class
 db = DatabaseManager()
+#ensure all tables are created, once per server process
+db.ensure_tables()
 #creating an instance of dataset
 dataset_model = Dataset(dataset_id=0, name="", size_bytes=0, rows=0, source="", db=db)
 #making sure all user are migrated
@@ -28,6 +36,11 @@ if "username" not in st.session_state:
 if "messages_DS" not in st.session_state:
     st.session_state.messages_DS = []  # Chat history
 
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+
 # Guard: if not logged in, send user back
 if not st.session_state.logged_in:
     st.error("You must be logged in to view the Datasets Metadata.")
@@ -96,6 +109,47 @@ with tab_dashboard:
 
     st.pyplot(graph2)
 
+    #STORAGE ANALYTICS
+    st.subheader("💾 Storage analytics")
+    storage_group = st.selectbox("Group storage by", ["category", "source"], key="storage_group")
+    st.dataframe(dataset_model.get_storage_summary(group_by=storage_group), hide_index=True, use_container_width=True)
+
+    st.write("**Cumulative storage over time**")
+    st.caption("Built from record count changes; MB are estimated with each dataset's current size per record.")
+    storage_growth = dataset_model.get_storage_growth(granularity="month", group_by=storage_group)
+    if not storage_growth.empty:
+        st.area_chart(storage_growth)
+
+    #ranked list of stale and large datasets
+    st.write("**Stale and large datasets**")
+    col_stale, col_size = st.columns(2)
+    with col_stale:
+        min_stale_days = st.number_input("Not updated for at least (days)", min_value=0, value=365, step=30)
+    with col_size:
+        min_size_mb = st.number_input("Minimum size (MB)", min_value=0.0, value=0.0, step=100.0)
+    stale_df = dataset_model.get_stale_large_datasets(min_stale_days=int(min_stale_days), min_size_mb=float(min_size_mb))
+    if stale_df.empty:
+        st.info("No datasets match these thresholds.")
+    else:
+        st.dataframe(stale_df, hide_index=True, use_container_width=True)
+
+    #RECORD COUNT GROWTH
+    st.subheader("📈 Record count growth")
+    col_group, col_days = st.columns(2)
+    with col_group:
+        growth_group = st.selectbox("Group growth by", ["dataset_name", "category", "source"], key="growth_group")
+    with col_days:
+        growth_days = st.number_input("Growth window (days)", min_value=1, value=90, step=30)
+    st.dataframe(dataset_model.get_growth_rates(group_by=growth_group, days=int(growth_days)), hide_index=True, use_container_width=True)
+
+    #history of a single dataset
+    history_id = st.number_input("Dataset ID for record count history", min_value=1, step=1)
+    history_df = dataset_model.get_record_count_history(int(history_id))
+    if history_df.empty:
+        st.info(f"No record count history for dataset ID {history_id}.")
+    else:
+        st.line_chart(history_df.set_index("day")["record_count"])
+
 #============================================================================================================================================
 # CRUD Functions
 #============================================================================================================================================ 
@@ -205,6 +259,63 @@ with tab_CRUD:
                     else:
                         st.error(f"❌ No dataset found with ID {dataset_id}. Update failed.❌")
 
+        #Profiling local dataset files and syncing their metadata
+        with st.expander("🔍 Profile local dataset files"):
+            with st.form("profile datasets form"):
+                directory = st.text_input("Directory with CSV / JSONL / Parquet files", value="database")
+                recursive = st.checkbox("Include subdirectories")
+                profile_category = st.text_input("Category for new datasets", value="Local Files")
+                profile_source = st.text_input("Source for new datasets", value="Local File")
+                profile_button = st.form_submit_button("Profile and sync")
+
+            if profile_button:
+                if not Path(directory).is_dir():
+                    st.error(f"❌ Directory '{directory}' not found. ❌")
+                else:
+                    profiler = DatasetProfiler(db)
+                    try:
+                        profiles = profiler.profile_directory(directory, recursive=recursive)
+                    except ImportError as error:
+                        st.error(f"❌ {error} ❌")
+                    else:
+                        if profiles.empty:
+                            st.warning("❌No supported dataset files found.❌")
+                        else:
+                            updated, inserted = profiler.upsert_metadata(profiles, category=profile_category, source=profile_source)
+                            st.success(f"✅ Profiled {len(profiles)} files: {updated} datasets updated, {inserted} added. ✅")
+                            st.dataframe(profiles.drop(columns=["column_stats"]), hide_index=True)
+                            #reload datasets so the dashboard shows the new counts
+                            st.session_state.datasets = dataset_model.get_all_datasets()
+
+            profiles_df = dataset_model.get_dataset_profiles()
+            if not profiles_df.empty:
+                st.write("**Stored profiles**")
+                st.dataframe(profiles_df, hide_index=True)
+
+        #Importing datasets from a Parquet or Arrow IPC file
+        with st.expander("📦 Import Parquet / Arrow File"):
+            with st.form("import dataset file form"):
+                uploaded_file = st.file_uploader("Parquet or Arrow IPC file", type=["parquet", "arrow", "feather"])
+                keep_ids = st.checkbox("Keep IDs from the file (rows with existing IDs are skipped)")
+                import_button = st.form_submit_button("Import")
+
+            if import_button:
+                if uploaded_file is None:
+                    st.error("❌ Please choose a file to import. ❌")
+                else:
+                    try:
+                        report = ArrowIO(db).import_file("dataset", uploaded_file, keep_ids=keep_ids)
+                    except (ValueError, pa.ArrowException) as error:
+                        st.error(f"❌ Import failed: {error} ❌")
+                    else:
+                        st.success(f"✅ {report.inserted} of {report.rows_read} dataset(s) imported from {uploaded_file.name}. ✅")
+                        if report.skipped:
+                            st.info(f"{report.skipped} row(s) skipped, they are already in the database.")
+                        if not report.rejected.empty:
+                            st.warning(f"⚠️{len(report.rejected)} rows were rejected.⚠️")
+                            st.dataframe(report.rejected)
+                        st.session_state.datasets = dataset_model.get_all_datasets()
+
     with col2:
         #Getting df with category count
         with st.expander("📊Dataset Count by Category"):
@@ -238,6 +349,26 @@ with tab_CRUD:
                     #displaying raw data
                     st.dataframe(df_repeating)
 
+        #Exporting datasets as compressed CSV or Parquet
+        with st.expander("⬇️ Export Datasets"):
+            with st.form("export datasets form"):
+                export_format = st.selectbox("File format", ["csv", "parquet"], format_func=lambda f: "CSV (gzip)" if f == "csv" else "Parquet")
+                export_category = st.multiselect("Category (empty = all)", sorted(st.session_state.datasets["category"].dropna().unique()))
+                export_source = st.multiselect("Source (empty = all)", sorted(st.session_state.datasets["source"].dropna().unique()))
+                export_button = st.form_submit_button("Prepare export")
+
+            if export_button:
+                filters = {}
+                if export_category:
+                    filters["category"] = export_category
+                if export_source:
+                    filters["source"] = export_source
+                exporter = TableExporter(db)
+                export_data, exported = exporter.export_bytes("dataset", file_format=export_format, filters=filters)
+                file_name, mime = exporter.file_info("datasets", export_format)
+                st.success(f"✅ {exported} datasets ready for download. ✅")
+                st.download_button("Download", data=export_data, file_name=file_name, mime=mime)
+
         #Getting all datasets
         with st.expander("📊View all datasets"):
             df = st.session_state.datasets
@@ -377,6 +508,8 @@ with tab_ai:
 # Sidebar logout button
 with st.sidebar:
     if st.button("Log out   ➜]"):
+        SessionStore(db).revoke(st.session_state.get("session_token"))
+        st.session_state.session_token = None
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.info("You have been logged out.")
@@ -1,8 +1,15 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 from services.database_manager import DatabaseManager
+from services.session_store import SessionStore
 from services.ai_assistant import ITTicketsAI
 from models.it_ticket import ITTicket
+from services.ticket_assigner import TicketAssigner
+from services.triage_queue import TriageQueue
+from services.duplicate_detector import DuplicateDetector
+from services.arrow_io import ArrowIO
+from services.export_service import TableExporter
+import pyarrow as pa
 
 st.set_page_config(page_title="🎟️Tickets Dashboard🎟️", page_icon="🎟️📋", layout="wide")
 
@@ -14,6 +21,8 @@ if "username" not in st.session_state:
 
 #connecting database through DatabaseManager class
 db = DatabaseManager()
+#ensure all tables are created, once per server process
+db.ensure_tables()
 #creating an instance of a ticket
 ticket_model = ITTicket(ticket_id=0, title="Cannot connect to VPN", priority="High", status="Open", assighned_to="Alice Smith", db=db)
 #making sure all tickets are migrated
@@ -27,6 +36,11 @@ if ("tickets_loaded") or ("tickets") not in st.session_state:
 else:
     df = st.session_state.tickets
 
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+
 # Guard: if not logged in, send user back
 if not st.session_state.logged_in:
     st.error("You must be logged in to view the IT Tickets.")
@@ -93,6 +107,43 @@ with tab_dashboard:
     ax.set_title(f"Top {top_n} {group_column} distribution")
     st.pyplot(graph2)
 
+    #TICKETS OVER TIME
+    st.subheader("📈 Tickets opened and closed over time")
+    col_granularity, col_group = st.columns(2)
+    with col_granularity:
+        granularity = st.selectbox("Granularity", ["day", "week", "month"], index=2, key="ticket_granularity")
+    with col_group:
+        series_group = st.selectbox("Split opened tickets by", ["None", "category", "priority", "status"], key="ticket_series_group")
+    ticket_series = ticket_model.get_ticket_time_series(
+        granularity=granularity,
+        group_by=None if series_group == "None" else series_group,
+    )
+    if ticket_series.empty:
+        st.info("No ticket dates to chart yet.")
+    else:
+        st.line_chart(ticket_series)
+
+    #SLA ANALYTICS
+    st.subheader("⏱️ SLA and time to resolution")
+    sla_group = st.selectbox("Group by", ["priority", "category", "assigned_to"], key="sla_group")
+    sla_df = ticket_model.get_sla_stats(group_by=sla_group)
+    if sla_df.empty:
+        st.info("No resolved tickets yet.")
+    else:
+        st.dataframe(sla_df, hide_index=True, use_container_width=True)
+        st.bar_chart(sla_df.set_index(sla_group)[["median_days", "p90_days"]])
+
+    #editing SLA targets
+    with st.expander("🎯 SLA targets"):
+        st.dataframe(ticket_model.get_sla_targets(), hide_index=True)
+        with st.form("sla target form"):
+            sla_priority = st.selectbox("Priority", ["Low", "Medium", "High", "Critical"])
+            sla_days = st.number_input("Target (days)", min_value=0.0, value=7.0, step=0.5)
+            if st.form_submit_button("Save target"):
+                ticket_model.set_sla_target(sla_priority, float(sla_days))
+                st.success(f"✅ {sla_priority} tickets now have a {sla_days} day target.✅")
+                st.rerun()
+
 #============================================================================================================================================
 # CRUD Functions
 #============================================================================================================================================
@@ -141,6 +192,13 @@ with tab_CRUD:
 
                     st.success(f"✅ Ticket successfully inserted with ID: {ticket_db_id} ✅")
 
+                    #POSSIBLE DUPLICATES
+                    #compares against the index built during migration, then adds this ticket to it
+                    duplicates = DuplicateDetector(db=db).check_new_record("ticket", ticket_db_id, f"{subject} {description}")
+                    if not duplicates.empty:
+                        st.warning(f"⚠️ {len(duplicates)} possible duplicate(s) of this ticket:")
+                        st.dataframe(duplicates, hide_index=True)
+
         # DELETE TICKET
         with st.expander("🗑️ Delete Ticket"):
             with st.form("delete ticket form"):
@@ -204,6 +262,87 @@ with tab_CRUD:
                         st.error(f"❌ Ticket ID {ticket_id} not found.❌")
 
 
+        #BULK TICKET UPDATE
+        with st.expander("🗂️ Bulk Ticket Update"):
+            with st.form("bulk ticket update form"):
+                #user chooses which tickets to update
+                target = st.radio("Update", ["Selected tickets", "All tickets with status"], horizontal=True)
+                selected_ids = st.multiselect("Ticket IDs", df["id"].tolist())
+                current_status = st.selectbox("Current status", ["Open", "In Progress", "Resolved", "Closed"])
+                bulk_column = st.selectbox("Field to update", ["status", "priority", "assigned_to"])
+                bulk_value = st.text_input("New value")
+
+                bulk_update_button = st.form_submit_button("Apply to all")
+
+            if bulk_update_button:
+                if not bulk_value:
+                    st.error("❌ Please enter a new value. ❌")
+                elif target == "Selected tickets" and not selected_ids:
+                    st.error("❌ Please select at least one ticket. ❌")
+                else:
+                    if target == "Selected tickets":
+                        rows_updated = ticket_model.bulk_update_tickets(bulk_column, bulk_value, ticket_ids=selected_ids)
+                    else:
+                        rows_updated = ticket_model.bulk_update_tickets(bulk_column, bulk_value, filters={"status": current_status})
+
+                    if rows_updated > 0:
+                        st.success(f"✅ {rows_updated} ticket(s) updated: {bulk_column} = '{bulk_value}' ✅")
+                    else:
+                        st.warning("❌ No tickets were updated. ❌")
+
+        #AUTO ASSIGN TICKETS
+        with st.expander("🤖 Auto-assign Tickets"):
+            #assigner reads the current workload from the database
+            assigner = TicketAssigner(db=db)
+            st.dataframe(assigner.get_workload(), hide_index=True, use_container_width=True)
+
+            if st.button("Assign all unassigned open tickets"):
+                assigned = assigner.assign_unassigned()
+                if assigned.empty:
+                    st.info("There are no unassigned open tickets.")
+                else:
+                    st.success(f"✅ {len(assigned)} ticket(s) assigned.✅")
+                    st.dataframe(assigned, hide_index=True)
+
+            with st.form("reassign tickets form"):
+                reassign_ids = st.multiselect("Ticket IDs to reassign", df["id"].tolist())
+                reassign_button = st.form_submit_button("Reassign by workload")
+
+            if reassign_button:
+                if not reassign_ids:
+                    st.error("❌ Please select at least one ticket. ❌")
+                else:
+                    reassigned = assigner.assign_tickets(reassign_ids)
+                    if reassigned.empty:
+                        st.warning("❌ Only open tickets can be reassigned. ❌")
+                    else:
+                        st.success(f"✅ {len(reassigned)} ticket(s) reassigned.✅")
+                        st.dataframe(reassigned, hide_index=True)
+
+        #Importing tickets from a Parquet or Arrow IPC file
+        with st.expander("📦 Import Parquet / Arrow File"):
+            with st.form("import ticket file form"):
+                uploaded_file = st.file_uploader("Parquet or Arrow IPC file", type=["parquet", "arrow", "feather"])
+                keep_ids = st.checkbox("Keep IDs from the file (rows with existing IDs are skipped)")
+                import_button = st.form_submit_button("Import")
+
+            if import_button:
+                if uploaded_file is None:
+                    st.error("❌ Please choose a file to import. ❌")
+                else:
+                    try:
+                        report = ArrowIO(db).import_file("ticket", uploaded_file, keep_ids=keep_ids)
+                    except (ValueError, pa.ArrowException) as error:
+                        st.error(f"❌ Import failed: {error} ❌")
+                    else:
+                        st.success(f"✅ {report.inserted} of {report.rows_read} ticket(s) imported from {uploaded_file.name}. ✅")
+                        if report.skipped:
+                            st.info(f"{report.skipped} row(s) skipped, they are already in the database.")
+                        if not report.rejected.empty:
+                            st.warning(f"⚠️{len(report.rejected)} rows were rejected.⚠️")
+                            st.dataframe(report.rejected)
+                        st.session_state.tickets = ticket_model.get_all_tickets()
+
     with col2:
         #TICKET COUNT BY CATEGORY
         with st.expander("📊 Ticket Count by Category"):
@@ -227,6 +366,55 @@ with tab_CRUD:
             else:
                 st.dataframe(df_status, use_container_width=True)
 
+        #TRIAGE QUEUE
+        with st.expander("📥 Triage Queue"):
+            triage_queue = TriageQueue(db=db)
+            #claims older than an hour go back to the queue
+            triage_queue.release_expired(max_age_minutes=60)
+            st.caption(f"{triage_queue.size()} open ticket(s) waiting, ordered by priority, SLA deadline and age.")
+
+            queue_n = st.number_input("Number of tickets", min_value=1, max_value=50, value=5, step=1)
+            st.dataframe(triage_queue.peek(int(queue_n)), hide_index=True, use_container_width=True)
+
+            if st.button("Claim next tickets"):
+                claimed = triage_queue.claim(st.session_state.username, int(queue_n))
+                if claimed.empty:
+                    st.info("The queue is empty.")
+                else:
+                    st.success(f"✅ Claimed {len(claimed)} ticket(s).✅")
+
+            st.write("**My claimed tickets**")
+            my_claims = triage_queue.get_claims(st.session_state.username)
+            if my_claims.empty:
+                st.info("You have no claimed tickets.")
+            else:
+                st.dataframe(my_claims, hide_index=True, use_container_width=True)
+                release_ids = st.multiselect("Tickets to release", my_claims["id"].tolist())
+                if st.button("Release tickets"):
+                    released = triage_queue.release(st.session_state.username, release_ids or None)
+                    st.success(f"✅ Released {released} ticket(s).✅")
+                    st.rerun()
+
+        #Exporting tickets as compressed CSV or Parquet
+        with st.expander("⬇️ Export Tickets"):
+            with st.form("export tickets form"):
+                export_format = st.selectbox("File format", ["csv", "parquet"], format_func=lambda f: "CSV (gzip)" if f == "csv" else "Parquet")
+                export_priority = st.multiselect("Priority (empty = all)", sorted(st.session_state.tickets["priority"].dropna().unique()))
+                export_status = st.multiselect("Status (empty = all)", sorted(st.session_state.tickets["status"].dropna().unique()))
+                export_button = st.form_submit_button("Prepare export")
+
+            if export_button:
+                filters = {}
+                if export_priority:
+                    filters["priority"] = export_priority
+                if export_status:
+                    filters["status"] = export_status
+                exporter = TableExporter(db)
+                export_data, exported = exporter.export_bytes("ticket", file_format=export_format, filters=filters)
+                file_name, mime = exporter.file_info("tickets", export_format)
+                st.success(f"✅ {exported} tickets ready for download. ✅")
+                st.download_button("Download", data=export_data, file_name=file_name, mime=mime)
+
         #Getting all tickets
         with st.expander("📊View all tickets"):
             df_all = ticket_model.get_all_tickets()
@@ -293,6 +481,14 @@ with tab_ai:
             st.write(f"**Assigned To:** {ticket['assigned_to']}")
             st.write(f"**Created At:** {ticket['created_at']}")
 
+            #similar past tickets
+            with st.expander("🔗 Similar past tickets"):
+                similar = ticket_model.find_similar_tickets(ticket_row_id=int(ticket["id"]), top_k=5)
+                if similar.empty:
+                    st.info("No similar tickets found.")
+                else:
+                    st.dataframe(similar, hide_index=True)
+
             # Button to analyze with AI
             if st.button("🤖 Analyze with AI"):
                 with st.spinner("AI analyzing ticket..."):
@@ -365,6 +561,8 @@ with tab_ai:
 # Sidebar logout button
 with st.sidebar:
     if st.button("Log out   ➜]"):
+        SessionStore(db).revoke(st.session_state.get("session_token"))
+        st.session_state.session_token = None
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.info("You have been logged out.")
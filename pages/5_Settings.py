@@ -1,6 +1,10 @@
 import streamlit as st
 from services.auth_manager import AuthManager, Hasher
 from services.database_manager import DatabaseManager
+from services.session_store import SessionStore
+from services.bcrypt_cost import BcryptCost
+from services.user_import import UserImporter
+from services.password_strength import SCORE_LABELS
 from models.user import User
 
 
@@ -28,6 +32,11 @@ hasher_model = Hasher(db=db)
 user_model = User(username='', password_hash='', role='', db=db)
 
 
+#an expired or revoked session logs the user out
+if st.session_state.logged_in and SessionStore(db).validate(st.session_state.get("session_token")) is None:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+
 # Guard: if not logged in, send user back
 if not st.session_state.logged_in:
     st.error("You must be logged in to view the Settings.")
@@ -38,6 +47,8 @@ if not st.session_state.logged_in:
 # Sidebar logout button
 with st.sidebar:
     if st.button("Log out   ➜]"):
+        SessionStore(db).revoke(st.session_state.get("session_token"))
+        st.session_state.session_token = None
         st.session_state.logged_in = False
         st.session_state.username = ""
         st.info("You have been logged out.")
@@ -68,6 +79,13 @@ if st.session_state.show_password_change:
         #getting info from the user
         password = st.text_input("🔑Enter your current password", type="password", key="current_password")
         new_password = st.text_input("🔒Enter your new password", type="password", key="changed_password")
+        #strength of the new password, updated whenever the form is sent
+        if new_password:
+            strength = auth_model.estimate_password_strength(new_password, st.session_state.username)
+            st.progress(strength.score / 4, text=f"Password strength: {SCORE_LABELS[strength.score]}")
+            st.caption(f"Estimated time to crack: {strength.crack_time_offline} from a stolen hash, {strength.crack_time_online} by trying logins.")
+            for tip in strength.feedback:
+                st.caption(f"💡{tip}")
         confirmation = st.text_input("🔒Confirm your new password", type="password", key="confirmation_password")
         back = st.form_submit_button("Back", key="ChangeBack")
         submit = st.form_submit_button("Change password", key="Change")
@@ -98,6 +116,10 @@ if st.session_state.show_password_change:
             if not auth_model.validate_password(new_password):
                 st.error("❌Your password must satisfy those conditions: password must have from 8 to 24 characters long.❌\n❌It must contain at least one upper letter, one lower letter, one number, and one special character.❌")
                 st.stop()
+            #checking the password against common and breached passwords
+            if auth_model.is_breached_password(new_password):
+                st.error("❌This password is one of the most used or appeared in a data breach. Choose another one.❌")
+                st.stop()
             #after validation confirm the user wants to change password
             st.session_state.confirm_password_change = True
 
@@ -109,6 +131,8 @@ if st.session_state.show_password_change:
             with col1:
                 if st.form_submit_button("Yes, confirm change"):
                     if hasher_model.change_password(st.session_state.username.strip().capitalize(), new_password):
+                        #sessions on other devices end, this one stays logged in
+                        SessionStore(db).revoke_user(st.session_state.username.strip().capitalize(), keep_token=st.session_state.get("session_token"))
                         st.success("✅Your password changed successfuly! Please click 'Back' to close this window.✅")
                         if back:
                             st.session_state.show_password_change = False
@@ -130,7 +154,7 @@ if st.session_state.get_user_role:
     #calling user role function
     role = user_model.get_role(st.session_state.username)
     if role:
-        st.info(f"The users role is '{user_model.get_role(st.session_state.username)}'")
+        st.info(f"The users role is '{role}'")
     else:
         st.error("❌User not found in the database.❌")
     if st.button("Done"):
@@ -144,8 +168,7 @@ if st.button("All users info"):
     st.session_state.get_all_users = True
 
 if st.session_state.get_all_users:
-    user_role = user_model.get_role(st.session_state.username)
-    if user_role != "admin":
+    if not user_model.is_admin(st.session_state.username):
         st.error('❌Only "Admin" users can view this.❌')
         st.session_state.get_all_users = False
         st.rerun()
@@ -154,3 +177,48 @@ if st.session_state.get_all_users:
         if st.button("Back"):
             st.session_state.get_all_users = False
             st.rerun()
+
+#login throughput and throttling metrics
+with st.expander("📈 Login metrics"):
+    st.json(auth_model.get_login_metrics())
+
+#bcrypt cost used for new hashes, rehashed on the next login when it changes
+with st.expander("🔐 Password hashing cost"):
+    bcrypt_cost = BcryptCost(db)
+    st.write(f"Current bcrypt cost: **{bcrypt_cost.get_cost()}**")
+    if not user_model.is_admin(st.session_state.username):
+        st.caption('Only "Admin" users can recalibrate the cost.')
+    else:
+        with st.form("calibrate_bcrypt_form"):
+            target_ms = st.number_input("Target time per password check (ms)", min_value=50, max_value=2000, value=250, step=50)
+            if st.form_submit_button("Calibrate"):
+                with st.spinner("Benchmarking bcrypt on this host..."):
+                    cost, measured_ms = bcrypt_cost.calibrate(target_ms)
+                st.success(f"✅ bcrypt cost set to {cost} ({measured_ms:.0f} ms per check). Existing passwords are upgraded at their next login.✅")
+
+#bulk user creation for admins
+with st.expander("👥 Bulk user import"):
+    if not user_model.is_admin(st.session_state.username):
+        st.caption('Only "Admin" users can import users.')
+    else:
+        with st.form("bulk_user_import_form"):
+            import_format = st.radio("File format", ["Pre-hashed lines (username,hash,role)", "Plain text CSV (username,password,role)"])
+            users_file = st.file_uploader("Users file", type=["txt", "csv"])
+            if st.form_submit_button("Import users"):
+                if users_file is None:
+                    st.error("❌Please choose a file to import.❌")
+                else:
+                    importer = UserImporter(db)
+                    try:
+                        with st.spinner("Importing users..."):
+                            if import_format.startswith("Pre-hashed"):
+                                report = importer.import_hashed(users_file)
+                            else:
+                                report = importer.import_plaintext(users_file)
+                    except ValueError as e:
+                        st.error(f"❌{e}❌")
+                    else:
+                        st.success(f"✅{report.inserted} of {report.rows_read} users imported in {report.total_seconds:.2f}s.✅")
+                        if not report.rejected.empty:
+                            st.warning(f"⚠️{len(report.rejected)} rows were rejected.⚠️")
+                            st.dataframe(report.rejected)
@@ -0,0 +1,184 @@
+import math
+from datetime import date
+import numpy as np
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+
+class IncidentRateDetector:
+    """
+    Detects spikes in the daily number of incidents per incident type and severity.
+
+    Each (type, severity) pair keeps an exponentially weighted mean and variance of its daily
+    counts in incident_rate_state. observe() updates that state in O(1) per new incident,
+    backfill() recomputes it for the whole history at once from the daily rollup table.
+    A day is anomalous when its count is z_threshold standard deviations above the running mean.
+    """
+
+    ALPHA = 0.1
+    #a long gap is folded in as at most this many zero-count days (the state has decayed by then)
+    MAX_FOLDED_GAP = 60
+
+    def __init__(self, db: DatabaseManager, z_threshold: float = 3.0, min_count: int = 3, warmup_days: int = 7):
+        self.__db = db
+        self.__z_threshold = z_threshold
+        self.__min_count = min_count
+        self.__warmup_days = warmup_days
+
+    @classmethod
+    def __fold(cls, mean: float, var: float, value: float) -> tuple[float, float]:
+        """Adds one daily count to an EWMA mean and variance."""
+        diff = value - mean
+        increment = cls.ALPHA * diff
+        return mean + increment, (1 - cls.ALPHA) * (var + diff * increment)
+
+    def __z_score(self, count: float, mean: float, var: float) -> float:
+        #at least one incident of spread, so a quiet series is not flagged for a single extra incident
+        return (count - mean) / max(math.sqrt(var), 1.0)
+
+    #OBSERVE INCIDENT
+    def observe(self, day: str, incident_type: str, severity: str) -> bool:
+        """
+        Counts one new incident and returns True if its (type, severity) rate is now anomalous.
+        Incidents dated before the current state day are left to backfill().
+        """
+        try:
+            day = date.fromisoformat(str(day)[:10]).isoformat()
+        except ValueError:
+            return False
+
+        #same day: a single atomic increment that also returns the state
+        rows = self.__db.execute_returning(
+            """
+            UPDATE incident_rate_state SET day_count = day_count + 1
+            WHERE incident_type = ? AND severity = ? AND day = ?
+            RETURNING day_count, ewma_mean, ewma_var, days_seen
+            """,
+            (incident_type, severity, day),
+        )
+
+        if not rows:
+            row = self.__db.fetch_one(
+                "SELECT day, day_count, ewma_mean, ewma_var, days_seen FROM incident_rate_state WHERE incident_type = ? AND severity = ?",
+                (incident_type, severity),
+            )
+            if row is None:
+                #a new series starts from mean 0 and variance 0, like the zero seed day in backfill()
+                self.__db.execute_query(
+                    "INSERT OR IGNORE INTO incident_rate_state (incident_type, severity, day, day_count) VALUES (?, ?, ?, 1)",
+                    (incident_type, severity, day),
+                )
+                return False
+            state_day, day_count, mean, var, days_seen = row
+            if day < state_day:
+                return False
+
+            #close the previous day, then the empty days in between
+            gap = (date.fromisoformat(day) - date.fromisoformat(state_day)).days
+            mean, var = self.__fold(mean, var, day_count)
+            for _ in range(min(gap - 1, self.MAX_FOLDED_GAP)):
+                mean, var = self.__fold(mean, var, 0)
+            rows = self.__db.execute_returning(
+                """
+                UPDATE incident_rate_state
+                SET day = ?, day_count = 1, ewma_mean = ?, ewma_var = ?, days_seen = days_seen + ?
+                WHERE incident_type = ? AND severity = ? AND day = ?
+                RETURNING day_count, ewma_mean, ewma_var, days_seen
+                """,
+                (day, mean, var, gap, incident_type, severity, state_day),
+            )
+            if not rows:
+                #another writer moved the state on meanwhile
+                return False
+
+        day_count, mean, var, days_seen = rows[0]
+        return (
+            days_seen >= self.__warmup_days
+            and day_count >= self.__min_count
+            and self.__z_score(day_count, mean, var) >= self.__z_threshold
+        )
+
+    #GET CURRENT ALERTS
+    def get_alerts(self) -> pd.DataFrame:
+        """Returns the (type, severity) pairs whose latest day is anomalous."""
+        rows = self.__db.fetch_all(
+            """
+            SELECT incident_type, severity, day, day_count, ewma_mean, ewma_var, days_seen
+            FROM incident_rate_state
+            WHERE day_count >= ? AND days_seen >= ?
+            """,
+            (self.__min_count, self.__warmup_days),
+        )
+        alerts = [
+            (incident_type, severity, day, count, round(mean, 2), round(self.__z_score(count, mean, var), 2))
+            for incident_type, severity, day, count, mean, var, _ in rows
+            if self.__z_score(count, mean, var) >= self.__z_threshold
+        ]
+        return pd.DataFrame(alerts, columns=["incident_type", "severity", "day", "count", "expected", "z_score"])
+
+    #BACKFILL HISTORY
+    def backfill(self, update_state: bool = True) -> pd.DataFrame:
+        """
+        Recomputes the EWMA over the full history with vectorized pandas operations, using the
+        daily rollup table, and returns every anomalous day. With update_state the streaming
+        state is replaced, so observe() continues from the history.
+        """
+        rows = self.__db.fetch_all(
+            """
+            SELECT day, incident_type, severity, SUM(count)
+            FROM incident_daily_rollup
+            WHERE day != ''
+            GROUP BY day, incident_type, severity
+            HAVING SUM(count) > 0
+            """
+        )
+        columns = ["day", "incident_type", "severity", "count", "expected", "z_score"]
+        if not rows:
+            return pd.DataFrame(columns=columns)
+
+        df = pd.DataFrame(rows, columns=["day", "incident_type", "severity", "count"])
+        counts = df.pivot_table(index="day", columns=["incident_type", "severity"], values="count", aggfunc="sum", fill_value=0)
+        counts.index = pd.to_datetime(counts.index)
+        #one extra zero day in front: every series starts from mean 0 and variance 0, exactly like a
+        #new series in observe(); adjust=False is then the same recursion as __fold
+        days = pd.date_range(counts.index.min() - pd.Timedelta(days=1), counts.index.max(), freq="D")
+        counts = counts.reindex(days, fill_value=0)
+
+        #state before each day = EWMA of all earlier days
+        ewm = counts.ewm(alpha=self.ALPHA, adjust=False)
+        mean_before = ewm.mean().shift(1).iloc[1:]
+        var_before = ewm.var(bias=True).shift(1).iloc[1:]
+        counts = counts.iloc[1:]
+        z_scores = (counts - mean_before) / np.sqrt(var_before).clip(lower=1.0)
+        #days since each series saw its first incident
+        days_seen = (counts.cumsum() > 0).cumsum().shift(1, fill_value=0)
+
+        flagged = (z_scores >= self.__z_threshold) & (counts >= self.__min_count) & (days_seen >= self.__warmup_days)
+        #long format: one row per (day, type, severity)
+        levels = ["incident_type", "severity"]
+        long = pd.DataFrame({
+            "count": counts.stack(levels),
+            "expected": mean_before.stack(levels).round(2),
+            "z_score": z_scores.stack(levels).round(2),
+            "flagged": flagged.stack(levels),
+        })
+        anomalies = long[long["flagged"]].rename_axis(["day", *levels]).reset_index()
+        anomalies["day"] = anomalies["day"].dt.strftime("%Y-%m-%d")
+
+        if update_state:
+            last_day = counts.index[-1].strftime("%Y-%m-%d")
+            state = [
+                (key[0], key[1], last_day, int(counts[key].iloc[-1]),
+                 float(mean_before[key].iloc[-1]), float(var_before[key].iloc[-1]), int(days_seen[key].iloc[-1]))
+                for key in counts.columns
+            ]
+            with self.__db.transaction() as cur:
+                cur.execute("DELETE FROM incident_rate_state")
+                cur.executemany(
+                    """
+                    INSERT INTO incident_rate_state (incident_type, severity, day, day_count, ewma_mean, ewma_var, days_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    state,
+                )
+        return anomalies[columns].sort_values("day", ascending=False)
@@ -0,0 +1,190 @@
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from services.database_manager import DatabaseManager, build_filter_clause
+from services.data_validation import IngestReport, insert_valid_rows, validate_chunk
+
+FILE_FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow"}
+
+
+class ArrowIO:
+    """
+    Parquet and Arrow IPC import/export for incidents, tickets and datasets metadata.
+
+    Exports read the table with a cursor in batches and write every batch as its own
+    Parquet row group / IPC record batch, so only one batch is held in memory. Imports read
+    the file batch by batch as well, only decoding the requested columns, and every batch goes
+    through the same validation as CSV ingestion. Arrow IPC files given by path are memory-mapped,
+    so their batches are read without copying.
+    """
+
+    #table and Arrow schema of each domain
+    DOMAINS = {
+        "incident": ("cyber_incidents", pa.schema([
+            ("id", pa.int64()), ("date", pa.string()), ("incident_type", pa.string()), ("severity", pa.string()),
+            ("status", pa.string()), ("description", pa.string()), ("reported_by", pa.string()), ("created_at", pa.string()),
+        ])),
+        "ticket": ("it_tickets", pa.schema([
+            ("id", pa.int64()), ("ticket_id", pa.string()), ("priority", pa.string()), ("status", pa.string()),
+            ("category", pa.string()), ("subject", pa.string()), ("description", pa.string()),
+            ("created_date", pa.string()), ("resolved_date", pa.string()), ("assigned_to", pa.string()), ("created_at", pa.string()),
+        ])),
+        "dataset": ("datasets_metadata", pa.schema([
+            ("id", pa.int64()), ("dataset_name", pa.string()), ("category", pa.string()), ("source", pa.string()),
+            ("last_updated", pa.string()), ("record_count", pa.int64()), ("file_size_mb", pa.float64()), ("created_at", pa.string()),
+        ])),
+    }
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 50_000, compression: str = "zstd"):
+        self.__db = db
+        self.__batch_size = batch_size
+        self.__compression = compression
+
+    def __check_domain(self, domain: str) -> tuple[str, pa.Schema]:
+        if domain not in self.DOMAINS:
+            raise ValueError(f"Domain '{domain}' is not valid. Choose from {list(self.DOMAINS)}")
+        return self.DOMAINS[domain]
+
+    @staticmethod
+    def __check_columns(columns, schema: pa.Schema) -> list[str]:
+        valid_columns = schema.names
+        for column in columns:
+            if column not in valid_columns:
+                raise ValueError(f"Column '{column}' is not valid. Choose from {valid_columns}")
+        return list(columns)
+
+    @staticmethod
+    def detect_format(name: str) -> str:
+        """Returns "parquet" or "arrow" from a file name's extension."""
+        suffix = Path(str(name)).suffix.lower()
+        if suffix not in FILE_FORMATS:
+            raise ValueError(f"File type '{suffix}' is not valid. Choose from {list(FILE_FORMATS)}")
+        return FILE_FORMATS[suffix]
+
+    #ITERATE RECORD BATCHES
+    def iter_batches(self, domain: str, columns: list[str] | None = None, filters: dict | None = None):
+        """Yields Arrow record batches of a domain's table, read from the database cursor in batches."""
+        table, schema = self.__check_domain(domain)
+        columns = self.__check_columns(columns or schema.names, schema)
+        where, params = build_filter_clause(filters or {}, schema.names)
+        projected = pa.schema([schema.field(column) for column in columns])
+
+        rows = self.__db.iter_rows(
+            f"SELECT {', '.join(columns)} FROM {table} WHERE {where} ORDER BY id",
+            params,
+            batch_size=self.__batch_size,
+        )
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.__batch_size:
+                yield self.__to_batch(batch, projected)
+                batch = []
+        if batch:
+            yield self.__to_batch(batch, projected)
+
+    @staticmethod
+    def __to_batch(rows: list[tuple], schema: pa.Schema) -> pa.RecordBatch:
+        #SQLite is loosely typed, so values are converted to the column type where needed
+        arrays = []
+        for index, field in enumerate(schema):
+            values = [row[index] for row in rows]
+            if pa.types.is_string(field.type):
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    #EXPORT
+    def export(self, domain: str, sink, file_format: str | None = None, columns: list[str] | None = None, filters: dict | None = None) -> int:
+        """
+        Writes a domain's table to a Parquet or Arrow IPC file (a path or a writable binary file object),
+        one row group / record batch per database batch. Returns the number of exported rows.
+        """
+        _, schema = self.__check_domain(domain)
+        file_format = file_format or self.detect_format(sink)
+        projected = pa.schema([schema.field(column) for column in self.__check_columns(columns or schema.names, schema)])
+
+        exported = 0
+        if file_format == "parquet":
+            with pq.ParquetWriter(sink, projected, compression=self.__compression) as writer:
+                for batch in self.iter_batches(domain, projected.names, filters):
+                    writer.write_batch(batch)
+                    exported += batch.num_rows
+        elif file_format == "arrow":
+            options = ipc.IpcWriteOptions(compression=self.__compression)
+            with ipc.new_file(sink, projected, options=options) as writer:
+                for batch in self.iter_batches(domain, projected.names, filters):
+                    writer.write_batch(batch)
+                    exported += batch.num_rows
+        else:
+            raise ValueError(f"File format '{file_format}' is not valid. Choose from ['parquet', 'arrow']")
+        return exported
+
+    def __read_batches(self, source, file_format: str, columns: list[str] | None):
+        """Yields record batches of a Parquet or Arrow IPC file, restricted to the given columns."""
+        if file_format == "parquet":
+            yield from pq.ParquetFile(source).iter_batches(batch_size=self.__batch_size, columns=columns)
+        elif file_format == "arrow":
+            #memory-map files on disk, so batches point into the mapped file instead of being copied
+            if isinstance(source, (str, Path)):
+                source = pa.memory_map(str(source), "r")
+            reader = ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                yield batch.select(columns) if columns else batch
+        else:
+            raise ValueError(f"File format '{file_format}' is not valid. Choose from ['parquet', 'arrow']")
+
+    @staticmethod
+    def __cast(array: pa.Array, target: pa.DataType) -> pa.Array:
+        """Casts a file column to the table's column type, timestamps becoming 'YYYY-MM-DD HH:MM:SS' strings."""
+        if pa.types.is_timestamp(array.type) and pa.types.is_string(target):
+            #whole seconds, since %S would also print the fraction
+            return pc.strftime(array.cast(pa.timestamp("s", tz=array.type.tz), safe=False), format="%Y-%m-%d %H:%M:%S")
+        return array.cast(target)
+
+    #IMPORT
+    def import_file(self, domain: str, source, file_format: str | None = None, columns: list[str] | None = None, keep_ids: bool = False) -> IngestReport:
+        """
+        Inserts the rows of a Parquet or Arrow IPC file (a path or a readable binary file object) into a
+        domain's table. Only the given columns (default: every table column in the file) are read.
+        Each batch is validated like a CSV chunk (services.data_validation) and its valid rows are
+        inserted in one transaction. Ids are dropped unless keep_ids, in which case rows with existing
+        ids are skipped. Returns the rows read, inserted and rejected (skipped = the rest).
+        """
+        _, schema = self.__check_domain(domain)
+        file_format = file_format or self.detect_format(getattr(source, "name", source))
+        if file_format == "parquet":
+            file_schema = pq.read_schema(source)
+        else:
+            file_schema = ipc.open_file(pa.memory_map(str(source), "r") if isinstance(source, (str, Path)) else source).schema
+        if hasattr(source, "seek"):
+            source.seek(0)
+
+        columns = self.__check_columns(columns or [name for name in schema.names if name in file_schema.names], schema)
+        if not keep_ids and "id" in columns:
+            columns.remove("id")
+        rows_read = 0
+        inserted = 0
+        rejected = []
+        if [column for column in columns if column != "id"]:
+            for batch in self.__read_batches(source, file_format, columns):
+                arrays = [self.__cast(batch.column(column), schema.field(column).type) for column in columns]
+                df = pa.RecordBatch.from_arrays(arrays, names=columns).to_pandas()
+                #row numbers run on across batches, like the chunks of a CSV
+                df.index = pd.RangeIndex(rows_read, rows_read + len(df))
+                rows_read += len(df)
+
+                result = validate_chunk(domain, df)
+                valid = result.valid
+                if "id" in columns:
+                    ids = df.loc[valid.index, "id"].astype("Int64")
+                    valid.insert(0, "id", ids.astype(object).where(ids.notna(), None))
+                inserted += insert_valid_rows(self.__db, domain, valid)
+                if not result.rejected.empty:
+                    rejected.append(result.rejected)
+        rejected_df = pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame(columns=["row", "reason"])
+        return IngestReport(rows_read, inserted, rejected_df)
@@ -1,13 +1,34 @@
 import bcrypt
 import re
 import pandas as pd
-from typing import Optional
+from typing import Iterator, Optional
 from models.user import User
+from models.records import UserRecord
 from services.database_manager import DatabaseManager
-import secrets
+from services.login_guard import get_login_guard
+from services.session_store import SessionStore
+from services.principal_cache import get_principal_cache
+from services.bcrypt_cost import BcryptCost
+from services.breached_passwords import is_breached_password
+from services.password_strength import StrengthEstimate, get_password_estimator
 
 
 
+def _rehash_password(db: DatabaseManager, username: str, plain_text_password: str, old_hash: str, cost: int) -> None:
+    """Background job: stores a new hash at the current cost, unless the password changed meanwhile."""
+    new_hash = bcrypt.hashpw(plain_text_password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("utf-8")
+    #runs on a pool thread, so it needs its own connection
+    worker_db = db.clone()
+    try:
+        worker_db.execute_query(
+            "UPDATE users SET password_hash = ? WHERE username = ? AND password_hash = ?",
+            (new_hash, username, old_hash),
+        )
+    finally:
+        worker_db.close()
+    get_principal_cache().invalidate(username)
+
+
 class Hasher:   
     """Hasher functions for registering the user."""
 
@@ -18,8 +39,8 @@ class Hasher:
         """Returns a hashed password, created from plain text password."""
         #Encoding plain password into bytes
         password_bytes = plain_text_password.encode('utf-8')
-        #generating salt
-        salt = bcrypt.gensalt()
+        #generating salt with the cost calibrated for this host
+        salt = bcrypt.gensalt(rounds=BcryptCost(self.__db).get_cost())
         #adding salt to the password
         __hashed_password = bcrypt.hashpw(password_bytes, salt)
         #Decoding the password
@@ -34,11 +55,15 @@ class Hasher:
             "UPDATE users SET password_hash = ? WHERE username = ?",
             (new_hashed, username)
         ).rowcount
+        get_principal_cache().invalidate(username)
         return rows_updated == 1
         
 class AuthManager:
     """Handles user registration and login."""
 
+    #roles offered on the Register tab
+    ROLES = ["User", "Admin", "Analyst", "Cyber Security Specialist", "Data Science Specialist", "It Specialist"]
+
     def __init__(self, db: DatabaseManager):
         self.__db = db
 
@@ -46,9 +71,9 @@ class AuthManager:
     #FINDING USER IN DATABASE
     def get_user_by_username(self, username: str):
         """Retrieve user by username."""
-        row = self.__db.fetch_one("SELECT username, password_hash, role FROM users WHERE username = ?", (username,))
-        if row:
-            return User(*row)
+        principal = get_principal_cache().get(self.__db, username)
+        if principal:
+            return User(*principal, db=self.__db)
         return None
     
     #ADDING USER TO THE DATABASE
@@ -58,6 +83,7 @@ class AuthManager:
                 "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
                 (username, password_hash, role)
             )
+        get_principal_cache().invalidate(username)
         
     #VALIDATE USERNAME
     def validate_username(self, username: str) -> bool:
@@ -73,6 +99,11 @@ class AuthManager:
             and re.search(r"[!@#$%^&*(),.?/\"':{}|<>]", password)
         )
 
+    #CHECK BREACHED PASSWORD
+    def is_breached_password(self, password: str) -> bool:
+        """Returns True if the password is a common one or appears in the breached-password list."""
+        return is_breached_password(password)
+
     #REGISTER USER
     def register_user(self, username: str, password: str, role: str):
         """Returns if the user has been registered."""
@@ -84,22 +115,48 @@ class AuthManager:
             return "username"
         if not self.validate_password(password):
             return "password"
+        if self.is_breached_password(password):
+            return "breached"
         #Hashing the password
-        hashed_str = Hasher.hash_password(password)
+        hashed_str = Hasher(self.__db).hash_password(password)
         #inserting user into database
         self.insert_user(username, hashed_str, role)
         return True
     
 
     #LOGIN USER
-    def login_user(self, username: str, password: str) -> Optional[User]:
+    def login_user(self, username: str, password: str, client_id: str | None = None) -> Optional[User]:
+        """
+        Returns True on success, "username" for an unknown user, False for a wrong password,
+        "rate_limited" when there were too many attempts for the user or client, and "busy" when too
+        many password checks are already waiting or the check timed out.
+        """
+        guard = get_login_guard()
+        #throttle before any database or bcrypt work
+        if not guard.allow_attempt(username, client_id):
+            return "rate_limited"
         #getting the user info
         user = self.get_user_by_username(username)
         if not user:
             return "username"
-        if not user.verify_password(username=username, plain_text_password=password):
+        #bcrypt runs on the shared worker pool, not on the script thread
+        verified = guard.verify(password, user.get_password_hash())
+        if verified is None:
+            return "busy"
+        if not verified:
             return False
+        #upgrade hashes made with another cost while the plain password is at hand;
+        #the new hash is made on the bcrypt pool and skipped (until the next login) when the pool is full;
+        #the password stays the same, so the user's other sessions are kept
+        bcrypt_cost = BcryptCost(self.__db)
+        if bcrypt_cost.needs_rehash(user.get_password_hash()):
+            guard.submit(_rehash_password, self.__db, username, password, user.get_password_hash(), bcrypt_cost.get_cost())
         return True
+
+    #LOGIN METRICS
+    def get_login_metrics(self) -> dict:
+        """Returns verify queue depth, latency and rate limiting counters."""
+        return get_login_guard().get_metrics()
         
     #GET ALL USERS
     def get_all_users(self) -> pd.DataFrame:
@@ -107,84 +164,43 @@ class AuthManager:
         rows = self.__db.fetch_all("SELECT username, role FROM users ORDER BY id DESC")
         return pd.DataFrame(rows, columns=["username", "role"])
 
+    #ITERATE USER RECORDS
+    def iter_user_records(self, batch_size: int = 1000) -> Iterator[UserRecord]:
+        """Yield all users as lightweight records, fetched from the database in batches."""
+        rows = self.__db.iter_rows(
+            "SELECT id, username, role FROM users ORDER BY id DESC",
+            batch_size=batch_size,
+        )
+        return map(UserRecord._make, rows)
+
     #CREATING TOKEN
     def create_session(self, username: str) -> str:
-        """Creates a session token for the user."""
-        token = secrets.token_hex(16)
-        #storing token in DB for session management
-        return token
+        """Creates and stores a session token for the user."""
+        principal = get_principal_cache().get(self.__db, username)
+        return SessionStore(self.__db).create(username, principal.role if principal else None)
+
+    #ENDING SESSION
+    def end_session(self, token: str | None) -> None:
+        """Revokes a session token (logout)."""
+        SessionStore(self.__db).revoke(token)
     
     def check_password_strength(self, password):
         """Returns how strong the password is(weak, medium, strong)."""
-        # Implement logic based on:
-        # creating variable to store score for password strenght
-        score = 0
-        # - Length
-        # checking length
-        if len(password) > 16:
-            if len(password) > 20:
-                score += 10
-            else:
-                score += 5
-
-        # creating variables for checking what characters are in the password
-        numb = 0
-        sc = 0
-        ul = 0
-        # - Presence of uppercase, lowercase, digits, special characters
-        # counting how many of each characters are in the password
-        for digit in password:
-            if digit.isdigit():
-                numb += 1
-            if digit.isupper():
-                ul += 1
-            if not digit.isalnum():
-                sc += 1
-
-        # adding to score based on each character variable value
-        if numb > 2:
-            score += 10
-        if sc > 1:
-            score += 10
-        if ul > 2:
-            score += 10
-
-    # - Common password patterns
-        common_passwords = [
-            "Password1!",
-            "Welcome123!",
-            "Admin@123",
-            "Qwerty123!",
-            "Summer2024!",
-            "Winter2023@",
-            "HelloWorld1!",
-            "Test@1234",
-            "ILoveYou2!",
-            "Sunshine@9",
-            "Abc12345!",
-            "Football2025#",
-            "London2024$",
-            "Chocolate1!",
-            "MyPass@123",
-            "Secure123#",
-            "HappyDay7@",
-            "Dragon99!",
-            "Freedom#22",
-            "Monkey@88",
-            "StarLight7!",
-            "Galaxy2025!",
-            "BlueSky@11",
-            "Rainbow#123"
-        ]
-
-        # checking if password match one of the most common ones
-        for item in common_passwords:
-            if password == item:
-                return "Your password is one of the most used. Try another."
-
-        if score >= 25:
+        # checking the built-in common passwords and the breached-password filter
+        if self.is_breached_password(password):
+            return "Your password is one of the most used. Try another."
+
+        # scoring is done by the pattern-based estimator (words, keyboard rows, sequences, dates...)
+        strength = self.estimate_password_strength(password)
+
+        if strength.score >= 3:
             return "Strong password"
-        elif score >= 10:
+        elif strength.score == 2:
             return "Medium password"
         else:
-            return "Weak password"
\ No newline at end of file
+            return "Weak password"
+
+    #ESTIMATE PASSWORD STRENGTH
+    def estimate_password_strength(self, password: str, username: str = "") -> StrengthEstimate:
+        """Returns score (0-4), guesses, entropy, crack times and feedback for a password."""
+        return get_password_estimator().estimate(password, (username,))
@@ -0,0 +1,113 @@
+import argparse
+import re
+import sqlite3
+import statistics
+import time
+import bcrypt
+from services.database_manager import DatabaseManager
+
+#bcrypt.gensalt() default, used until the host has been calibrated
+DEFAULT_COST = 12
+#never go below this, however slow the host is
+MIN_COST = 10
+MAX_COST = 16
+SETTING_KEY = "bcrypt_cost"
+
+_HASH_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+def get_hash_cost(password_hash: str) -> int | None:
+    """Returns the cost factor stored in a bcrypt hash ($2b$12$... -> 12), or None if it is not a bcrypt hash."""
+    match = _HASH_COST.match(password_hash or "")
+    return int(match.group(1)) if match else None
+
+
+def measure_verify_ms(cost: int, rounds: int = 3) -> float:
+    """Returns the median time of one bcrypt check at the given cost, in milliseconds."""
+    password = b"calibration-Password1!"
+    password_hash = bcrypt.hashpw(password, bcrypt.gensalt(rounds=cost))
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        bcrypt.checkpw(password, password_hash)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_cost(target_ms: float = 250.0, min_cost: int = MIN_COST, max_cost: int = MAX_COST) -> tuple[int, float]:
+    """
+    Picks the highest cost whose verify time stays within target_ms on this host.
+    Every cost step doubles the work, so only min_cost is benchmarked in full and the
+    other costs are extrapolated; the chosen cost is then measured once to confirm.
+    Returns (cost, measured verify ms).
+    """
+    if not MIN_COST <= min_cost <= max_cost <= MAX_COST:
+        raise ValueError(f"Costs must satisfy {MIN_COST} <= min_cost <= max_cost <= {MAX_COST}")
+    base_ms = measure_verify_ms(min_cost)
+    cost = min_cost
+    while cost < max_cost and base_ms * 2 ** (cost + 1 - min_cost) <= target_ms:
+        cost += 1
+    measured_ms = base_ms if cost == min_cost else measure_verify_ms(cost, rounds=1)
+    #extrapolation was optimistic (e.g. a busy host), step back once
+    if measured_ms > target_ms * 1.25 and cost > min_cost:
+        cost -= 1
+        measured_ms /= 2
+    return cost, measured_ms
+
+
+class BcryptCost:
+    """Reads and stores the calibrated bcrypt cost in the app_settings table."""
+
+    def __init__(self, db: DatabaseManager):
+        self.__db = db
+
+    #GET COST
+    def get_cost(self) -> int:
+        """Returns the stored cost, or DEFAULT_COST if the host was never calibrated."""
+        try:
+            row = self.__db.fetch_one("SELECT value FROM app_settings WHERE key = ?", (SETTING_KEY,))
+        except sqlite3.OperationalError:
+            #settings table not created yet
+            return DEFAULT_COST
+        return int(row[0]) if row else DEFAULT_COST
+
+    #SET COST
+    def set_cost(self, cost: int) -> None:
+        """Stores the cost used for new hashes and for rehashing on login."""
+        if not MIN_COST <= cost <= MAX_COST:
+            raise ValueError(f"Cost {cost} is not valid. Choose from {MIN_COST} to {MAX_COST}")
+        self.__db.execute_query(
+            """
+            INSERT INTO app_settings (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            (SETTING_KEY, str(cost)),
+        )
+
+    #CALIBRATE
+    def calibrate(self, target_ms: float = 250.0) -> tuple[int, float]:
+        """Benchmarks the host, stores the chosen cost and returns (cost, measured verify ms)."""
+        cost, measured_ms = calibrate_cost(target_ms)
+        self.set_cost(cost)
+        return cost, measured_ms
+
+    #CHECK HASH
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when a hash was made with a different cost than the stored one."""
+        return get_hash_cost(password_hash) != self.get_cost()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt on this host and store the cost factor.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target time of one password check")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager()
+    db.create_app_settings_table()
+    cost, measured_ms = BcryptCost(db).calibrate(args.target_ms)
+    db.close()
+    print(f"✅ bcrypt cost set to {cost} ({measured_ms:.0f} ms per check, target {args.target_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from datetime import date
+import pandas as pd
+from services.database_manager import DatabaseManager, build_filter_clause
+
+
+class CorrelationEngine:
+    """
+    Links cyber incidents with IT tickets opened around the same time.
+
+    Both tables are read sorted by date and joined with a sliding-window merge: the window
+    start only moves forward, so the join costs O(incidents + tickets + matches)
+    instead of comparing every incident with every ticket.
+    """
+
+    #ticket categories that plausibly relate to each incident type
+    DEFAULT_CATEGORY_MAP = {
+        "Malware": ["Software", "Hardware", "Security"],
+        "Ransomware": ["Software", "Hardware", "Security"],
+        "DDoS": ["Network"],
+        "Insider Threat": ["Access", "Security"],
+        "Data Breach": ["Access", "Security"],
+        "Phishing": ["Access", "Security"],
+    }
+    COLUMNS = [
+        "incident_id", "incident_date", "incident_type", "severity",
+        "ticket_row_id", "ticket_id", "ticket_date", "category", "priority", "subject", "lag_days",
+    ]
+
+    def __init__(self, db: DatabaseManager, category_map: dict[str, list[str]] | None = None):
+        self.__db = db
+        #None = default map, {} = any category matches any incident type;
+        #otherwise incident types missing from the map match no category
+        self.__category_map = self.DEFAULT_CATEGORY_MAP if category_map is None else category_map
+
+    @staticmethod
+    def __day(value: str | None) -> int | None:
+        """Returns the ordinal day of a YYYY-MM-DD string (as returned by SQLite date()), or None if it is not a date."""
+        try:
+            return date.fromisoformat(str(value)[:10]).toordinal()
+        except ValueError:
+            return None
+
+    #CORRELATE
+    def correlate(self, days_before: int = 1, days_after: int = 3, incident_filters: dict | None = None, use_categories: bool = True) -> pd.DataFrame:
+        """
+        Returns (incident, ticket) pairs where the ticket was created between days_before days
+        before and days_after days after the incident date. With use_categories the ticket category
+        must also match the incident type in the category map (types missing from the map match nothing).
+        """
+        where, params = build_filter_clause(incident_filters or {}, ["incident_type", "severity", "status"])
+        #date() also accepts julian day numbers, 'now' and time values, so the window uses and
+        #sorts by its normalized YYYY-MM-DD result rather than the stored text
+        incidents = self.__db.fetch_all(
+            f"""
+            SELECT id, date, incident_type, severity, date(date) AS day FROM cyber_incidents
+            WHERE {where} AND date(date) IS NOT NULL
+            ORDER BY day, id
+            """,
+            params,
+        )
+        tickets = self.__db.fetch_all(
+            """
+            SELECT id, ticket_id, created_date, category, priority, subject, date(created_date) AS day FROM it_tickets
+            WHERE date(created_date) IS NOT NULL
+            ORDER BY day, id
+            """
+        )
+        #anything that still does not parse is left out, so the window only compares days
+        ticket_rows = []
+        ticket_days = []
+        for *ticket, day in tickets:
+            ticket_day = self.__day(day)
+            if ticket_day is not None:
+                ticket_rows.append(tuple(ticket))
+                ticket_days.append(ticket_day)
+        tickets = ticket_rows
+        use_categories = use_categories and bool(self.__category_map)
+
+        pairs = []
+        start = 0
+        for incident_id, incident_date, incident_type, severity, day in incidents:
+            incident_day = self.__day(day)
+            if incident_day is None:
+                continue
+            #slide the window start past tickets that are too old for this (and every later) incident
+            while start < len(tickets) and ticket_days[start] < incident_day - days_before:
+                start += 1
+            #unmapped incident types get an empty list and match nothing
+            allowed = self.__category_map.get(incident_type, []) if use_categories else None
+            position = start
+            while position < len(tickets) and ticket_days[position] <= incident_day + days_after:
+                row_id, ticket_id, ticket_date, category, priority, subject = tickets[position]
+                if allowed is None or category in allowed:
+                    pairs.append((
+                        incident_id, incident_date, incident_type, severity,
+                        row_id, ticket_id, ticket_date, category, priority, subject,
+                        ticket_days[position] - incident_day,
+                    ))
+                position += 1
+        return pd.DataFrame(pairs, columns=self.COLUMNS)
+
+    #CORRELATION SUMMARY
+    def summarize(self, correlated: pd.DataFrame) -> pd.DataFrame:
+        """Returns how many correlated tickets each incident type has per ticket category."""
+        if correlated.empty:
+            return pd.DataFrame()
+        return correlated.pivot_table(
+            index="incident_type", columns="category", values="ticket_row_id", aggfunc="count", fill_value=0
+        )
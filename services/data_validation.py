@@ -0,0 +1,197 @@
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+INCIDENT_SEVERITIES = ["Low", "Medium", "High", "Critical"]
+INCIDENT_STATUSES = ["Open", "Investigating", "Resolved", "Closed"]
+TICKET_PRIORITIES = ["Low", "Medium", "High", "Critical"]
+TICKET_STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+
+#validation rules of each domain: target table, inserted columns and column checks
+DOMAIN_RULES = {
+    "incident": {
+        "table": "cyber_incidents",
+        "columns": ["date", "incident_type", "severity", "status", "description", "reported_by", "created_at"],
+        "required": ["date", "incident_type", "severity", "status"],
+        "enums": {"severity": INCIDENT_SEVERITIES, "status": INCIDENT_STATUSES},
+        "dates": ["date"],
+        "timestamps": ["created_at"],
+        "integers": [],
+        "floats": [],
+        "unique": None,
+    },
+    "ticket": {
+        "table": "it_tickets",
+        "columns": ["ticket_id", "priority", "status", "category", "subject", "description",
+                    "created_date", "resolved_date", "assigned_to", "created_at"],
+        "required": ["ticket_id", "priority", "status", "subject", "created_date"],
+        "enums": {"priority": TICKET_PRIORITIES, "status": TICKET_STATUSES},
+        "dates": ["created_date", "resolved_date"],
+        "timestamps": ["created_at"],
+        "integers": [],
+        "floats": [],
+        "unique": "ticket_id",
+    },
+    "dataset": {
+        "table": "datasets_metadata",
+        "columns": ["dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb", "created_at"],
+        "required": ["dataset_name"],
+        "enums": {},
+        "dates": ["last_updated"],
+        "timestamps": ["created_at"],
+        "integers": ["record_count"],
+        "floats": ["file_size_mb"],
+        "unique": None,
+    },
+}
+
+
+class ValidationResult(NamedTuple):
+    """Clean rows ready to insert and rejected rows with the reasons they were rejected."""
+    valid: pd.DataFrame
+    rejected: pd.DataFrame
+
+
+class IngestReport(NamedTuple):
+    """Outcome of loading a file: rows read, rows inserted and the rejected-row report."""
+    rows_read: int
+    inserted: int
+    rejected: pd.DataFrame
+
+    @property
+    def skipped(self) -> int:
+        """Valid rows that were not inserted because they clash with a unique key or an existing id."""
+        return self.rows_read - self.inserted - len(self.rejected)
+
+
+def get_rules(domain: str) -> dict:
+    if domain not in DOMAIN_RULES:
+        raise ValueError(f"Domain '{domain}' is not valid. Choose from {list(DOMAIN_RULES)}")
+    return DOMAIN_RULES[domain]
+
+
+def validate_chunk(domain: str, df: pd.DataFrame) -> ValidationResult:
+    """
+    Validates and normalizes a chunk of raw rows with whole-column operations:
+    text is trimmed (empty becomes missing), enum values are matched case-insensitively
+    and written in their canonical spelling, dates and timestamps are parsed to ISO strings,
+    numbers must be non-negative. Rows failing any check are rejected with every reason found.
+    """
+    rules = get_rules(domain)
+    clean = pd.DataFrame(index=df.index)
+    reasons = pd.Series("", index=df.index, dtype=object)
+
+    def flag(mask, reason: str) -> None:
+        nonlocal reasons
+        reasons = reasons.where(~mask, reasons + reason + "; ")
+
+    for column in rules["columns"]:
+        if column in df.columns:
+            text = df[column].astype("string").str.strip()
+            clean[column] = text.mask(text == "")
+        else:
+            clean[column] = pd.Series(pd.NA, index=df.index, dtype="string")
+
+    for column in rules["required"]:
+        flag(clean[column].isna(), f"missing {column}")
+
+    for column, allowed in rules["enums"].items():
+        canonical = clean[column].str.lower().map({value.lower(): value for value in allowed})
+        flag(clean[column].notna() & canonical.isna(), f"invalid {column}")
+        clean[column] = canonical
+
+    for column in rules["dates"] + rules["timestamps"]:
+        parsed = pd.to_datetime(clean[column], errors="coerce", format="ISO8601")
+        flag(clean[column].notna() & parsed.isna(), f"invalid {column}")
+        clean[column] = parsed
+
+    for column in rules["integers"] + rules["floats"]:
+        number = pd.to_numeric(clean[column], errors="coerce")
+        invalid = clean[column].notna() & (number.isna() | (number < 0))
+        if column in rules["integers"]:
+            invalid |= number.notna() & (number % 1 != 0)
+        flag(invalid, f"invalid {column}")
+        clean[column] = number
+
+    #domain-specific checks
+    if domain == "ticket":
+        flag(clean["resolved_date"] < clean["created_date"], "resolved_date before created_date")
+    if rules["unique"]:
+        key = clean[rules["unique"]]
+        flag(key.notna() & key.duplicated(), f"duplicate {rules['unique']} in file")
+
+    rejected_mask = reasons != ""
+    rejected = df[rejected_mask].copy()
+    rejected.insert(0, "reason", reasons[rejected_mask].str.rstrip("; "))
+    rejected.insert(0, "row", rejected.index)
+
+    valid = clean[~rejected_mask].copy()
+    #back to plain Python values SQLite can bind
+    for column in rules["dates"]:
+        valid[column] = valid[column].dt.strftime("%Y-%m-%d")
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for column in rules["timestamps"]:
+        valid[column] = valid[column].dt.strftime("%Y-%m-%d %H:%M:%S").fillna(now)
+    for column in rules["integers"]:
+        valid[column] = valid[column].astype("Int64")
+    valid = valid.astype(object).where(valid.notna(), None)
+    return ValidationResult(valid, rejected.reset_index(drop=True))
+
+
+def insert_valid_rows(db: DatabaseManager, domain: str, valid: pd.DataFrame) -> int:
+    """
+    Bulk inserts validated rows in one transaction. An id column, if the frame has one, is inserted too.
+    Rows clashing with a unique key or an existing id are skipped.
+    """
+    if valid.empty:
+        return 0
+    rules = get_rules(domain)
+    columns = (["id"] if "id" in valid.columns else []) + rules["columns"]
+    cur = db.execute_many(
+        f"INSERT OR IGNORE INTO {rules['table']} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        valid[columns].itertuples(index=False, name=None),
+    )
+    return cur.rowcount
+
+
+def ingest_csv(db: DatabaseManager, domain: str, path, chunksize: int = 50_000) -> IngestReport:
+    """Reads a CSV file in chunks, validates each chunk and bulk inserts the valid rows."""
+    rows_read = 0
+    inserted = 0
+    rejected = []
+    #everything is read as text, so validation sees the raw values
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+        rows_read += len(chunk)
+        result = validate_chunk(domain, chunk)
+        inserted += insert_valid_rows(db, domain, result.valid)
+        if not result.rejected.empty:
+            rejected.append(result.rejected)
+    rejected_df = pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame(columns=["row", "reason"])
+    return IngestReport(rows_read, inserted, rejected_df)
+
+
+def ingest_csv_once(db: DatabaseManager, domain: str, path, chunksize: int = 50_000) -> IngestReport | None:
+    """
+    Ingests a seed CSV file the first time only, recording it in app_settings; incidents and datasets
+    have no unique key, so loading the file again would duplicate every row. A table that already has
+    rows but no record (filled before the record existed) is marked as loaded without ingesting.
+    Delete the app_settings row to load the file again. Returns None when nothing was ingested.
+    """
+    rules = get_rules(domain)
+    path = Path(path)
+    key = f"csv_ingest:{domain}:{path.resolve()}"
+    if db.fetch_one("SELECT 1 FROM app_settings WHERE key = ?", (key,)):
+        return None
+    has_rows = db.fetch_one(f"SELECT EXISTS (SELECT 1 FROM {rules['table']})")[0]
+    report = None if has_rows else ingest_csv(db, domain, path, chunksize)
+    stat = path.stat()
+    db.execute_query(
+        """
+        INSERT INTO app_settings (key, value, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+        """,
+        (key, f"size={stat.st_size} mtime_ns={stat.st_mtime_ns}"),
+    )
+    return report
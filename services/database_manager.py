@@ -1,7 +1,40 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
 from typing import Any, Iterable
 from pathlib import Path
 
+def build_filter_clause(filters: dict[str, Any], valid_columns: list[str]) -> tuple[str, tuple]:
+    """
+    Builds a WHERE clause from {column: value} filters.
+    List/tuple values become IN (...) checks. Columns are checked against valid_columns.
+    """
+    conditions = []
+    params = []
+    for column, value in filters.items():
+        if column not in valid_columns:
+            raise ValueError(f"Column '{column}' is not valid. Choose from {valid_columns}")
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                #empty IN list can never match
+                conditions.append("0 = 1")
+                continue
+            conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        elif value is None:
+            conditions.append(f"{column} IS NULL")
+        else:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    return " AND ".join(conditions) or "1 = 1", tuple(params)
+
+
+#database files whose tables were already created by this process
+_TABLES_READY: set[str] = set()
+_TABLES_LOCK = threading.Lock()
+
+
 class DatabaseManager:
     """Handles SQLite database connections and queries."""
 
@@ -20,6 +53,18 @@ class DatabaseManager:
         if self.__connection is None:
             self.__connection = sqlite3.connect(self.__db_path)
 
+    #CLONE
+    def clone(self) -> "DatabaseManager":
+        """Returns a new manager for the same database file, for work on another thread or process."""
+        manager = DatabaseManager()
+        manager.__db_path = self.__db_path
+        return manager
+
+    #GET DATABASE PATH
+    def get_db_path(self) -> str:
+        """Returns the database file path, e.g. to key process-wide caches by database."""
+        return str(self.__db_path)
+
     #CLOSE CONNECTION
     def close(self) -> None:
         if self.__connection is not None:
@@ -36,6 +81,41 @@ class DatabaseManager:
         self.__connection.commit()
         return cur
     
+    #EXECUTE MANY
+    def execute_many(self, sql: str, seq_of_params: Iterable[Iterable[Any]]):
+        """Execute a write query once per parameter set, all in one transaction."""
+        if self.__connection is None:
+            self.connect()
+        cur = self.__connection.cursor()
+        try:
+            cur.executemany(sql, (tuple(params) for params in seq_of_params))
+            self.__connection.commit()
+        except sqlite3.Error:
+            self.__connection.rollback()
+            raise
+        return cur
+
+    #EXECUTE RETURNING
+    def execute_returning(self, sql: str, params: Iterable[Any] = ()):
+        """Execute a write query with a RETURNING clause and return its rows."""
+        if self.__connection is None:
+            self.connect()
+        cur = self.__connection.cursor()
+        cur.execute(sql, tuple(params))
+        #rows must be read before the commit
+        rows = cur.fetchall()
+        self.__connection.commit()
+        return rows
+
+    #TRANSACTION
+    @contextmanager
+    def transaction(self):
+        """Yields a cursor whose statements are committed together, or rolled back if one fails."""
+        if self.__connection is None:
+            self.connect()
+        with self.__connection:
+            yield self.__connection.cursor()
+
     #FETCH ONE
     def fetch_one(self, sql: str, params: Iterable[Any] = ()):
         if self.__connection is None:
@@ -51,7 +131,20 @@ class DatabaseManager:
         cur = self.__connection.cursor()
         cur.execute(sql, tuple(params))
         return cur.fetchall()
-    
+
+    #ITERATE ROWS
+    def iter_rows(self, sql: str, params: Iterable[Any] = (), batch_size: int = 1000):
+        """Yield the rows of a read query in batches, without loading them all into memory."""
+        if self.__connection is None:
+            self.connect()
+        cur = self.__connection.cursor()
+        cur.execute(sql, tuple(params))
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
     #CREATING USERS TABLE
     def create_users_table(self):
         """Creates users table, if not already created."""
@@ -65,6 +158,34 @@ class DatabaseManager:
         """)
         print("✅ Users table created successfully!")
 
+    #CREATING SESSIONS TABLE
+    def create_sessions_table(self):
+        """Creates the login sessions table. Only SHA-256 hashes of session tokens are stored."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                token_hash TEXT PRIMARY KEY,
+                username TEXT NOT NULL,
+                role TEXT,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username)")
+        print("✅ Sessions table created successfully!")
+
+    #CREATING APP SETTINGS TABLE
+    def create_app_settings_table(self):
+        """Creates the key/value table for settings measured or chosen at runtime (e.g. bcrypt cost)."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS app_settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        print("✅ App settings table created successfully!")
+
     #CREATING INCIDENTS TABLE
     def create_cyber_incidents_table(self):
         """Creates incidents table, if not already created."""
@@ -119,11 +240,423 @@ class DatabaseManager:
         """)
         print("✅ IT tickets table created successfully!")
 
+    #CREATING SLA TARGETS TABLE
+    def create_sla_targets_table(self):
+        """Creates the SLA targets table (resolution target in days per ticket priority) with default targets."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS sla_targets (
+                priority TEXT PRIMARY KEY,
+                target_days REAL NOT NULL
+            )
+        """)
+        self.execute_many(
+            "INSERT OR IGNORE INTO sla_targets (priority, target_days) VALUES (?, ?)",
+            [("Critical", 1), ("High", 3), ("Medium", 7), ("Low", 14)]
+        )
+        print("✅ SLA targets table created successfully!")
+
+    #CREATING TRIAGE QUEUE TABLE
+    def create_triage_queue_table(self):
+        """
+        Creates the triage queue of open tickets, kept up to date by triggers on it_tickets and sla_targets.
+        A partial index over unclaimed rows in queue order makes "next N tickets" an index range scan.
+        """
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS ticket_triage_queue (
+                ticket_row_id INTEGER PRIMARY KEY,
+                priority_rank INTEGER NOT NULL,
+                sla_deadline TEXT,
+                created_date TEXT,
+                claimed_by TEXT,
+                claimed_at TEXT
+            )
+        """)
+        self.execute_query("""
+            CREATE INDEX IF NOT EXISTS idx_triage_queue_next
+            ON ticket_triage_queue (priority_rank, sla_deadline, created_date, ticket_row_id)
+            WHERE claimed_by IS NULL
+        """)
+        self.execute_query("""
+            CREATE INDEX IF NOT EXISTS idx_triage_queue_claims ON ticket_triage_queue (claimed_by, claimed_at)
+            WHERE claimed_by IS NOT NULL
+        """)
+
+        #queue columns computed from a ticket row
+        queue_values = """
+            NEW.id,
+            CASE NEW.priority WHEN 'Critical' THEN 0 WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 WHEN 'Low' THEN 3 ELSE 4 END,
+            datetime(NEW.created_date, '+' || (SELECT target_days FROM sla_targets WHERE priority = NEW.priority) || ' days'),
+            NEW.created_date
+        """
+        upsert_ticket = f"""
+            INSERT INTO ticket_triage_queue (ticket_row_id, priority_rank, sla_deadline, created_date)
+            SELECT {queue_values}
+            WHERE NEW.status IS NULL OR NEW.status NOT IN ('Resolved', 'Closed')
+            ON CONFLICT (ticket_row_id) DO UPDATE SET
+                priority_rank = excluded.priority_rank,
+                sla_deadline = excluded.sla_deadline,
+                created_date = excluded.created_date;
+        """
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS triage_queue_insert AFTER INSERT ON it_tickets
+            BEGIN {upsert_ticket} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS triage_queue_update
+            AFTER UPDATE OF status, priority, created_date ON it_tickets
+            BEGIN
+                DELETE FROM ticket_triage_queue
+                WHERE ticket_row_id = OLD.id AND NEW.status IN ('Resolved', 'Closed');
+                {upsert_ticket}
+            END
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS triage_queue_delete AFTER DELETE ON it_tickets
+            BEGIN
+                DELETE FROM ticket_triage_queue WHERE ticket_row_id = OLD.id;
+            END
+        """)
+        #adding or changing an SLA target moves the deadlines of that priority
+        move_deadlines = """
+            UPDATE ticket_triage_queue
+            SET sla_deadline = datetime(created_date, '+' || NEW.target_days || ' days')
+            WHERE ticket_row_id IN (SELECT id FROM it_tickets WHERE priority = NEW.priority);
+        """
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS triage_queue_sla_insert AFTER INSERT ON sla_targets
+            BEGIN {move_deadlines} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS triage_queue_sla_update AFTER UPDATE OF target_days ON sla_targets
+            BEGIN {move_deadlines} END
+        """)
+
+        #backfill open tickets that existed before the triggers
+        self.execute_query("""
+            INSERT OR IGNORE INTO ticket_triage_queue (ticket_row_id, priority_rank, sla_deadline, created_date)
+            SELECT t.id,
+                   CASE t.priority WHEN 'Critical' THEN 0 WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 WHEN 'Low' THEN 3 ELSE 4 END,
+                   datetime(t.created_date, '+' || s.target_days || ' days'),
+                   t.created_date
+            FROM it_tickets t
+            LEFT JOIN sla_targets s ON s.priority = t.priority
+            WHERE t.status IS NULL OR t.status NOT IN ('Resolved', 'Closed')
+        """)
+        print("✅ Triage queue table created successfully!")
+
+    #CREATING SIMILARITY CHANGES TABLE
+    def create_similarity_changes_table(self):
+        """
+        Creates the change log read by the in-memory TF-IDF indexes: triggers add the id of every
+        incident or ticket whose indexed text is edited or that is deleted, so a refresh only
+        re-reads those rows.
+        """
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS similarity_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                domain TEXT NOT NULL,
+                record_id INTEGER NOT NULL
+            )
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS similarity_incident_update
+            AFTER UPDATE OF incident_type, description ON cyber_incidents
+            BEGIN INSERT INTO similarity_changes (domain, record_id) VALUES ('incident', OLD.id); END
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS similarity_incident_delete AFTER DELETE ON cyber_incidents
+            BEGIN INSERT INTO similarity_changes (domain, record_id) VALUES ('incident', OLD.id); END
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS similarity_ticket_update
+            AFTER UPDATE OF category, subject, description ON it_tickets
+            BEGIN INSERT INTO similarity_changes (domain, record_id) VALUES ('ticket', OLD.id); END
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS similarity_ticket_delete AFTER DELETE ON it_tickets
+            BEGIN INSERT INTO similarity_changes (domain, record_id) VALUES ('ticket', OLD.id); END
+        """)
+        print("✅ Similarity changes table created successfully!")
+
+    #CREATING DUPLICATE INDEX TABLES
+    def create_duplicate_index_tables(self):
+        """Creates the MinHash signature and LSH bucket tables used for near-duplicate detection."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS minhash_signatures (
+                domain TEXT NOT NULL,
+                record_id INTEGER NOT NULL,
+                signature BLOB NOT NULL,
+                PRIMARY KEY (domain, record_id)
+            )
+        """)
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                domain TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                record_id INTEGER NOT NULL
+            )
+        """)
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_lsh_buckets_lookup ON lsh_buckets (domain, band, bucket)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_lsh_buckets_record ON lsh_buckets (domain, record_id)")
+        #an edited or deleted record loses its signature, so index_new_records picks it up again
+        drop_signature = """
+            DELETE FROM minhash_signatures WHERE domain = '{domain}' AND record_id = OLD.id;
+            DELETE FROM lsh_buckets WHERE domain = '{domain}' AND record_id = OLD.id;
+        """
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS minhash_ticket_update
+            AFTER UPDATE OF subject, description ON it_tickets
+            BEGIN {drop_signature.format(domain="ticket")} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS minhash_ticket_delete AFTER DELETE ON it_tickets
+            BEGIN {drop_signature.format(domain="ticket")} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS minhash_incident_update
+            AFTER UPDATE OF incident_type, description ON cyber_incidents
+            BEGIN {drop_signature.format(domain="incident")} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS minhash_incident_delete AFTER DELETE ON cyber_incidents
+            BEGIN {drop_signature.format(domain="incident")} END
+        """)
+        print("✅ Duplicate index tables created successfully!")
+
+    #CREATING ANOMALY STATE TABLE
+    def create_anomaly_state_table(self):
+        """Creates the table holding the running incident rate (EWMA) per incident type and severity."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS incident_rate_state (
+                incident_type TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                day TEXT NOT NULL,
+                day_count INTEGER NOT NULL DEFAULT 0,
+                ewma_mean REAL NOT NULL DEFAULT 0,
+                ewma_var REAL NOT NULL DEFAULT 0,
+                days_seen INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (incident_type, severity)
+            )
+        """)
+        print("✅ Incident rate state table created successfully!")
+
+    #CREATING INDEXES
+    def create_indexes(self):
+        """Creates indexes used by the analytics queries, if not already created."""
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_it_tickets_priority_dates ON it_tickets (priority, resolved_date, created_date)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_it_tickets_category_dates ON it_tickets (category, resolved_date, created_date)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_it_tickets_assignee_dates ON it_tickets (assigned_to, resolved_date, created_date)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_datasets_category_size ON datasets_metadata (category, file_size_mb)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_datasets_source_size ON datasets_metadata (source, file_size_mb)")
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_datasets_last_updated ON datasets_metadata (last_updated)")
+        print("✅ Indexes created successfully!")
+
+    #CREATING DATASET PROFILES TABLE
+    def create_dataset_profiles_table(self):
+        """Creates the table holding file profiles (size, hash, column stats) of local dataset files."""
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS dataset_profiles (
+                dataset_name TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                file_format TEXT,
+                size_bytes INTEGER,
+                row_count INTEGER,
+                content_hash TEXT,
+                column_stats TEXT,
+                profiled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        print("✅ Dataset profiles table created successfully!")
+
+    #CREATING DATASET RECORD HISTORY TABLE
+    def create_dataset_history_table(self):
+        """
+        Creates the append-only record count history of datasets, filled by triggers.
+        Only deltas are stored (the first row of a dataset holds its full count), at most one row
+        per dataset and day: several changes on the same day are merged into one delta.
+        """
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS dataset_record_history (
+                dataset_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                delta INTEGER NOT NULL,
+                PRIMARY KEY (dataset_id, day)
+            )
+        """)
+        #baseline: the count a dataset is inserted with, dated by its last update
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS dataset_history_insert AFTER INSERT ON datasets_metadata
+            BEGIN
+                INSERT INTO dataset_record_history (dataset_id, day, delta)
+                VALUES (NEW.id, COALESCE(date(NEW.last_updated), date('now')), COALESCE(NEW.record_count, 0))
+                ON CONFLICT (dataset_id, day) DO UPDATE SET delta = delta + excluded.delta;
+            END
+        """)
+        self.execute_query("""
+            CREATE TRIGGER IF NOT EXISTS dataset_history_update
+            AFTER UPDATE OF record_count ON datasets_metadata
+            WHEN NEW.record_count IS NOT OLD.record_count
+            BEGIN
+                INSERT INTO dataset_record_history (dataset_id, day, delta)
+                VALUES (NEW.id, date('now'), COALESCE(NEW.record_count, 0) - COALESCE(OLD.record_count, 0))
+                ON CONFLICT (dataset_id, day) DO UPDATE SET delta = delta + excluded.delta;
+            END
+        """)
+
+        #baseline rows for datasets that existed before the triggers
+        self.execute_query("""
+            INSERT INTO dataset_record_history (dataset_id, day, delta)
+            SELECT id, COALESCE(date(last_updated), date('now')), COALESCE(record_count, 0)
+            FROM datasets_metadata
+            WHERE id NOT IN (SELECT dataset_id FROM dataset_record_history)
+        """)
+        print("✅ Dataset record history table created successfully!")
+
+    #CREATING ROLLUP TABLES
+    def create_rollup_tables(self):
+        """
+        Creates daily rollup tables for incidents and tickets, kept up to date by triggers.
+        Missing values are stored as '' so they still group under the primary key.
+        """
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS incident_daily_rollup (
+                day TEXT NOT NULL,
+                incident_type TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, incident_type, severity, status)
+            )
+        """)
+        self.execute_query("""
+            CREATE TABLE IF NOT EXISTS ticket_daily_rollup (
+                day TEXT NOT NULL,
+                category TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                status TEXT NOT NULL,
+                opened INTEGER NOT NULL DEFAULT 0,
+                closed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, category, priority, status)
+            )
+        """)
+
+        #incident rollup statements, reused by the triggers below
+        add_incident = """
+            INSERT INTO incident_daily_rollup (day, incident_type, severity, status, count)
+            VALUES (COALESCE(date(NEW.date), ''), COALESCE(NEW.incident_type, ''), COALESCE(NEW.severity, ''), COALESCE(NEW.status, ''), 1)
+            ON CONFLICT (day, incident_type, severity, status) DO UPDATE SET count = count + 1;
+        """
+        remove_incident = """
+            UPDATE incident_daily_rollup SET count = count - 1
+            WHERE day = COALESCE(date(OLD.date), '') AND incident_type = COALESCE(OLD.incident_type, '')
+              AND severity = COALESCE(OLD.severity, '') AND status = COALESCE(OLD.status, '');
+        """
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS incident_rollup_insert AFTER INSERT ON cyber_incidents
+            BEGIN {add_incident} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS incident_rollup_delete AFTER DELETE ON cyber_incidents
+            BEGIN {remove_incident} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS incident_rollup_update
+            AFTER UPDATE OF date, incident_type, severity, status ON cyber_incidents
+            BEGIN {remove_incident} {add_incident} END
+        """)
+
+        #ticket rollup statements: opened counts on created_date, closed counts on resolved_date
+        add_ticket = """
+            INSERT INTO ticket_daily_rollup (day, category, priority, status, opened)
+            VALUES (COALESCE(date(NEW.created_date), ''), COALESCE(NEW.category, ''), COALESCE(NEW.priority, ''), COALESCE(NEW.status, ''), 1)
+            ON CONFLICT (day, category, priority, status) DO UPDATE SET opened = opened + 1;
+            INSERT INTO ticket_daily_rollup (day, category, priority, status, closed)
+            SELECT date(NEW.resolved_date), COALESCE(NEW.category, ''), COALESCE(NEW.priority, ''), COALESCE(NEW.status, ''), 1
+            WHERE date(NEW.resolved_date) IS NOT NULL
+            ON CONFLICT (day, category, priority, status) DO UPDATE SET closed = closed + 1;
+        """
+        remove_ticket = """
+            UPDATE ticket_daily_rollup SET opened = opened - 1
+            WHERE day = COALESCE(date(OLD.created_date), '') AND category = COALESCE(OLD.category, '')
+              AND priority = COALESCE(OLD.priority, '') AND status = COALESCE(OLD.status, '');
+            UPDATE ticket_daily_rollup SET closed = closed - 1
+            WHERE day = date(OLD.resolved_date) AND category = COALESCE(OLD.category, '')
+              AND priority = COALESCE(OLD.priority, '') AND status = COALESCE(OLD.status, '');
+        """
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS ticket_rollup_insert AFTER INSERT ON it_tickets
+            BEGIN {add_ticket} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS ticket_rollup_delete AFTER DELETE ON it_tickets
+            BEGIN {remove_ticket} END
+        """)
+        self.execute_query(f"""
+            CREATE TRIGGER IF NOT EXISTS ticket_rollup_update
+            AFTER UPDATE OF created_date, resolved_date, category, priority, status ON it_tickets
+            BEGIN {remove_ticket} {add_ticket} END
+        """)
+
+        #backfill rows that existed before the triggers
+        if self.fetch_one("SELECT 1 FROM incident_daily_rollup LIMIT 1") is None:
+            self.rebuild_rollups()
+        print("✅ Rollup tables created successfully!")
+
+    #REBUILDING ROLLUPS
+    def rebuild_rollups(self):
+        """Recomputes both rollup tables from scratch in one transaction."""
+        if self.__connection is None:
+            self.connect()
+        with self.__connection:
+            self.__connection.execute("DELETE FROM incident_daily_rollup")
+            self.__connection.execute("""
+                INSERT INTO incident_daily_rollup (day, incident_type, severity, status, count)
+                SELECT COALESCE(date(date), ''), COALESCE(incident_type, ''), COALESCE(severity, ''), COALESCE(status, ''), COUNT(*)
+                FROM cyber_incidents
+                GROUP BY 1, 2, 3, 4
+            """)
+            self.__connection.execute("DELETE FROM ticket_daily_rollup")
+            self.__connection.execute("""
+                INSERT INTO ticket_daily_rollup (day, category, priority, status, opened, closed)
+                SELECT day, category, priority, status, SUM(opened), SUM(closed)
+                FROM (
+                    SELECT COALESCE(date(created_date), '') AS day, COALESCE(category, '') AS category,
+                           COALESCE(priority, '') AS priority, COALESCE(status, '') AS status, 1 AS opened, 0 AS closed
+                    FROM it_tickets
+                    UNION ALL
+                    SELECT date(resolved_date), COALESCE(category, ''), COALESCE(priority, ''), COALESCE(status, ''), 0, 1
+                    FROM it_tickets
+                    WHERE date(resolved_date) IS NOT NULL
+                )
+                GROUP BY day, category, priority, status
+            """)
+
     #CREATING ALL TABLES
     def create_all_tables(self):
         """Creates all tables, if they are not already created."""
         self.create_users_table()
+        self.create_sessions_table()
+        self.create_app_settings_table()
         self.create_cyber_incidents_table()
         self.create_datasets_metadata_table()
         self.create_it_tickets_table()
-        print("✅ All tables created successfully!")
\ No newline at end of file
+        self.create_sla_targets_table()
+        self.create_dataset_profiles_table()
+        self.create_dataset_history_table()
+        self.create_rollup_tables()
+        self.create_triage_queue_table()
+        self.create_similarity_changes_table()
+        self.create_duplicate_index_tables()
+        self.create_anomaly_state_table()
+        self.create_indexes()
+        print("✅ All tables created successfully!")
+
+    #CREATING ALL TABLES ONCE
+    def ensure_tables(self) -> None:
+        """Runs create_all_tables once per process and database file, so page reruns skip the DDL."""
+        with _TABLES_LOCK:
+            if str(self.__db_path) in _TABLES_READY:
+                return
+            self.create_all_tables()
+            _TABLES_READY.add(str(self.__db_path))
\ No newline at end of file
@@ -0,0 +1,309 @@
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+SUPPORTED_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+
+def _empty_stats() -> dict:
+    return {"non_null": 0, "nulls": 0, "numeric": 0, "min": None, "max": None, "sum": 0.0}
+
+
+def _add_value(stats: dict, value) -> None:
+    """Adds one cell to a column's running stats."""
+    if value is None or value == "":
+        stats["nulls"] += 1
+        return
+    stats["non_null"] += 1
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return
+    if number != number:  # NaN
+        return
+    stats["numeric"] += 1
+    stats["sum"] += number
+    stats["min"] = number if stats["min"] is None else min(stats["min"], number)
+    stats["max"] = number if stats["max"] is None else max(stats["max"], number)
+
+
+def _merge_stats(total: dict, part: dict) -> None:
+    """Merges the column stats of one chunk into the file totals."""
+    for column, stats in part.items():
+        merged = total.setdefault(column, _empty_stats())
+        for key in ("non_null", "nulls", "numeric", "sum"):
+            merged[key] += stats[key]
+        for key, pick in (("min", min), ("max", max)):
+            if stats[key] is not None:
+                merged[key] = stats[key] if merged[key] is None else pick(merged[key], stats[key])
+
+
+def _scan_chunk(path: str, start: int, end: int, file_format: str, header: list[str] | None):
+    """
+    Worker: memory-maps a file and scans bytes [start, end).
+    Returns (chunk digest, row count, column stats). Runs in a separate process.
+    """
+    stats: dict[str, dict] = {}
+    rows = 0
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        #a view of the mapped pages, not a copy; released before the map is closed
+        with memoryview(mapped)[start:end] as chunk:
+            digest = hashlib.blake2b(chunk, digest_size=32).digest()
+            text = str(chunk, "utf-8", errors="replace") if file_format in ("csv", "jsonl") else ""
+
+    if file_format == "csv":
+        #chunks end on record boundaries, so quoted fields with line breaks stay in one chunk
+        reader = csv.reader(io.StringIO(text, newline=""))
+        #the header record belongs to the first chunk
+        if start == 0:
+            next(reader, None)
+        columns = header or []
+        for column in columns:
+            stats[column] = _empty_stats()
+        for row in reader:
+            if not row:
+                continue
+            rows += 1
+            for column, value in zip(columns, row):
+                _add_value(stats[column], value)
+    elif file_format == "jsonl":
+        #JSON strings cannot hold raw line breaks, so every newline ends a record
+        rows = text.count("\n")
+        for line in text.split("\n"):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                for column, value in record.items():
+                    _add_value(stats.setdefault(column, _empty_stats()), value)
+    return digest, rows, stats
+
+
+class DatasetProfiler:
+    """
+    Profiles local dataset files (CSV, JSONL, Parquet) and keeps datasets_metadata in sync with them.
+
+    Files are memory-mapped and cut into chunks at line boundaries (for CSV, only at newlines outside
+    quoted fields); chunks are scanned in worker processes for row counts, column stats and chunk digests. The content hash is the BLAKE2b of all
+    chunk digests, so it can be computed in parallel; hashes are comparable between runs with the same
+    chunk_size, whatever the number of workers. Parquet row counts and column stats are read
+    from the file footer without scanning the data.
+    """
+
+    def __init__(self, db: DatabaseManager, workers: int | None = None, chunk_size: int = 32 * 1024 * 1024):
+        self.__db = db
+        self.__workers = workers or os.cpu_count() or 1
+        self.__chunk_size = chunk_size
+
+    def __chunk_bounds(self, path: Path, size: int, quoted: bool = False) -> list[tuple[int, int]]:
+        """
+        Splits a file into ~chunk_size byte ranges that end right after a newline.
+        With quoted=True (CSV) a newline only ends a range when an even number of double quotes
+        comes before it, i.e. when it is not inside a quoted field; this costs one serial pass
+        counting the quotes. Files with stray quotes in unquoted fields may end up as one chunk.
+        """
+        if size == 0:
+            return []
+        bounds = []
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = np.frombuffer(mapped, dtype=np.uint8)
+            quote = ord('"')
+            start = 0
+            while start < size:
+                end = min(start + self.__chunk_size, size)
+                if end < size:
+                    newline = mapped.find(b"\n", end)
+                    if quoted:
+                        inside = np.count_nonzero(data[start:end] == quote) % 2
+                        position = end
+                        #move on to the next newline while it is inside a quoted field
+                        while newline != -1:
+                            inside ^= np.count_nonzero(data[position:newline] == quote) % 2
+                            if not inside:
+                                break
+                            position = newline + 1
+                            newline = mapped.find(b"\n", position)
+                    end = size if newline == -1 else newline + 1
+                bounds.append((start, end))
+                start = end
+            #drop the export, so the map can be closed
+            del data
+        return bounds
+
+    @staticmethod
+    def __read_header(path: Path) -> list[str]:
+        with open(path, newline="", encoding="utf-8", errors="replace") as file:
+            return next(csv.reader(file), [])
+
+    @staticmethod
+    def __finish_stats(stats: dict) -> dict:
+        """Turns running sums into means and drops the bookkeeping fields."""
+        finished = {}
+        for column, values in stats.items():
+            finished[column] = {
+                "non_null": values["non_null"],
+                "nulls": values["nulls"],
+                "min": values["min"],
+                "max": values["max"],
+                "mean": round(values["sum"] / values["numeric"], 4) if values["numeric"] else None,
+            }
+        return finished
+
+    def __parquet_profile(self, path: Path) -> tuple[int, dict]:
+        """Reads row count and column stats of a Parquet file from its footer."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Profiling Parquet files requires pyarrow (pip install pyarrow).") from error
+
+        metadata = pq.ParquetFile(path).metadata
+        stats: dict[str, dict] = {}
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for index in range(row_group.num_columns):
+                column = row_group.column(index)
+                merged = stats.setdefault(column.path_in_schema, {"non_null": 0, "nulls": 0, "min": None, "max": None, "mean": None})
+                column_stats = column.statistics
+                if column_stats is None:
+                    continue
+                nulls = column_stats.null_count or 0
+                merged["nulls"] += nulls
+                merged["non_null"] += row_group.num_rows - nulls
+                if column_stats.has_min_max and isinstance(column_stats.min, (int, float)):
+                    merged["min"] = column_stats.min if merged["min"] is None else min(merged["min"], column_stats.min)
+                    merged["max"] = column_stats.max if merged["max"] is None else max(merged["max"], column_stats.max)
+        return metadata.num_rows, stats
+
+    #PROFILE FILES
+    def profile_files(self, paths) -> pd.DataFrame:
+        """Profiles the given files, scanning all their chunks in one process pool."""
+        files = []
+        tasks = []
+        for path in map(Path, paths):
+            file_format = SUPPORTED_FORMATS.get(path.suffix.lower())
+            if file_format is None:
+                continue
+            size = path.stat().st_size
+            header = self.__read_header(path) if file_format == "csv" and size else None
+            #Parquet data is only hashed, not parsed
+            scan_format = "raw" if file_format == "parquet" else file_format
+            bounds = self.__chunk_bounds(path, size, quoted=file_format == "csv")
+            files.append((path, file_format, size, len(bounds)))
+            tasks.extend((str(path), start, end, scan_format, header) for start, end in bounds)
+
+        #small jobs are not worth starting processes for
+        if len(tasks) > 1 and self.__workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.__workers, len(tasks))) as pool:
+                results = list(pool.map(_scan_chunk, *zip(*tasks)))
+        else:
+            results = [_scan_chunk(*task) for task in tasks]
+
+        profiles = []
+        position = 0
+        for path, file_format, size, chunk_count in files:
+            chunk_results = results[position:position + chunk_count]
+            position += chunk_count
+
+            content_hash = hashlib.blake2b(digest_size=32)
+            row_count = 0
+            stats: dict[str, dict] = {}
+            for digest, chunk_rows, chunk_stats in chunk_results:
+                content_hash.update(digest)
+                row_count += chunk_rows
+                _merge_stats(stats, chunk_stats)
+
+            if file_format == "parquet":
+                row_count, column_stats = self.__parquet_profile(path)
+            else:
+                #a last JSONL line without a trailing newline is still a row (CSV rows are parsed records)
+                if file_format == "jsonl" and size:
+                    with open(path, "rb") as file:
+                        file.seek(-1, os.SEEK_END)
+                        row_count += file.read(1) != b"\n"
+                column_stats = self.__finish_stats(stats)
+
+            profiles.append({
+                "dataset_name": path.stem,
+                "path": str(path.resolve()),
+                "file_format": file_format,
+                "size_bytes": size,
+                "file_size_mb": round(size / (1024 * 1024), 2),
+                "row_count": row_count,
+                "content_hash": content_hash.hexdigest(),
+                "columns": len(column_stats),
+                "column_stats": column_stats,
+                "last_updated": date.fromtimestamp(path.stat().st_mtime).isoformat(),
+            })
+        return pd.DataFrame(profiles)
+
+    #PROFILE DIRECTORY
+    def profile_directory(self, directory: str, recursive: bool = False) -> pd.DataFrame:
+        """Profiles every supported dataset file in a directory."""
+        pattern = "**/*" if recursive else "*"
+        paths = sorted(path for path in Path(directory).glob(pattern) if path.is_file() and path.suffix.lower() in SUPPORTED_FORMATS)
+        return self.profile_files(paths)
+
+    #UPSERT METADATA
+    def upsert_metadata(self, profiles: pd.DataFrame, category: str = "Local Files", source: str = "Local File") -> tuple[int, int]:
+        """
+        Writes profiles to datasets_metadata (matched by dataset_name) and dataset_profiles,
+        all in one transaction. Returns (updated, inserted) dataset counts.
+        """
+        if profiles.empty:
+            return 0, 0
+        names = profiles["dataset_name"].tolist()
+        existing = {
+            row[0] for row in self.__db.fetch_all(
+                f"SELECT dataset_name FROM datasets_metadata WHERE dataset_name IN ({', '.join('?' for _ in names)})",
+                names,
+            )
+        }
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        records = profiles.to_dict("records")
+        updates = [
+            (row["row_count"], row["file_size_mb"], row["last_updated"], row["dataset_name"])
+            for row in records if row["dataset_name"] in existing
+        ]
+        inserts = [
+            (row["dataset_name"], category, source, row["last_updated"], row["row_count"], row["file_size_mb"], now)
+            for row in records if row["dataset_name"] not in existing
+        ]
+        profile_rows = [
+            (row["dataset_name"], row["path"], row["file_format"], row["size_bytes"], row["row_count"],
+             row["content_hash"], json.dumps(row["column_stats"]), now)
+            for row in records
+        ]
+
+        with self.__db.transaction() as cur:
+            cur.executemany(
+                "UPDATE datasets_metadata SET record_count = ?, file_size_mb = ?, last_updated = ? WHERE dataset_name = ?",
+                updates,
+            )
+            cur.executemany(
+                """
+                INSERT INTO datasets_metadata (dataset_name, category, source, last_updated, record_count, file_size_mb, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                inserts,
+            )
+            cur.executemany(
+                """
+                INSERT OR REPLACE INTO dataset_profiles
+                (dataset_name, path, file_format, size_bytes, row_count, content_hash, column_stats, profiled_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                profile_rows,
+            )
+        return len(updates), len(inserts)
@@ -0,0 +1,170 @@
+import hashlib
+import re
+import zlib
+import numpy as np
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+#universal hashing parameters (same scheme as the datasketch library)
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class DuplicateDetector:
+    """
+    Near-duplicate detection for tickets and incidents using MinHash signatures and LSH banding.
+
+    Every record gets a MinHash signature of its character shingles. The signature is cut into
+    bands and each band is hashed into a bucket stored in lsh_buckets, so records sharing any band
+    are candidates. Only candidates are compared, instead of every stored record.
+    """
+
+    #table and text expression of each domain
+    #(the triggers in DatabaseManager.create_duplicate_index_tables drop a record's signature when this text changes)
+    DOMAINS = {
+        "ticket": ("it_tickets", "COALESCE(subject, '') || ' ' || COALESCE(description, '')"),
+        "incident": ("cyber_incidents", "COALESCE(incident_type, '') || ' ' || COALESCE(description, '')"),
+    }
+
+    def __init__(self, db: DatabaseManager, num_perm: int = 64, bands: int = 16, shingle_size: int = 4, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.__db = db
+        self.__bands = bands
+        self.__rows_per_band = num_perm // bands
+        self.__shingle_size = shingle_size
+        #fixed seed, so signatures stay comparable between runs
+        generator = np.random.RandomState(seed)
+        self.__a = generator.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.__b = generator.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def __check_domain(self, domain: str) -> tuple[str, str]:
+        if domain not in self.DOMAINS:
+            raise ValueError(f"Domain '{domain}' is not valid. Choose from {list(self.DOMAINS)}")
+        return self.DOMAINS[domain]
+
+    #SIGNATURE
+    def signature(self, text: str) -> np.ndarray:
+        """Returns the MinHash signature of a text's character shingles."""
+        normalized = re.sub(r"\s+", " ", (text or "").lower()).strip()
+        size = self.__shingle_size
+        shingles = {normalized[i:i + size] for i in range(max(len(normalized) - size + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        #permute every shingle hash with every (a, b) pair and keep the minimum per permutation
+        permuted = (np.outer(hashes, self.__a) + self.__b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def __band_buckets(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        """Returns (band, bucket) pairs of a signature, buckets being 63-bit hashes of each band."""
+        buckets = []
+        for band in range(self.__bands):
+            chunk = signature[band * self.__rows_per_band:(band + 1) * self.__rows_per_band]
+            digest = hashlib.blake2b(chunk.tobytes(), digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, "big") >> 1))
+        return buckets
+
+    #INDEX RECORDS
+    def index_records(self, domain: str, records) -> int:
+        """Stores signatures and LSH buckets for (record_id, text) pairs in one transaction."""
+        self.__check_domain(domain)
+        signature_rows = []
+        bucket_rows = []
+        for record_id, text in records:
+            signature = self.signature(text)
+            signature_rows.append((domain, record_id, signature.tobytes()))
+            bucket_rows.extend((domain, band, bucket, record_id) for band, bucket in self.__band_buckets(signature))
+
+        with self.__db.transaction() as cur:
+            #re-indexing a record replaces its old buckets
+            cur.executemany(
+                "DELETE FROM lsh_buckets WHERE domain = ? AND record_id = ?",
+                ((domain, record_id) for domain, record_id, _ in signature_rows),
+            )
+            cur.executemany(
+                "INSERT OR REPLACE INTO minhash_signatures (domain, record_id, signature) VALUES (?, ?, ?)",
+                signature_rows,
+            )
+            cur.executemany(
+                "INSERT INTO lsh_buckets (domain, band, bucket, record_id) VALUES (?, ?, ?, ?)",
+                bucket_rows,
+            )
+        return len(signature_rows)
+
+    #INDEX NEW RECORDS
+    def index_new_records(self, domain: str, batch_size: int = 1000) -> int:
+        """
+        Indexes every record without a signature: records added since the last run
+        and records whose text was edited (their signature is dropped by a trigger).
+        """
+        table, text_expression = self.__check_domain(domain)
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT id, {text_expression} FROM {table}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM minhash_signatures s WHERE s.domain = ? AND s.record_id = {table}.id
+            )
+            ORDER BY id
+            """,
+            (domain,),
+        )
+        indexed = 0
+        for start in range(0, len(rows), batch_size):
+            indexed += self.index_records(domain, rows[start:start + batch_size])
+        return indexed
+
+    #REINDEX RECORDS
+    def reindex_records(self, domain: str, record_ids) -> int:
+        """Re-signs the given records from their current text, e.g. after an edit."""
+        table, text_expression = self.__check_domain(domain)
+        ids = [int(record_id) for record_id in record_ids]
+        if not ids:
+            return 0
+        placeholders = ", ".join("?" for _ in ids)
+        rows = self.__db.fetch_all(f"SELECT id, {text_expression} FROM {table} WHERE id IN ({placeholders})", ids)
+        return self.index_records(domain, rows)
+
+    #FIND DUPLICATES
+    def find_duplicates(self, domain: str, text: str, threshold: float = 0.6, top_k: int = 10, exclude_id: int | None = None) -> pd.DataFrame:
+        """
+        Returns stored records whose estimated Jaccard similarity to the text is at least the threshold.
+        Only records sharing an LSH bucket with the text are compared.
+        """
+        table, text_expression = self.__check_domain(domain)
+        signature = self.signature(text)
+        buckets = self.__band_buckets(signature)
+
+        #candidates: records sharing at least one band bucket (deleted records drop out in the join)
+        pairs = ", ".join("(?, ?)" for _ in buckets)
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT s.record_id, s.signature, {text_expression}
+            FROM minhash_signatures s
+            JOIN {table} ON {table}.id = s.record_id
+            WHERE s.domain = ?
+              AND s.record_id IN (
+                  SELECT record_id FROM lsh_buckets
+                  WHERE domain = ? AND (band, bucket) IN (VALUES {pairs})
+              )
+              AND s.record_id IS NOT ?
+            """,
+            (domain, domain, *[value for pair in buckets for value in pair], exclude_id),
+        )
+        if not rows:
+            return pd.DataFrame(columns=["id", "similarity", "text"])
+
+        #estimated Jaccard similarity = share of equal signature positions
+        candidates = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.uint64).reshape(len(rows), -1)
+        similarity = (candidates == signature).mean(axis=1)
+        df = pd.DataFrame({
+            "id": [row[0] for row in rows],
+            "similarity": similarity.round(3),
+            "text": [row[2] for row in rows],
+        })
+        return df[df["similarity"] >= threshold].sort_values(["similarity", "id"], ascending=[False, False]).head(top_k)
+
+    #CHECK AND INDEX A NEW RECORD
+    def check_new_record(self, domain: str, record_id: int, text: str, threshold: float = 0.6, top_k: int = 10) -> pd.DataFrame:
+        """Returns possible duplicates of a newly inserted record, then adds it to the index."""
+        duplicates = self.find_duplicates(domain, text, threshold=threshold, top_k=top_k, exclude_id=record_id)
+        self.index_records(domain, [(record_id, text)])
+        return duplicates
@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+from tempfile import SpooledTemporaryFile
+from services.arrow_io import ArrowIO
+from services.database_manager import DatabaseManager, build_filter_clause
+
+
+class TableExporter:
+    """
+    Streams incidents, tickets or datasets metadata into a gzip-compressed CSV or a Parquet file.
+
+    Rows go from the database cursor straight into the compressed output, batch by batch, so the
+    table is never loaded as a whole. Output is written to a spooled temporary file, which stays in
+    memory while small and moves to disk once it grows past max_memory_bytes. Streamlit's
+    download_button needs the finished file as bytes (export_bytes), so a page download holds the
+    compressed export in memory; only the uncompressed rows stay bounded.
+    """
+
+    FILE_FORMATS = {"csv": ("csv.gz", "application/gzip"), "parquet": ("parquet", "application/vnd.apache.parquet")}
+
+    def __init__(self, db: DatabaseManager, batch_size: int = 10_000, max_memory_bytes: int = 16 * 1024 * 1024):
+        self.__db = db
+        self.__batch_size = batch_size
+        self.__max_memory_bytes = max_memory_bytes
+
+    def __write_csv(self, domain: str, output, columns: list[str] | None, filters: dict | None) -> int:
+        table, schema = ArrowIO.DOMAINS[domain]
+        columns = columns or schema.names
+        for column in columns:
+            if column not in schema.names:
+                raise ValueError(f"Column '{column}' is not valid. Choose from {schema.names}")
+        where, params = build_filter_clause(filters or {}, schema.names)
+
+        exported = 0
+        #closing the gzip stream writes its trailer but leaves the output file open
+        compressed = gzip.GzipFile(fileobj=output, mode="wb", compresslevel=6)
+        with io.TextIOWrapper(compressed, encoding="utf-8", newline="") as text:
+            writer = csv.writer(text)
+            writer.writerow(columns)
+            rows = self.__db.iter_rows(
+                f"SELECT {', '.join(columns)} FROM {table} WHERE {where} ORDER BY id",
+                params,
+                batch_size=self.__batch_size,
+            )
+            for row in rows:
+                writer.writerow(row)
+                exported += 1
+        return exported
+
+    #EXPORT TABLE
+    def export(self, domain: str, file_format: str = "csv", columns: list[str] | None = None, filters: dict | None = None):
+        """
+        Exports a domain's table ("incident", "ticket" or "dataset") with optional column projection and
+        {column: value} filters. Returns (file object positioned at the start, exported row count).
+        """
+        if domain not in ArrowIO.DOMAINS:
+            raise ValueError(f"Domain '{domain}' is not valid. Choose from {list(ArrowIO.DOMAINS)}")
+        if file_format not in self.FILE_FORMATS:
+            raise ValueError(f"File format '{file_format}' is not valid. Choose from {list(self.FILE_FORMATS)}")
+
+        output = SpooledTemporaryFile(max_size=self.__max_memory_bytes, mode="w+b")
+        try:
+            if file_format == "csv":
+                exported = self.__write_csv(domain, output, columns, filters)
+            else:
+                exported = ArrowIO(self.__db, batch_size=self.__batch_size).export(domain, output, "parquet", columns, filters)
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+        return output, exported
+
+    #EXPORT TABLE AS BYTES
+    def export_bytes(self, domain: str, file_format: str = "csv", columns: list[str] | None = None, filters: dict | None = None) -> tuple[bytes, int]:
+        """Same as export, but returns the compressed file content, as st.download_button expects."""
+        output, exported = self.export(domain, file_format, columns, filters)
+        with output:
+            return output.read(), exported
+
+    #FILE NAME AND MIME TYPE
+    def file_info(self, name: str, file_format: str = "csv") -> tuple[str, str]:
+        """Returns the download file name and MIME type of an export."""
+        extension, mime = self.FILE_FORMATS[file_format]
+        return f"{name}.{extension}", mime
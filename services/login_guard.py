@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import bcrypt
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket rate limiter keyed by any string (username, client address...).
+
+    Every key starts with `capacity` tokens and regains `refill_per_second` tokens per second.
+    An attempt takes one token and is refused when none are left. Buckets are only stored
+    while they are below capacity, so idle keys cost no memory.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.__capacity = capacity
+        self.__refill = refill_per_second
+        self.__buckets: dict[str, tuple[float, float]] = {}
+        self.__lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Takes a token for a key, returns False if the key has none left."""
+        now = time.monotonic()
+        with self.__lock:
+            tokens, last = self.__buckets.get(key, (self.__capacity, now))
+            tokens = min(self.__capacity, tokens + (now - last) * self.__refill)
+            if tokens < 1:
+                self.__buckets[key] = (tokens, now)
+                return False
+            self.__buckets[key] = (tokens - 1, now)
+            #forget buckets that have filled up again
+            if len(self.__buckets) > 10_000:
+                self.__buckets = {
+                    k: (t, l) for k, (t, l) in self.__buckets.items()
+                    if t + (now - l) * self.__refill < self.__capacity
+                }
+            return True
+
+
+class PasswordVerifier:
+    """
+    Runs bcrypt checks on a small thread pool instead of the Streamlit script thread.
+
+    bcrypt releases the GIL while hashing, so checks run in parallel with the app. At most
+    max_workers checks run and max_queue wait; further requests are refused straight away
+    instead of piling up. Queue depth and verify latency are tracked for get_metrics().
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, timeout_seconds: float = 10.0):
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.__slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self.__max_workers = max_workers
+        self.__timeout = timeout_seconds
+        self.__lock = threading.Lock()
+        self.__queued = 0
+        self.__running = 0
+        self.__completed = 0
+        self.__refused = 0
+        self.__timed_out = 0
+        self.__latencies_ms: deque[float] = deque(maxlen=500)
+
+    def __check(self, plain_text_password: str, password_hash: str, submitted: float) -> bool:
+        with self.__lock:
+            self.__queued -= 1
+            self.__running += 1
+        try:
+            return bcrypt.checkpw(plain_text_password.encode("utf-8"), password_hash.encode("utf-8"))
+        except ValueError:
+            #malformed stored hash
+            return False
+        finally:
+            with self.__lock:
+                self.__running -= 1
+                self.__completed += 1
+                self.__latencies_ms.append((time.perf_counter() - submitted) * 1000)
+            self.__slots.release()
+
+    #VERIFY PASSWORD
+    def verify(self, plain_text_password: str, password_hash: str) -> bool | None:
+        """Checks a password against a bcrypt hash. Returns None if the pool is full or the check timed out."""
+        if not self.__slots.acquire(blocking=False):
+            with self.__lock:
+                self.__refused += 1
+            return None
+        with self.__lock:
+            self.__queued += 1
+        future = self.__pool.submit(self.__check, plain_text_password, password_hash, time.perf_counter())
+        try:
+            return future.result(timeout=self.__timeout)
+        except TimeoutError:
+            with self.__lock:
+                self.__timed_out += 1
+            #a check that never started gives its slot back here, a running one does when it finishes
+            if future.cancel():
+                with self.__lock:
+                    self.__queued -= 1
+                self.__slots.release()
+            return None
+
+    def __run_job(self, job, args: tuple) -> None:
+        with self.__lock:
+            self.__queued -= 1
+            self.__running += 1
+        try:
+            job(*args)
+        except Exception as e:
+            #nobody waits on background jobs, so failures are only reported here
+            print(f"⚠️ Background bcrypt job failed: {e}")
+        finally:
+            with self.__lock:
+                self.__running -= 1
+                self.__completed += 1
+            self.__slots.release()
+
+    #BACKGROUND JOB
+    def submit(self, job, *args) -> bool:
+        """
+        Runs other bcrypt work (e.g. rehashing a password) on the same bounded pool without waiting for it.
+        Returns False, without running the job, if the pool is full.
+        """
+        if not self.__slots.acquire(blocking=False):
+            with self.__lock:
+                self.__refused += 1
+            return False
+        with self.__lock:
+            self.__queued += 1
+        self.__pool.submit(self.__run_job, job, args)
+        return True
+
+    #GET METRICS
+    def get_metrics(self) -> dict:
+        """Returns queue depth, running checks, counters and verify latency (queue wait included)."""
+        with self.__lock:
+            latencies = sorted(self.__latencies_ms)
+            return {
+                "max_workers": self.__max_workers,
+                "queue_depth": self.__queued,
+                "running": self.__running,
+                "completed": self.__completed,
+                "refused_busy": self.__refused,
+                "timed_out": self.__timed_out,
+                "avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p95_ms": round(latencies[(len(latencies) * 95 + 99) // 100 - 1], 1) if latencies else None,
+                "max_ms": round(latencies[-1], 1) if latencies else None,
+            }
+
+
+class LoginGuard:
+    """Rate limits login attempts per username and per client, then verifies passwords off-thread."""
+
+    def __init__(self, verifier: PasswordVerifier | None = None):
+        #5 attempts per username, then one more every 12 seconds
+        self.__user_limiter = TokenBucketLimiter(capacity=5, refill_per_second=1 / 12)
+        #20 attempts per client, then one more every 3 seconds
+        self.__client_limiter = TokenBucketLimiter(capacity=20, refill_per_second=1 / 3)
+        self.__verifier = verifier or PasswordVerifier()
+        self.__rate_limited = 0
+        self.__lock = threading.Lock()
+
+    #CHECK RATE LIMIT
+    def allow_attempt(self, username: str, client_id: str | None = None) -> bool:
+        """Takes a token from the username and client buckets, before any bcrypt work is done."""
+        allowed = self.__user_limiter.allow(f"user:{username.lower()}")
+        if allowed and client_id:
+            allowed = self.__client_limiter.allow(f"client:{client_id}")
+        if not allowed:
+            with self.__lock:
+                self.__rate_limited += 1
+        return allowed
+
+    def verify(self, plain_text_password: str, password_hash: str) -> bool | None:
+        return self.__verifier.verify(plain_text_password, password_hash)
+
+    def submit(self, job, *args) -> bool:
+        return self.__verifier.submit(job, *args)
+
+    def get_metrics(self) -> dict:
+        metrics = self.__verifier.get_metrics()
+        metrics["rate_limited"] = self.__rate_limited
+        return metrics
+
+
+#one guard per process, shared by every session
+_LOGIN_GUARD = LoginGuard()
+
+
+def get_login_guard() -> LoginGuard:
+    """Returns the process-wide login guard."""
+    return _LOGIN_GUARD
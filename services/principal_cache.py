@@ -0,0 +1,69 @@
+import threading
+import time
+from models.records import Principal
+from services.database_manager import DatabaseManager
+
+
+class PrincipalCache:
+    """
+    Caches user identities (username, password hash, role) for a short time.
+
+    Every page run resolves the logged-in user and role; with the cache that costs at most one
+    query per user per TTL instead of one per call. Unknown usernames are not cached, so a user
+    shows up as soon as they register. Writers (insert_user, change_password) invalidate the username,
+    so changes show up at once; a row read while an invalidation happened is returned but not stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 10_000):
+        self.__ttl = ttl_seconds
+        self.__max_entries = max_entries
+        self.__entries: dict[str, tuple[float, Principal]] = {}
+        #bumped by every invalidation, so a fetch that raced with one is not stored
+        self.__epoch = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    #GET PRINCIPAL
+    def get(self, db: DatabaseManager, username: str) -> Principal | None:
+        """Returns the cached principal of a username, loading it with one query when missing or expired."""
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(username)
+            if entry is not None and entry[0] > now:
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+            epoch = self.__epoch
+
+        row = db.fetch_one("SELECT username, password_hash, role FROM users WHERE username = ?", (username,))
+        principal = Principal(*row) if row else None
+        with self.__lock:
+            #the row may predate a write that invalidated it during the query
+            if principal is None or self.__epoch != epoch:
+                return principal
+            #dicts keep insertion order, so the first entry is the oldest
+            if len(self.__entries) >= self.__max_entries:
+                self.__entries.pop(next(iter(self.__entries)))
+            self.__entries[username] = (now + self.__ttl, principal)
+        return principal
+
+    #INVALIDATE
+    def invalidate(self, username: str) -> None:
+        """Drops a username after its row was inserted or changed."""
+        with self.__lock:
+            self.__entries.pop(username, None)
+            self.__epoch += 1
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            return {"entries": len(self.__entries), "hits": self.__hits, "misses": self.__misses}
+
+
+#one cache per process, shared by every session
+_PRINCIPAL_CACHE = PrincipalCache()
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Returns the process-wide principal cache."""
+    return _PRINCIPAL_CACHE
@@ -0,0 +1,126 @@
+import hashlib
+import secrets
+import threading
+import time
+from services.database_manager import DatabaseManager
+
+#shared by every session of the process: token hash -> [username, role, expires_at, stored expires_at]
+_INDEX: dict[str, list] = {}
+_LOCK = threading.Lock()
+_LAST_SWEEP = [0.0]
+
+
+class SessionStore:
+    """
+    Login sessions kept in the sessions table and mirrored in an in-memory index.
+
+    Tokens are random and only their SHA-256 hash is stored, so a leaked table cannot be replayed.
+    Validation is one hash and one dictionary lookup; the database is only read for tokens
+    created by another process (or before a restart). Expiry slides on every validation, but the new
+    expiry is only written back once it moved by more than touch_seconds. Expired sessions are
+    removed in one batch every sweep_seconds.
+    """
+
+    def __init__(self, db: DatabaseManager, ttl_seconds: int = 30 * 60, touch_seconds: int = 60, sweep_seconds: int = 5 * 60):
+        self.__db = db
+        self.__ttl = ttl_seconds
+        self.__touch = touch_seconds
+        self.__sweep_interval = sweep_seconds
+
+    @staticmethod
+    def __hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    #CREATE SESSION
+    def create(self, username: str, role: str | None) -> str:
+        """Stores a new session and returns its token (the only time the plain token exists)."""
+        token = secrets.token_urlsafe(32)
+        token_hash = self.__hash(token)
+        now = time.time()
+        expires_at = now + self.__ttl
+        self.__db.execute_query(
+            "INSERT INTO sessions (token_hash, username, role, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (token_hash, username, role, now, expires_at),
+        )
+        with _LOCK:
+            _INDEX[token_hash] = [username, role, expires_at, expires_at]
+        return token
+
+    #VALIDATE SESSION
+    def validate(self, token: str | None) -> tuple[str, str | None] | None:
+        """Returns (username, role) of a valid session and extends its expiry, or None."""
+        if not token:
+            return None
+        now = time.time()
+        if now - _LAST_SWEEP[0] > self.__sweep_interval:
+            self.sweep()
+
+        #the lookup key is a hash of the token, so lookup time says nothing about the token itself
+        token_hash = self.__hash(token)
+        with _LOCK:
+            entry = _INDEX.get(token_hash)
+        if entry is None:
+            row = self.__db.fetch_one(
+                "SELECT username, role, expires_at FROM sessions WHERE token_hash = ?", (token_hash,)
+            )
+            if row is None:
+                return None
+            entry = [row[0], row[1], row[2], row[2]]
+            with _LOCK:
+                _INDEX[token_hash] = entry
+
+        username, role, expires_at, stored_expires_at = entry
+        if expires_at < now:
+            self.revoke(token)
+            return None
+
+        #sliding expiry, written back at most once per touch interval
+        entry[2] = now + self.__ttl
+        if entry[2] - stored_expires_at > self.__touch:
+            entry[3] = entry[2]
+            self.__db.execute_query(
+                "UPDATE sessions SET expires_at = ? WHERE token_hash = ?", (entry[2], token_hash)
+            )
+        return username, role
+
+    #REVOKE SESSION
+    def revoke(self, token: str | None) -> None:
+        """Ends one session (logout)."""
+        if not token:
+            return
+        token_hash = self.__hash(token)
+        with _LOCK:
+            _INDEX.pop(token_hash, None)
+        self.__db.execute_query("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+
+    #REVOKE USER SESSIONS
+    def revoke_user(self, username: str, keep_token: str | None = None) -> int:
+        """
+        Ends every session of a user, e.g. after a password change. The session of keep_token
+        (the one making the change) stays open. Returns the number ended.
+        """
+        keep_hash = self.__hash(keep_token) if keep_token else ""
+        with _LOCK:
+            for token_hash in [key for key, entry in _INDEX.items() if entry[0] == username and key != keep_hash]:
+                del _INDEX[token_hash]
+        return self.__db.execute_query(
+            "DELETE FROM sessions WHERE username = ? AND token_hash != ?", (username, keep_hash)
+        ).rowcount
+
+    #SWEEP EXPIRED SESSIONS
+    def sweep(self) -> int:
+        """Removes every expired session from memory and from the table in one batch."""
+        now = time.time()
+        with _LOCK:
+            _LAST_SWEEP[0] = now
+            expired = [key for key, entry in _INDEX.items() if entry[2] < now]
+            for token_hash in expired:
+                del _INDEX[token_hash]
+            #persist slid expiries first, so live sessions are not swept from the table
+            touched = [(entry[2], key) for key, entry in _INDEX.items() if entry[2] != entry[3]]
+            for key, entry in _INDEX.items():
+                entry[3] = entry[2]
+        with self.__db.transaction() as cur:
+            cur.executemany("UPDATE sessions SET expires_at = ? WHERE token_hash = ?", touched)
+            cur.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+            return cur.rowcount
@@ -0,0 +1,191 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from services.database_manager import DatabaseManager
+
+#words too common to say anything about similarity
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it",
+    "of", "on", "or", "that", "the", "to", "was", "were", "with",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Splits text into lowercase word tokens without stop words."""
+    return [word for word in re.findall(r"[a-z0-9]+", (text or "").lower()) if len(word) > 1 and word not in STOP_WORDS]
+
+
+class TfidfIndex:
+    """
+    In-memory TF-IDF index with cosine similarity, kept in sync with a database table incrementally.
+
+    Documents are stored as a sparse term-document matrix in two directions:
+    postings (term -> {doc id: term count}) to score a query, and doc terms (doc id -> {term: count}).
+    Document frequencies are the posting sizes, so adding or removing a document only touches its own
+    terms. IDF weights are computed per query term and document norms lazily for the scored
+    documents only, cached until the corpus changes.
+    """
+
+    def __init__(self, domain: str, table: str, text_expression: str):
+        self.__domain = domain
+        self.__table = table
+        self.__text_expression = text_expression
+        self.__postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self.__doc_terms: dict[int, dict[str, int]] = {}
+        #doc id -> (corpus version, norm)
+        self.__norms: dict[int, tuple[int, float]] = {}
+        self.__version = 0
+        self.__last_id = 0
+        #last similarity_changes row applied (None until the first refresh)
+        self.__last_change: int | None = None
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__doc_terms)
+
+    def __remove(self, doc_id: int) -> bool:
+        """Removes a document's terms from the postings (lock held)."""
+        counts = self.__doc_terms.pop(doc_id, None)
+        if counts is None:
+            return False
+        for term in counts:
+            docs = self.__postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.__postings[term]
+        self.__norms.pop(doc_id, None)
+        return True
+
+    #ADD DOCUMENTS
+    def add_documents(self, documents) -> int:
+        """Adds (doc id, text) pairs to the index, replacing older versions of the same documents."""
+        added = 0
+        with self.__lock:
+            for doc_id, text in documents:
+                counts = Counter(tokenize(text))
+                self.__remove(doc_id)
+                self.__doc_terms[doc_id] = dict(counts)
+                for term, count in counts.items():
+                    self.__postings[term][doc_id] = count
+                self.__last_id = max(self.__last_id, doc_id)
+                added += 1
+            if added:
+                self.__version += 1
+        return added
+
+    #REMOVE DOCUMENTS
+    def remove_documents(self, doc_ids) -> int:
+        """Removes documents from the index (e.g. deleted rows)."""
+        with self.__lock:
+            removed = sum(self.__remove(doc_id) for doc_id in doc_ids)
+            if removed:
+                self.__version += 1
+        return removed
+
+    #REFRESH FROM DATABASE
+    def refresh(self, db: DatabaseManager) -> int:
+        """
+        Applies rows inserted since the last refresh (ids above the highest indexed id) and rows edited
+        or deleted since then (logged in similarity_changes by triggers). Returns the number of changed documents.
+        """
+        #read the change position first, so changes made during the refresh are picked up next time
+        last_change = db.fetch_one("SELECT COALESCE(MAX(seq), 0) FROM similarity_changes")[0]
+        changed_ids = []
+        if self.__last_change is not None and last_change > self.__last_change:
+            changed_ids = [row[0] for row in db.fetch_all(
+                "SELECT DISTINCT record_id FROM similarity_changes WHERE domain = ? AND seq > ? AND seq <= ?",
+                (self.__domain, self.__last_change, last_change),
+            )]
+        rows = db.fetch_all(
+            f"SELECT id, {self.__text_expression} FROM {self.__table} WHERE id > ? ORDER BY id",
+            (self.__last_id,),
+        )
+        if changed_ids:
+            placeholders = ", ".join("?" for _ in changed_ids)
+            edited = db.fetch_all(
+                f"SELECT id, {self.__text_expression} FROM {self.__table} WHERE id IN ({placeholders})",
+                changed_ids,
+            )
+            #changed ids that are gone were deleted
+            deleted = set(changed_ids) - {row[0] for row in edited}
+            rows = edited + rows
+        else:
+            deleted = set()
+        changed = self.remove_documents(deleted) + self.add_documents(rows)
+        with self.__lock:
+            self.__last_change = max(self.__last_change or 0, last_change)
+        return changed
+
+    def __idf(self, term: str) -> float:
+        return math.log((1 + len(self.__doc_terms)) / (1 + len(self.__postings[term]))) + 1
+
+    def __norm(self, doc_id: int) -> float:
+        """Returns a document's vector norm, computed again only if the corpus changed since (lock held)."""
+        cached = self.__norms.get(doc_id)
+        if cached is not None and cached[0] == self.__version:
+            return cached[1]
+        norm = math.sqrt(sum(
+            ((1 + math.log(count)) * self.__idf(term)) ** 2 for term, count in self.__doc_terms[doc_id].items()
+        )) or 1.0
+        self.__norms[doc_id] = (self.__version, norm)
+        return norm
+
+    def __search(self, counts: dict[str, int], top_k: int, exclude_id: int | None) -> list[tuple[int, float]]:
+        """Scores the documents sharing a term with the query (lock held)."""
+        #sublinear tf * idf weights, unknown terms are dropped
+        query = {term: (1 + math.log(count)) * self.__idf(term) for term, count in counts.items() if term in self.__postings}
+        query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        if not query_norm:
+            return []
+        #accumulate dot products over the postings of the query terms only
+        scores: dict[int, float] = defaultdict(float)
+        for term, query_weight in query.items():
+            idf = self.__idf(term)
+            for doc_id, count in self.__postings[term].items():
+                scores[doc_id] += query_weight * (1 + math.log(count)) * idf
+        scores.pop(exclude_id, None)
+        ranked = heapq.nlargest(top_k, ((doc_id, score / self.__norm(doc_id)) for doc_id, score in scores.items()),
+                                key=lambda item: item[1])
+        return [(doc_id, round(score / query_norm, 4)) for doc_id, score in ranked]
+
+    #QUERY BY TEXT
+    def query(self, text: str, top_k: int = 5, exclude_id: int | None = None) -> list[tuple[int, float]]:
+        """Returns the top K (doc id, cosine score) pairs most similar to a text."""
+        counts = Counter(tokenize(text))
+        with self.__lock:
+            return self.__search(counts, top_k, exclude_id)
+
+    #QUERY BY DOCUMENT
+    def similar_to(self, doc_id: int, top_k: int = 5) -> list[tuple[int, float]]:
+        """Returns the top K (doc id, cosine score) pairs most similar to an indexed document."""
+        with self.__lock:
+            counts = self.__doc_terms.get(doc_id)
+            if counts is None:
+                return []
+            return self.__search(counts, top_k, doc_id)
+
+
+#table and text expression of each domain
+DOMAINS = {
+    "incident": ("cyber_incidents", "COALESCE(incident_type, '') || ' ' || COALESCE(description, '')"),
+    "ticket": ("it_tickets", "COALESCE(category, '') || ' ' || COALESCE(subject, '') || ' ' || COALESCE(description, '')"),
+}
+
+#one shared index per database file and domain, so every session reuses the same in-memory index
+_INDEXES: dict[tuple[str, str], TfidfIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_similarity_index(domain: str, db: DatabaseManager) -> TfidfIndex:
+    """Returns the shared index of a domain ("incident" or "ticket"), refreshed with new, edited and deleted rows."""
+    if domain not in DOMAINS:
+        raise ValueError(f"Domain '{domain}' is not valid. Choose from {list(DOMAINS)}")
+    with _INDEXES_LOCK:
+        key = (db.get_db_path(), domain)
+        if key not in _INDEXES:
+            _INDEXES[key] = TfidfIndex(domain, *DOMAINS[domain])
+        index = _INDEXES[key]
+    index.refresh(db)
+    return index
@@ -0,0 +1,184 @@
+import heapq
+from collections import defaultdict
+from typing import Iterable
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+
+class TicketAssigner:
+    """
+    Workload-aware ticket assignment.
+
+    Keeps the open-ticket load of every assignee and their category affinity
+    (share of their past tickets in each category) in min-heaps, so each ticket
+    is assigned in O(log n). Heap entries are invalidated lazily: an entry is only
+    used if the load it was pushed with is still the assignee's current load.
+    """
+
+    def __init__(self, db: DatabaseManager, assignees: Iterable[str] = (), affinity_weight: float = 0.5):
+        self.__db = db
+        #0 = ignore affinity, 1 = a fully specialised assignee looks almost free for their category
+        self.__affinity_weight = affinity_weight
+        self.__load: dict[str, int] = {}
+        self.__affinity: dict[str, dict[str, float]] = defaultdict(dict)
+        self.__global_heap: list[tuple[float, str, int]] = []
+        self.__category_heaps: dict[str, list[tuple[float, str, int]]] = defaultdict(list)
+        self.load_state(assignees)
+
+    #LOADING WORKLOAD
+    def load_state(self, assignees: Iterable[str] = ()) -> None:
+        """Reads the current open load and category affinity of every assignee from the database."""
+        self.__load = {name: 0 for name in assignees}
+        self.__affinity = defaultdict(dict)
+
+        #open tickets per assignee
+        rows = self.__db.fetch_all(
+            """
+            SELECT assigned_to, COUNT(*)
+            FROM it_tickets
+            WHERE assigned_to IS NOT NULL AND assigned_to != ''
+              AND COALESCE(status, '') NOT IN ('Resolved', 'Closed')
+            GROUP BY assigned_to
+            """
+        )
+        for name, count in rows:
+            self.__load[name] = count
+
+        #share of each assignee's tickets per category
+        rows = self.__db.fetch_all(
+            """
+            SELECT assigned_to, category,
+                   COUNT(*) * 1.0 / SUM(COUNT(*)) OVER (PARTITION BY assigned_to) AS share
+            FROM it_tickets
+            WHERE assigned_to IS NOT NULL AND assigned_to != '' AND category IS NOT NULL
+            GROUP BY assigned_to, category
+            """
+        )
+        for name, category, share in rows:
+            self.__load.setdefault(name, 0)
+            self.__affinity[category][name] = share
+
+        #build the heaps
+        self.__global_heap = [(load + 1, name, load) for name, load in self.__load.items()]
+        heapq.heapify(self.__global_heap)
+        self.__category_heaps = defaultdict(list)
+        for category, members in self.__affinity.items():
+            heap = [(self.__cost(name, category), name, self.__load[name]) for name in members]
+            heapq.heapify(heap)
+            self.__category_heaps[category] = heap
+
+    def __cost(self, name: str, category: str | None) -> float:
+        """Returns how expensive it is to give one more ticket of a category to an assignee."""
+        affinity = self.__affinity.get(category, {}).get(name, 0.0)
+        return (self.__load[name] + 1) * (1 - self.__affinity_weight * affinity)
+
+    def __peek(self, heap: list[tuple[float, str, int]]) -> tuple[float, str] | None:
+        """Returns the cheapest valid entry of a heap, dropping stale entries on the way."""
+        while heap:
+            cost, name, load = heap[0]
+            if self.__load.get(name) == load:
+                return cost, name
+            heapq.heappop(heap)
+        return None
+
+    def __set_load(self, name: str, load: int) -> None:
+        """Changes an assignee's load and pushes fresh heap entries for it."""
+        self.__load[name] = load
+        heapq.heappush(self.__global_heap, (load + 1, name, load))
+        for category, members in self.__affinity.items():
+            if name in members:
+                heapq.heappush(self.__category_heaps[category], (self.__cost(name, category), name, load))
+
+    #PICK ASSIGNEE
+    def pick_assignee(self, category: str | None) -> str | None:
+        """Returns the best assignee for one ticket of a category and counts the ticket against their load."""
+        candidates = [entry for entry in (
+            self.__peek(self.__category_heaps[category]) if category in self.__category_heaps else None,
+            self.__peek(self.__global_heap),
+        ) if entry is not None]
+        if not candidates:
+            return None
+        _, name = min(candidates)
+        self.__set_load(name, self.__load[name] + 1)
+        return name
+
+    #RELEASE TICKET
+    def release(self, name: str) -> None:
+        """Removes one open ticket from an assignee's load (e.g. before reassigning it)."""
+        if self.__load.get(name, 0) > 0:
+            self.__set_load(name, self.__load[name] - 1)
+
+    #GET WORKLOAD
+    def get_workload(self) -> pd.DataFrame:
+        """Returns the open load and strongest category of every assignee."""
+        rows = []
+        for name, load in self.__load.items():
+            shares = {category: members[name] for category, members in self.__affinity.items() if name in members}
+            top_category = max(shares, key=shares.get) if shares else None
+            rows.append((name, load, top_category))
+        return pd.DataFrame(rows, columns=["assigned_to", "open_tickets", "top_category"]).sort_values("open_tickets")
+
+    #ASSIGN UNASSIGNED TICKETS
+    def assign_unassigned(self, limit: int | None = None) -> pd.DataFrame:
+        """Assigns open tickets without an assignee, oldest first, and saves them in one transaction."""
+        rows = self.__db.fetch_all(
+            """
+            SELECT id, ticket_id, category, NULL
+            FROM it_tickets
+            WHERE (assigned_to IS NULL OR assigned_to = '')
+              AND COALESCE(status, '') NOT IN ('Resolved', 'Closed')
+            ORDER BY created_date, id
+            LIMIT COALESCE(?, -1)
+            """,
+            (limit,),
+        )
+        return self.__assign_rows(rows)
+
+    #REASSIGN TICKETS
+    def assign_tickets(self, ticket_ids: Iterable[int]) -> pd.DataFrame:
+        """(Re)assigns the given tickets (by id) and saves them in one transaction."""
+        ids = [int(ticket_id) for ticket_id in ticket_ids]
+        if not ids:
+            return pd.DataFrame(columns=["id", "ticket_id", "category", "assigned_to"])
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT id, ticket_id, category, assigned_to
+            FROM it_tickets
+            WHERE id IN ({', '.join('?' for _ in ids)})
+              AND COALESCE(status, '') NOT IN ('Resolved', 'Closed')
+            ORDER BY created_date, id
+            """,
+            ids,
+        )
+        return self.__assign_rows(rows)
+
+    def __assign_rows(self, rows) -> pd.DataFrame:
+        """Picks an assignee for each (id, ticket_id, category, previous) row and persists the result."""
+        assignments = []
+        for row_id, ticket_id, category, previous in rows:
+            name = self.pick_assignee(category)
+            if name is None:
+                break
+            assignments.append((row_id, ticket_id, category, name, previous))
+
+        saved = []
+        with self.__db.transaction() as cur:
+            for row_id, ticket_id, category, name, previous in assignments:
+                #skip tickets someone (re)assigned by hand, closed or deleted in the meantime
+                cur.execute(
+                    """
+                    UPDATE it_tickets SET assigned_to = ?
+                    WHERE id = ? AND COALESCE(status, '') NOT IN ('Resolved', 'Closed')
+                      AND COALESCE(assigned_to, '') = COALESCE(?, '')
+                    """,
+                    (name, row_id, previous),
+                )
+                if cur.rowcount:
+                    saved.append((row_id, ticket_id, category, name))
+                    #the ticket leaves its old assignee's queue only once it has really moved
+                    if previous:
+                        self.release(previous)
+                else:
+                    #the ticket was not changed, so it does not count against the picked assignee
+                    self.release(name)
+        return pd.DataFrame(saved, columns=["id", "ticket_id", "category", "assigned_to"])
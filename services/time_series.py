@@ -0,0 +1,39 @@
+import pandas as pd
+
+#pandas frequency of each supported bucket size (weeks start on Monday)
+GRANULARITY_FREQUENCIES = {
+    "day": "D",
+    "week": "W-MON",
+    "month": "MS",
+}
+
+
+def bucket_expression(granularity: str, column: str = "day") -> str:
+    """Returns the SQLite expression that maps a YYYY-MM-DD column to the start of its bucket."""
+    if granularity == "day":
+        return column
+    if granularity == "week":
+        return f"date({column}, '-' || ((strftime('%w', {column}) + 6) % 7) || ' days')"
+    if granularity == "month":
+        return f"strftime('%Y-%m-01', {column})"
+    raise ValueError(f"Granularity '{granularity}' is not valid. Choose from {list(GRANULARITY_FREQUENCIES)}")
+
+
+def fill_periods(df: pd.DataFrame, granularity: str, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Reindexes a period-indexed series so every bucket between start and end is present (missing ones as 0).
+    """
+    if df.empty:
+        return df
+    index = pd.to_datetime(df.index)
+    first = pd.Timestamp(start) if start else index.min()
+    last = pd.Timestamp(end) if end else index.max()
+    #align the first bucket the same way SQL does
+    if granularity == "week":
+        first = first - pd.Timedelta(days=first.weekday())
+    elif granularity == "month":
+        first = first.replace(day=1)
+    periods = pd.date_range(first, last, freq=GRANULARITY_FREQUENCIES[granularity])
+    filled = df.set_axis(index).reindex(periods, fill_value=0)
+    filled.index.name = "period"
+    return filled
@@ -0,0 +1,108 @@
+from typing import Iterable
+import pandas as pd
+from services.database_manager import DatabaseManager
+
+
+class TriageQueue:
+    """
+    Priority triage queue over open IT tickets, shared by several agents.
+
+    The queue lives in the ticket_triage_queue table (maintained by triggers), ordered by
+    priority, SLA deadline and age. Claims are single UPDATE statements, so two agents
+    can never claim the same ticket.
+    """
+
+    #order of the queue, matches the idx_triage_queue_next index
+    QUEUE_ORDER = "priority_rank, sla_deadline, created_date, ticket_row_id"
+    COLUMNS = ["id", "ticket_id", "priority", "category", "subject", "created_date", "sla_deadline", "claimed_by", "claimed_at"]
+
+    def __init__(self, db: DatabaseManager):
+        self.__db = db
+
+    def __with_ticket_details(self, where: str, params: Iterable = (), limit: int | None = None) -> pd.DataFrame:
+        """Returns queue rows matching a condition, joined with their ticket details, in queue order."""
+        rows = self.__db.fetch_all(
+            f"""
+            SELECT t.id, t.ticket_id, t.priority, t.category, t.subject, q.created_date, q.sla_deadline, q.claimed_by, q.claimed_at
+            FROM (
+                SELECT * FROM ticket_triage_queue
+                WHERE {where}
+                ORDER BY {self.QUEUE_ORDER}
+                LIMIT COALESCE(?, -1)
+            ) q
+            JOIN it_tickets t ON t.id = q.ticket_row_id
+            ORDER BY q.priority_rank, q.sla_deadline, q.created_date, q.ticket_row_id
+            """,
+            (*params, limit),
+        )
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+    #PEEK NEXT TICKETS
+    def peek(self, n: int = 10) -> pd.DataFrame:
+        """Returns the next N unclaimed tickets without claiming them."""
+        return self.__with_ticket_details("claimed_by IS NULL", limit=n)
+
+    #CLAIM NEXT TICKETS
+    def claim(self, agent: str, n: int = 1) -> pd.DataFrame:
+        """Atomically claims the next N unclaimed tickets for an agent and returns them."""
+        rows = self.__db.execute_returning(
+            f"""
+            UPDATE ticket_triage_queue
+            SET claimed_by = ?, claimed_at = datetime('now')
+            WHERE ticket_row_id IN (
+                SELECT ticket_row_id FROM ticket_triage_queue
+                WHERE claimed_by IS NULL
+                ORDER BY {self.QUEUE_ORDER}
+                LIMIT ?
+            )
+            AND claimed_by IS NULL
+            RETURNING ticket_row_id
+            """,
+            (agent, n),
+        )
+        claimed_ids = [row[0] for row in rows]
+        if not claimed_ids:
+            return pd.DataFrame(columns=self.COLUMNS)
+        return self.__with_ticket_details(
+            f"ticket_row_id IN ({', '.join('?' for _ in claimed_ids)})", claimed_ids
+        )
+
+    #RELEASE TICKETS
+    def release(self, agent: str, ticket_ids: Iterable[int] | None = None) -> int:
+        """Puts an agent's claimed tickets (all of them, or the given ids) back into the queue."""
+        if ticket_ids is None:
+            result = self.__db.execute_query(
+                "UPDATE ticket_triage_queue SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by = ?",
+                (agent,),
+            )
+        else:
+            result = self.__db.execute_many(
+                """
+                UPDATE ticket_triage_queue SET claimed_by = NULL, claimed_at = NULL
+                WHERE ticket_row_id = ? AND claimed_by = ?
+                """,
+                ((int(ticket_id), agent) for ticket_id in ticket_ids),
+            )
+        return result.rowcount
+
+    #RELEASE EXPIRED CLAIMS
+    def release_expired(self, max_age_minutes: int = 60) -> int:
+        """Puts tickets claimed longer than max_age_minutes ago back into the queue."""
+        result = self.__db.execute_query(
+            """
+            UPDATE ticket_triage_queue SET claimed_by = NULL, claimed_at = NULL
+            WHERE claimed_by IS NOT NULL AND claimed_at < datetime('now', ?)
+            """,
+            (f"-{int(max_age_minutes)} minutes",),
+        )
+        return result.rowcount
+
+    #GET AGENT CLAIMS
+    def get_claims(self, agent: str) -> pd.DataFrame:
+        """Returns the tickets currently claimed by an agent."""
+        return self.__with_ticket_details("claimed_by = ?", (agent,))
+
+    #QUEUE SIZE
+    def size(self) -> int:
+        """Returns how many tickets are waiting to be claimed."""
+        return self.__db.fetch_one("SELECT COUNT(*) FROM ticket_triage_queue WHERE claimed_by IS NULL")[0]
@@ -0,0 +1,173 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+import bcrypt
+import pandas as pd
+from services.auth_manager import AuthManager
+from services.bcrypt_cost import BcryptCost, get_hash_cost
+from services.database_manager import DatabaseManager
+from services.principal_cache import get_principal_cache
+
+USERS_FILE = Path(__file__).resolve().parent.parent / "database" / "users.txt"
+
+
+class UserImportReport(NamedTuple):
+    rows_read: int
+    inserted: int
+    rejected: pd.DataFrame
+    hash_seconds: float
+    total_seconds: float
+
+
+def _hash_batch(passwords: list[str], cost: int) -> list[str]:
+    """Worker: bcrypt-hashes a batch of plain text passwords."""
+    return [bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=cost)).decode("utf-8") for password in passwords]
+
+
+class UserImporter:
+    """
+    Creates many users at once, from pre-hashed lines (username,hash,role as in database/users.txt)
+    or from a plain text CSV with username, password and role columns.
+
+    Usernames are capitalized like on the Register tab and checked with the AuthManager rules.
+    Plain text passwords are hashed in parallel worker processes (bcrypt is CPU bound), then every
+    accepted user is inserted in a single transaction.
+    """
+
+    def __init__(self, db: DatabaseManager, workers: int | None = None):
+        self.__db = db
+        self.__auth = AuthManager(db)
+        self.__workers = workers or os.cpu_count() or 1
+
+    #READ FILES
+    @staticmethod
+    def read_hashed(source) -> pd.DataFrame:
+        """Reads username,hash,role lines without a header (path or file-like)."""
+        df = pd.read_csv(source, header=None, names=["username", "password_hash", "role"],
+                         dtype=str, keep_default_na=False)
+        #bcrypt hashes never contain spaces, so every column can be trimmed
+        return df.apply(lambda column: column.str.strip())
+
+    @staticmethod
+    def read_plaintext(source) -> pd.DataFrame:
+        """
+        Reads a CSV with a header row containing username, password and (optionally) role.
+        Passwords are kept exactly as written, spaces included; they must be quoted if they contain commas.
+        """
+        df = pd.read_csv(source, dtype=str, keep_default_na=False)
+        df.columns = df.columns.str.strip()
+        missing = {"username", "password"} - set(df.columns)
+        if missing:
+            raise ValueError(f"Columns {sorted(missing)} are missing. Choose from ['username', 'password', 'role']")
+        if "role" not in df.columns:
+            df["role"] = "user"
+        return df[["username", "password", "role"]]
+
+    #VALIDATE USERS
+    def __validate(self, df: pd.DataFrame, secret_column: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Splits rows into accepted and rejected (with the reason), checking usernames and passwords/hashes."""
+        #roles are matched case-insensitively and stored in the Register tab's spelling
+        roles = {role.lower(): role for role in AuthManager.ROLES}
+        df = df.assign(
+            row=range(1, len(df) + 1),
+            username=df["username"].str.strip().str.capitalize(),
+            role=df["role"].str.strip().str.lower().replace("", "user").map(roles),
+        )
+        existing = {row[0] for row in self.__db.fetch_all("SELECT username FROM users")}
+        seen = set()
+        reasons = []
+        for username, secret, role in zip(df["username"], df[secret_column], df["role"]):
+            if not self.__auth.validate_username(username):
+                reason = "invalid username"
+            elif username in existing:
+                reason = "username already exists"
+            elif username in seen:
+                reason = "duplicate username in file"
+            elif pd.isna(role):
+                reason = "invalid role"
+            elif secret_column == "password_hash" and get_hash_cost(secret) is None:
+                reason = "not a bcrypt hash"
+            elif secret_column == "password" and not self.__auth.validate_password(secret):
+                reason = "password does not meet the rules"
+            elif secret_column == "password" and self.__auth.is_breached_password(secret):
+                reason = "breached password"
+            else:
+                reason = None
+                seen.add(username)
+            reasons.append(reason)
+        df["reason"] = reasons
+        accepted = df[df["reason"].isna()]
+        rejected = df[df["reason"].notna()][["row", "username", "reason"]].reset_index(drop=True)
+        return accepted, rejected
+
+    def __insert(self, users: list[tuple[str, str, str]]) -> int:
+        with self.__db.transaction() as cur:
+            cur.executemany("INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)", users)
+            inserted = cur.rowcount
+        cache = get_principal_cache()
+        for username, _, _ in users:
+            cache.invalidate(username)
+        return inserted
+
+    #IMPORT PRE-HASHED USERS
+    def import_hashed(self, source=USERS_FILE) -> UserImportReport:
+        """Imports username,hash,role lines; the hashes are stored as they are."""
+        started = time.perf_counter()
+        df = self.read_hashed(source)
+        accepted, rejected = self.__validate(df, "password_hash")
+        inserted = self.__insert(list(zip(accepted["username"], accepted["password_hash"], accepted["role"])))
+        return UserImportReport(len(df), inserted, rejected, 0.0, time.perf_counter() - started)
+
+    #IMPORT PLAIN TEXT USERS
+    def import_plaintext(self, source) -> UserImportReport:
+        """Imports a username,password,role CSV, hashing the passwords across worker processes."""
+        started = time.perf_counter()
+        df = self.read_plaintext(source)
+        accepted, rejected = self.__validate(df, "password")
+
+        passwords = accepted["password"].tolist()
+        cost = BcryptCost(self.__db).get_cost()
+        hash_started = time.perf_counter()
+        hashes = []
+        if passwords:
+            workers = min(self.__workers, len(passwords))
+            #a few batches per worker keeps them busy without pickling every password separately
+            size = max(1, -(-len(passwords) // (workers * 4)))
+            batches = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for batch_hashes in pool.map(_hash_batch, batches, [cost] * len(batches)):
+                    hashes.extend(batch_hashes)
+        hash_seconds = time.perf_counter() - hash_started
+
+        inserted = self.__insert(list(zip(accepted["username"], hashes, accepted["role"])))
+        return UserImportReport(len(df), inserted, rejected, hash_seconds, time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Create users in bulk from pre-hashed lines or a plain text CSV.")
+    parser.add_argument("--hashed", nargs="*", help="username,hash,role files (default: database/users.txt)")
+    parser.add_argument("--csv", nargs="*", default=[], help="CSV files with username,password,role columns")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    hashed = args.hashed if args.hashed is not None else ([] if args.csv else [USERS_FILE])
+
+    db = DatabaseManager()
+    db.create_all_tables()
+    importer = UserImporter(db, workers=args.workers)
+    reports = [(path, importer.import_hashed(path)) for path in hashed]
+    reports += [(path, importer.import_plaintext(path)) for path in args.csv]
+    db.close()
+
+    for path, report in reports:
+        rate = report.rows_read / max(report.total_seconds, 1e-9)
+        print(f"✅ {path}: {report.rows_read} rows read, {report.inserted} inserted, {len(report.rejected)} rejected "
+              f"in {report.total_seconds:.2f}s ({rate:,.0f} users/s, hashing {report.hash_seconds:.2f}s)")
+        if not report.rejected.empty:
+            print(report.rejected.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager pointed at a fresh SQLite file with every table created."""
+    manager = DatabaseManager()
+    manager._DatabaseManager__db_path = tmp_path / "test.db"
+    manager.create_all_tables()
+    yield manager
+    manager.close()
@@ -0,0 +1,60 @@
+import random
+from datetime import date, timedelta
+import pytest
+from models.security_incident import SecurityIncident
+from services.anomaly_detector import IncidentRateDetector
+
+START = date(2024, 1, 1)
+SERIES = [("Phishing", "High"), ("Malware", "Low"), ("DDoS", "Critical")]
+
+
+def state(db):
+    rows = db.fetch_all("SELECT incident_type, severity, day, day_count, ewma_mean, ewma_var, days_seen FROM incident_rate_state")
+    return {(row[0], row[1]): row[2:] for row in rows}
+
+
+@pytest.fixture
+def streamed(db):
+    """Inserts 45 days of incidents through the model, so observe() runs for every one of them."""
+    random.seed(7)
+    incidents = SecurityIncident(0, "", "", "", "", "", "", db)
+    for offset in range(45):
+        day = (START + timedelta(days=offset)).isoformat()
+        for index, (incident_type, severity) in enumerate(SERIES):
+            #series start on different days and have quiet days in between
+            if offset < index * 5 or (offset % (index + 3) == 1 and offset != 44):
+                continue
+            count = 20 if (incident_type, offset) == ("Phishing", 42) else random.randint(1, 4)
+            for _ in range(count):
+                incidents.insert_incident(day, incident_type, severity, "Open", "test incident", "tester")
+    return db
+
+
+def test_backfill_matches_streaming_state(streamed):
+    streaming = state(streamed)
+    IncidentRateDetector(streamed).backfill()
+    backfilled = state(streamed)
+
+    assert streaming.keys() == backfilled.keys()
+    for key, (day, count, mean, var, days_seen) in streaming.items():
+        b_day, b_count, b_mean, b_var, b_days_seen = backfilled[key]
+        assert (day, count, days_seen) == (b_day, b_count, b_days_seen)
+        assert mean == pytest.approx(b_mean, rel=1e-9, abs=1e-12)
+        assert var == pytest.approx(b_var, rel=1e-9, abs=1e-12)
+
+
+def test_backfill_flags_the_spike(streamed):
+    anomalies = IncidentRateDetector(streamed).backfill(update_state=False)
+    spike_day = (START + timedelta(days=42)).isoformat()
+    flagged = set(zip(anomalies["day"], anomalies["incident_type"]))
+    assert (spike_day, "Phishing") in flagged
+
+
+def test_observe_continues_after_backfill(streamed):
+    detector = IncidentRateDetector(streamed)
+    detector.backfill()
+    next_day = (START + timedelta(days=45)).isoformat()
+    results = [detector.observe(next_day, "Malware", "Low") for _ in range(15)]
+    #a quiet series becomes anomalous once the day's count is far above its mean
+    assert results[0] is False
+    assert results[-1] is True
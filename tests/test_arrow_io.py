@@ -0,0 +1,43 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+from services.arrow_io import ArrowIO
+
+
+def write_tickets(path, rows):
+    columns = ["id", "ticket_id", "priority", "status", "subject", "created_date", "resolved_date"]
+    table = pa.table({column: [row[index] for row in rows] for index, column in enumerate(columns)})
+    pq.write_table(table, path)
+
+
+def test_import_validates_like_csv_ingestion(db, tmp_path):
+    path = tmp_path / "tickets.parquet"
+    write_tickets(path, [
+        (1, "T1", "high", "open", "fine, priority is normalized", "2024-03-01", None),
+        (2, "T2", "Urgent", "Open", "invalid priority", "2024-03-01", None),
+        (3, "T3", "Low", "Open", "resolved too early", "2024-03-05", "2024-03-01"),
+        (4, "T1", "Low", "Open", "duplicate ticket id", "2024-03-01", None),
+    ])
+
+    report = ArrowIO(db, batch_size=2).import_file("ticket", path)
+
+    #T1 again in the second batch clashes with the unique ticket_id, so it is skipped, not rejected
+    assert (report.rows_read, report.inserted, report.skipped) == (4, 1, 1)
+    assert report.rejected["row"].tolist() == [1, 2]
+    assert report.rejected["reason"].tolist() == ["invalid priority", "resolved_date before created_date"]
+    assert db.fetch_all("SELECT ticket_id, priority, status FROM it_tickets") == [("T1", "High", "Open")]
+
+
+def test_import_reports_skipped_ids(db, tmp_path):
+    db.execute_query(
+        "INSERT INTO it_tickets (id, ticket_id, priority, status, subject, created_date) VALUES (7, 'T7', 'Low', 'Open', 'there', '2024-03-01')"
+    )
+    path = tmp_path / "tickets.parquet"
+    write_tickets(path, [
+        (7, "T8", "Low", "Open", "id 7 is taken", "2024-03-02", None),
+        (9, "T9", "Low", "Open", "new", "2024-03-02", None),
+    ])
+
+    report = ArrowIO(db).import_file("ticket", path, keep_ids=True)
+
+    assert (report.rows_read, report.inserted, report.skipped, len(report.rejected)) == (2, 1, 1, 0)
+    assert db.fetch_all("SELECT id, ticket_id FROM it_tickets ORDER BY id") == [(7, "T7"), (9, "T9")]
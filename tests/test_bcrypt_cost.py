@@ -0,0 +1,54 @@
+import time
+import bcrypt
+import pytest
+import services.auth_manager as auth_manager
+from services.auth_manager import AuthManager
+from services.bcrypt_cost import BcryptCost, DEFAULT_COST, get_hash_cost
+from services.login_guard import LoginGuard, PasswordVerifier
+from services.session_store import SessionStore
+
+PASSWORD = "Secret#Pass1"
+
+
+def stored_hash(db, username):
+    return db.fetch_one("SELECT password_hash FROM users WHERE username = ?", (username,))[0]
+
+
+def test_cost_defaults_and_validation(db):
+    cost = BcryptCost(db)
+    assert cost.get_cost() == DEFAULT_COST
+    cost.set_cost(10)
+    assert cost.get_cost() == 10
+    with pytest.raises(ValueError):
+        cost.set_cost(4)
+    assert get_hash_cost("$2b$12$" + "x" * 53) == 12
+    assert get_hash_cost("plain") is None
+
+
+def test_login_rehashes_on_pool_and_keeps_sessions(db, monkeypatch):
+    guard = LoginGuard(verifier=PasswordVerifier(max_workers=1, max_queue=1))
+    monkeypatch.setattr(auth_manager, "get_login_guard", lambda: guard)
+    BcryptCost(db).set_cost(10)
+    auth = AuthManager(db)
+    auth.insert_user("Rehashed", bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8"), "user")
+    old_token = auth.create_session("Rehashed")
+
+    assert auth.login_user("Rehashed", PASSWORD) is True
+    #a cost-only rehash keeps the password, so other devices stay logged in
+    assert SessionStore(db).validate(old_token) is not None
+
+    deadline = time.monotonic() + 10
+    while get_hash_cost(stored_hash(db, "Rehashed")) != 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_hash_cost(stored_hash(db, "Rehashed")) == 10
+    assert auth.login_user("Rehashed", PASSWORD) is True
+
+
+def test_rehash_does_not_overwrite_a_changed_password(db):
+    auth = AuthManager(db)
+    old_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+    auth.insert_user("Changed", old_hash, "user")
+    auth_manager.Hasher(db).change_password("Changed", "Other#Pass22")
+    changed_hash = stored_hash(db, "Changed")
+    auth_manager._rehash_password(db, "Changed", PASSWORD, old_hash, 10)
+    assert stored_hash(db, "Changed") == changed_hash
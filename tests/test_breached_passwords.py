@@ -0,0 +1,72 @@
+import pytest
+import services.breached_passwords as breached_passwords
+from services.auth_manager import AuthManager
+from services.breached_passwords import BloomFilter, is_breached_password
+
+BREACHED = [f"leaked-{i}" for i in range(5_000)] + ["Tr0ub4dor&3x"]
+
+
+@pytest.fixture
+def bloom_path(tmp_path):
+    wordlist = tmp_path / "wordlist.txt"
+    #CRLF endings and blank lines, like most downloaded wordlists
+    wordlist.write_bytes("\r\n".join(BREACHED + [""]).encode("utf-8") + b"\r\n")
+    path = tmp_path / "breached.bloom"
+    assert BloomFilter.build(wordlist, path, false_positive_rate=0.001) == len(BREACHED)
+    return path
+
+
+@pytest.fixture
+def installed_filter(bloom_path, monkeypatch):
+    """Points the process-wide filter at the test filter."""
+    monkeypatch.setattr(breached_passwords, "DEFAULT_PATH", bloom_path)
+    monkeypatch.setattr(breached_passwords, "_FILTER", [])
+    yield bloom_path
+    if breached_passwords._FILTER and breached_passwords._FILTER[0] is not None:
+        breached_passwords._FILTER[0].close()
+
+
+def test_every_added_password_is_found(bloom_path):
+    bloom = BloomFilter(bloom_path)
+    try:
+        assert all(password in bloom for password in BREACHED)
+        assert bloom.get_info()["passwords"] == len(BREACHED)
+    finally:
+        bloom.close()
+
+
+def test_false_positive_rate_is_near_the_target(bloom_path):
+    bloom = BloomFilter(bloom_path)
+    try:
+        false_positives = sum(f"never-leaked-{i}" in bloom for i in range(20_000))
+    finally:
+        bloom.close()
+    #0.1% target, so about 20 of 20,000; allow generous noise
+    assert false_positives < 80
+
+
+def test_rejects_files_that_are_not_filters(tmp_path):
+    path = tmp_path / "not-a-filter.bloom"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        BloomFilter(path)
+
+
+def test_is_breached_password_uses_the_filter(installed_filter):
+    assert is_breached_password("Tr0ub4dor&3x")
+    #built-in common passwords are always rejected
+    assert is_breached_password("Password1!")
+    assert not is_breached_password("Unlisted#Pass9")
+
+
+def test_is_breached_password_without_a_filter(tmp_path, monkeypatch):
+    monkeypatch.setattr(breached_passwords, "DEFAULT_PATH", tmp_path / "missing.bloom")
+    monkeypatch.setattr(breached_passwords, "_FILTER", [])
+    assert is_breached_password("Password1!")
+    assert not is_breached_password("Tr0ub4dor&3x")
+
+
+def test_register_refuses_breached_passwords(db, installed_filter):
+    auth = AuthManager(db)
+    assert auth.register_user("Alice", "Tr0ub4dor&3x", "user") == "breached"
+    assert auth.get_user_by_username("Alice") is None
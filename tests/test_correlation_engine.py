@@ -0,0 +1,44 @@
+import pytest
+from services.correlation_engine import CorrelationEngine
+
+
+@pytest.fixture
+def linked(db):
+    db.execute_many(
+        "INSERT INTO cyber_incidents (date, incident_type, severity, status, description) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("2024-03-10", "Phishing", "High", "Open", "mail"),
+            ("2024-03-10", "Zero Day", "Critical", "Open", "unmapped type"),
+            ("2460000.5", "DDoS", "Low", "Open", "julian day number"),
+        ],
+    )
+    db.execute_many(
+        "INSERT INTO it_tickets (ticket_id, priority, status, category, subject, created_date) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("T1", "High", "Open", "Access", "locked out", "2024-03-11"),
+            ("T2", "Low", "Open", "Network", "slow wifi", "2024-03-09 08:00:00"),
+            ("T3", "Low", "Open", "Access", "julian", "2460001.5"),
+            ("T4", "Low", "Open", "Access", "now", "now"),
+            ("T5", "Low", "Open", "Access", "too late", "2024-03-20"),
+        ],
+    )
+    return db
+
+
+def test_julian_and_now_dates_do_not_break_the_window(linked):
+    #before the fix, 'now' and julian day numbers gave None days and a TypeError
+    pairs = CorrelationEngine(linked).correlate(days_before=1, days_after=3, use_categories=False)
+    phishing = pairs[pairs["incident_type"] == "Phishing"]
+    assert set(phishing["ticket_id"]) == {"T1", "T2"}
+    ddos = pairs[pairs["incident_type"] == "DDoS"]
+    assert set(ddos["ticket_id"]) == {"T3"}
+    assert ddos["lag_days"].tolist() == [1]
+
+
+def test_unmapped_incident_types_match_nothing(linked):
+    pairs = CorrelationEngine(linked).correlate(days_before=1, days_after=3)
+    assert "Zero Day" not in set(pairs["incident_type"])
+    assert set(pairs[pairs["incident_type"] == "Phishing"]["ticket_id"]) == {"T1"}
+    #an empty map switches category matching off
+    pairs = CorrelationEngine(linked, category_map={}).correlate(days_before=1, days_after=3)
+    assert set(pairs[pairs["incident_type"] == "Zero Day"]["ticket_id"]) == {"T1", "T2"}
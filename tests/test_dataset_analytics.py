@@ -0,0 +1,46 @@
+import pytest
+from models.dataset import Dataset
+
+
+@pytest.fixture
+def datasets(db):
+    db.execute_many(
+        """
+        INSERT INTO datasets_metadata (dataset_name, category, source, last_updated, record_count, file_size_mb)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            ("alpha", "Finance", "API", "2024-01-10", 1000, 10.0),
+            ("beta", "Health", "Upload", "2024-02-05", 500, 50.0),
+        ],
+    )
+    return Dataset(0, "", 0, 0, "", db)
+
+
+def history_day(db, dataset_name, day):
+    """Moves today's history row of a dataset to a fixed day, so tests do not depend on the date."""
+    db.execute_query(
+        "UPDATE dataset_record_history SET day = ? WHERE day = date('now') AND dataset_id = (SELECT id FROM datasets_metadata WHERE dataset_name = ?)",
+        (day, dataset_name),
+    )
+
+
+def test_growth_follows_record_count_updates(db, datasets):
+    db.execute_query("UPDATE datasets_metadata SET record_count = 3000 WHERE dataset_name = 'alpha'")
+    history_day(db, "alpha", "2024-03-15")
+
+    records = datasets.get_storage_growth(granularity="month", measure="records")
+    assert records["total_records"].tolist() == [1000, 1500, 3500]
+
+    #size per record of alpha is now 10 MB / 3000 records
+    size = datasets.get_storage_growth(granularity="month", group_by="category")
+    assert size.loc[size.index[-1], "Finance"] == pytest.approx(10.0)
+    assert size.loc[size.index[0], "Finance"] == pytest.approx(10.0 / 3, abs=0.01)
+    assert size.loc[size.index[-1], "Health"] == pytest.approx(50.0)
+
+
+def test_growth_rejects_unknown_arguments(datasets):
+    with pytest.raises(ValueError):
+        datasets.get_storage_growth(group_by="owner")
+    with pytest.raises(ValueError):
+        datasets.get_storage_growth(measure="rows")
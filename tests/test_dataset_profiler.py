@@ -0,0 +1,17 @@
+from services.dataset_profiler import DatasetProfiler
+
+
+def test_quoted_multiline_fields_are_one_row(tmp_path):
+    path = tmp_path / "notes.csv"
+    with open(path, "w", newline="") as file:
+        file.write("id,note,value\n")
+        for i in range(200):
+            file.write(f'{i},"first line\nsecond ""quoted"" line\nthird",{i}\n')
+        file.write("200,plain,200")
+
+    #tiny chunks would cut through the quoted fields if they split at any newline
+    for chunk_size in (16, 1000, 1 << 20):
+        profile = DatasetProfiler(db=None, workers=1, chunk_size=chunk_size).profile_files([path]).iloc[0]
+        assert profile["row_count"] == 201
+        assert profile["column_stats"]["value"] == {"non_null": 201, "nulls": 0, "min": 0.0, "max": 200.0, "mean": 100.0}
+        assert profile["column_stats"]["note"]["non_null"] == 201
@@ -0,0 +1,52 @@
+import pytest
+from models.it_ticket import ITTicket
+from services.duplicate_detector import DuplicateDetector
+
+PRINTER = "Printer on floor 3 is jammed and shows paper error"
+VPN = "VPN connection drops every few minutes when working from home"
+
+
+@pytest.fixture
+def tickets(db):
+    model = ITTicket(0, "", "", "", "", db)
+    for ticket_id, priority, subject in (("T1", "Low", PRINTER), ("T2", "High", VPN)):
+        model.insert_ticket(ticket_id, priority, "Open", "Hardware", subject, "", "2024-03-10", None, "", "2024-03-10")
+    DuplicateDetector(db).index_new_records("ticket")
+    return model
+
+
+def ticket_ids(duplicates):
+    return set(duplicates["id"])
+
+
+def test_check_new_record_finds_and_indexes(db, tickets):
+    detector = DuplicateDetector(db)
+    new_id = tickets.insert_ticket("T3", "Low", "Open", "Hardware", PRINTER, "", "2024-03-11", None, "", "2024-03-11")
+    assert ticket_ids(detector.check_new_record("ticket", new_id, f"{PRINTER} ")) == {1}
+    #the new ticket is indexed, so nothing is left for index_new_records
+    assert detector.index_new_records("ticket") == 0
+    assert new_id in ticket_ids(detector.find_duplicates("ticket", PRINTER))
+
+
+def test_edited_text_is_resigned(db, tickets):
+    detector = DuplicateDetector(db)
+    tickets.update_ticket(1, "subject", VPN)
+    assert ticket_ids(detector.find_duplicates("ticket", VPN)) == {1, 2}
+    assert ticket_ids(detector.find_duplicates("ticket", PRINTER)) == set()
+
+
+def test_bulk_update_by_filter_is_resigned(db, tickets):
+    detector = DuplicateDetector(db)
+    tickets.bulk_update_tickets("subject", VPN, filters={"priority": "Low"})
+    assert ticket_ids(detector.find_duplicates("ticket", VPN)) == {1, 2}
+    assert db.fetch_one("SELECT COUNT(*) FROM lsh_buckets WHERE domain = 'ticket' AND record_id = 1")[0] == 16
+
+
+def test_raw_update_and_delete_drop_the_signature(db, tickets):
+    detector = DuplicateDetector(db)
+    db.execute_query("UPDATE it_tickets SET description = 'changed' WHERE id = 2")
+    db.execute_query("DELETE FROM it_tickets WHERE id = 1")
+    assert db.fetch_all("SELECT record_id FROM minhash_signatures WHERE domain = 'ticket'") == []
+    assert db.fetch_one("SELECT COUNT(*) FROM lsh_buckets WHERE domain = 'ticket'")[0] == 0
+    #only the edited ticket is signed again
+    assert detector.index_new_records("ticket") == 1
@@ -0,0 +1,48 @@
+import csv
+import gzip
+import io
+import pyarrow.parquet as pq
+import pytest
+import streamlit as st
+from services.export_service import TableExporter
+
+
+@pytest.fixture
+def incidents(db):
+    db.execute_many(
+        "INSERT INTO cyber_incidents (date, incident_type, severity, status, description, reported_by) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"2024-01-{day:02d}", "Phishing", "High" if day % 2 else "Low", "Open", f"incident {day}", "tester") for day in range(1, 11)],
+    )
+    return db
+
+
+def test_csv_export_round_trip(incidents):
+    data, exported = TableExporter(incidents).export_bytes("incident", "csv", filters={"severity": "High"})
+    rows = list(csv.reader(io.StringIO(gzip.decompress(data).decode("utf-8"))))
+    assert exported == 5
+    assert len(rows) == 6
+    assert {row[rows[0].index("severity")] for row in rows[1:]} == {"High"}
+
+
+def test_parquet_export_columns(incidents):
+    data, exported = TableExporter(incidents).export_bytes("incident", "parquet", columns=["id", "severity"])
+    table = pq.read_table(io.BytesIO(data))
+    assert exported == table.num_rows == 10
+    assert table.column_names == ["id", "severity"]
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_export_is_accepted_by_download_button(incidents, file_format):
+    exporter = TableExporter(incidents)
+    data, _ = exporter.export_bytes("incident", file_format)
+    file_name, mime = exporter.file_info("incidents", file_format)
+    #raises StreamlitAPIException for payload types it cannot send
+    st.download_button("Download", data=data, file_name=file_name, mime=mime, key=f"download_{file_format}")
+
+
+def test_invalid_domain_and_column(incidents):
+    exporter = TableExporter(incidents)
+    with pytest.raises(ValueError):
+        exporter.export_bytes("users")
+    with pytest.raises(ValueError):
+        exporter.export_bytes("incident", columns=["password"])
@@ -0,0 +1,76 @@
+import threading
+import bcrypt
+import pytest
+import services.auth_manager as auth_manager
+from services.auth_manager import AuthManager
+from services.login_guard import LoginGuard, PasswordVerifier, TokenBucketLimiter
+
+PASSWORD = "Secret#Pass1"
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    return bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+class BlockingVerifier:
+    """Stands in for a saturated bcrypt pool."""
+
+    def verify(self, plain_text_password, password_hash):
+        return None
+
+    def get_metrics(self):
+        return {}
+
+
+def test_token_bucket_refuses_after_capacity():
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.0001)
+    assert [limiter.allow("user:a") for _ in range(4)] == [True, True, True, False]
+    #other keys have their own bucket
+    assert limiter.allow("user:b")
+
+
+def test_verifier_checks_passwords(password_hash):
+    verifier = PasswordVerifier(max_workers=1, max_queue=1)
+    assert verifier.verify(PASSWORD, password_hash) is True
+    assert verifier.verify("wrong", password_hash) is False
+    assert verifier.verify(PASSWORD, "not a hash") is False
+    assert verifier.get_metrics()["completed"] == 3
+
+
+def test_verifier_refuses_when_full(password_hash):
+    verifier = PasswordVerifier(max_workers=1, max_queue=0, timeout_seconds=30)
+    slow_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=12)).decode("utf-8")
+    worker = threading.Thread(target=verifier.verify, args=(PASSWORD, slow_hash))
+    worker.start()
+    while verifier.get_metrics()["running"] == 0:
+        pass
+    assert verifier.verify(PASSWORD, password_hash) is None
+    worker.join()
+    assert verifier.get_metrics()["refused_busy"] == 1
+
+
+def test_verifier_timeout_returns_none_and_frees_slots(password_hash):
+    slow_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=12)).decode("utf-8")
+    verifier = PasswordVerifier(max_workers=1, max_queue=0, timeout_seconds=0.05)
+    assert verifier.verify(PASSWORD, slow_hash) is None
+    assert verifier.get_metrics()["timed_out"] == 1
+    #the only slot comes back once the abandoned check finishes
+    while verifier.get_metrics()["running"]:
+        pass
+    assert verifier.verify(PASSWORD, password_hash) is True
+
+
+def test_login_reports_rate_limit_and_busy(db, password_hash, monkeypatch):
+    auth = AuthManager(db)
+    auth.insert_user("Guarded", password_hash, "user")
+
+    monkeypatch.setattr(auth_manager, "get_login_guard", lambda: LoginGuard(verifier=BlockingVerifier()))
+    assert auth.login_user("Guarded", PASSWORD) == "busy"
+
+    guard = LoginGuard(verifier=PasswordVerifier(max_workers=1, max_queue=1))
+    monkeypatch.setattr(auth_manager, "get_login_guard", lambda: guard)
+    results = [auth.login_user("Guarded", "wrong", client_id="10.0.0.1") for _ in range(6)]
+    assert results[:5] == [False] * 5
+    assert results[5] == "rate_limited"
+    assert guard.get_metrics()["rate_limited"] == 1
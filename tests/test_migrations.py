@@ -0,0 +1,32 @@
+from models.dataset import Dataset
+from models.it_ticket import ITTicket
+from models.security_incident import SecurityIncident
+from services.data_validation import ingest_csv_once
+
+
+def count(db, table):
+    return db.fetch_one(f"SELECT COUNT(*) FROM {table}")[0]
+
+
+def test_migrations_load_the_csv_files_once(db):
+    incidents = SecurityIncident(0, "", "", "", "", "", "", db)
+    datasets = Dataset(0, "", 0, 0, "", db)
+    tickets = ITTicket(0, "", "", "", "", db)
+    assert incidents.migrate_incidents() and datasets.migrate_datasets() and tickets.migrate_tickets()
+    loaded = {table: count(db, table) for table in ("cyber_incidents", "datasets_metadata", "it_tickets")}
+    assert all(loaded.values())
+
+    #page reruns
+    for _ in range(2):
+        assert not incidents.migrate_incidents()
+        assert not datasets.migrate_datasets()
+        assert not tickets.migrate_tickets()
+    assert {table: count(db, table) for table in loaded} == loaded
+
+
+def test_tables_filled_before_the_record_are_not_loaded_again(db, tmp_path):
+    path = tmp_path / "incidents.csv"
+    path.write_text("date,incident_type,severity,status\n2024-03-10,Phishing,High,Open\n", encoding="utf-8")
+    db.execute_query("INSERT INTO cyber_incidents (date, incident_type, severity, status) VALUES ('2024-03-10', 'Phishing', 'High', 'Open')")
+    assert ingest_csv_once(db, "incident", path) is None
+    assert count(db, "cyber_incidents") == 1
@@ -0,0 +1,29 @@
+from services.password_strength import PasswordStrengthEstimator, load_words
+
+
+def test_word_list_is_deduplicated_in_rank_order(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("# comment\nPassword\nflower\n\npassword\nginger\nflower\n", encoding="utf-8")
+    assert load_words(path) == ["password", "flower", "ginger"]
+
+
+def test_shipped_word_list_has_no_repeats():
+    words = load_words()
+    assert len(words) > 500
+    assert words[:2] == ["123456", "password"]
+    assert words.count("flower") == words.count("ginger") == words.count("daniel") == 1
+
+
+def test_rank_follows_frequency():
+    words = ["dragon"] + [f"word{i:03d}" for i in range(100)] + ["monkey"]
+    estimator = PasswordStrengthEstimator(words)
+    assert estimator.estimate("dragon").guesses < estimator.estimate("monkey").guesses == 102
+
+
+def test_long_repeats_use_a_flat_unit_guess():
+    estimator = PasswordStrengthEstimator(["dragon"])
+    estimate = estimator.estimate("dragon" * 20)
+    assert [match.pattern for match in estimate.matches] == ["repeat"]
+    #rank 1 word repeated 20 times
+    assert estimate.guesses == 20
+    assert estimator.estimate("xq7" * 30).guesses == 26 * 26 * 10 * 30
@@ -0,0 +1,38 @@
+from services.principal_cache import PrincipalCache
+
+
+class RacingDb:
+    """Returns a row and, like a concurrent change_password, invalidates the user during the query."""
+
+    def __init__(self, cache, rows):
+        self.cache = cache
+        self.rows = rows
+        self.queries = 0
+
+    def fetch_one(self, sql, params):
+        self.queries += 1
+        row = self.rows.get(params[0])
+        self.cache.invalidate(params[0])
+        return row
+
+
+def test_a_row_read_during_an_invalidation_is_not_stored():
+    cache = PrincipalCache()
+    db = RacingDb(cache, {"Alice": ("Alice", "old-hash", "user")})
+    assert cache.get(db, "Alice").password_hash == "old-hash"
+    db.rows["Alice"] = ("Alice", "new-hash", "user")
+    #the stale row was not cached, so the new hash is read
+    assert cache.get(db, "Alice").password_hash == "new-hash"
+    assert db.queries == 2
+
+
+def test_rows_are_cached_but_misses_are_not(db):
+    cache = PrincipalCache()
+    assert cache.get(db, "Bob") is None
+    db.execute_query("INSERT INTO users (username, password_hash, role) VALUES ('Bob', 'hash', 'user')")
+    #without any invalidation the new user is found at once
+    assert cache.get(db, "Bob").role == "user"
+    db.execute_query("UPDATE users SET role = 'admin' WHERE username = 'Bob'")
+    assert cache.get(db, "Bob").role == "user"
+    cache.invalidate("Bob")
+    assert cache.get(db, "Bob").role == "admin"
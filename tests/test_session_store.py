@@ -0,0 +1,41 @@
+import time
+from services.session_store import SessionStore
+
+
+def test_create_validate_and_revoke(db):
+    store = SessionStore(db)
+    token = store.create("Alice", "admin")
+    assert store.validate(token) == ("Alice", "admin")
+    assert store.validate("unknown") is None
+    store.revoke(token)
+    assert store.validate(token) is None
+
+
+def test_revoke_user_keeps_current_session(db):
+    store = SessionStore(db)
+    current = store.create("Alice", "user")
+    other = store.create("Alice", "user")
+    someone_else = store.create("Bob", "user")
+    assert store.revoke_user("Alice", keep_token=current) == 1
+    assert store.validate(current) == ("Alice", "user")
+    assert store.validate(other) is None
+    assert store.validate(someone_else) == ("Bob", "user")
+    assert store.revoke_user("Alice") == 1
+    assert store.validate(current) is None
+
+
+def test_expired_sessions_are_rejected_and_swept(db):
+    store = SessionStore(db, ttl_seconds=0.05)
+    token = store.create("Alice", "user")
+    time.sleep(0.1)
+    assert store.validate(token) is None
+    store.create("Bob", "user")
+    time.sleep(0.1)
+    assert store.sweep() == 1
+
+
+def test_ensure_tables_runs_ddl_once(db, capsys):
+    db.ensure_tables()
+    assert "All tables created" in capsys.readouterr().out
+    db.ensure_tables()
+    assert capsys.readouterr().out == ""
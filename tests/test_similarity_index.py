@@ -0,0 +1,49 @@
+from models.security_incident import SecurityIncident
+from services.similarity_index import TfidfIndex, get_similarity_index
+
+
+def insert_incidents(db, descriptions):
+    db.execute_many(
+        "INSERT INTO cyber_incidents (date, incident_type, severity, status, description) VALUES (?, ?, ?, ?, ?)",
+        [("2024-03-10", "Malware", "High", "Open", description) for description in descriptions],
+    )
+
+
+def test_edits_and_deletes_reach_the_index(db):
+    insert_incidents(db, ["phishing mail with invoice link", "usb stick left in lobby", "ransomware encrypted laptop"])
+    model = SecurityIncident(0, "", "", "", "", "", "", db)
+    assert model.find_similar_incidents(text="phishing invoice")["id"].tolist()[:1] == [1]
+
+    db.execute_query("UPDATE cyber_incidents SET description = 'ransomware encrypted server' WHERE id = 1")
+    db.execute_query("DELETE FROM cyber_incidents WHERE id = 3")
+
+    similar = model.find_similar_incidents(text="ransomware encrypted server")
+    assert similar["id"].tolist()[0] == 1
+    assert 3 not in similar["id"].tolist()
+    assert model.find_similar_incidents(text="phishing invoice").empty
+    assert len(get_similarity_index("incident", db)) == 2
+
+
+def test_indexes_are_kept_per_database(db, tmp_path):
+    from services.database_manager import DatabaseManager
+    other = DatabaseManager()
+    other._DatabaseManager__db_path = tmp_path / "other.db"
+    other.create_all_tables()
+    insert_incidents(db, ["phishing mail"])
+    assert get_similarity_index("incident", db) is not get_similarity_index("incident", other)
+    assert len(get_similarity_index("incident", other)) == 0
+    other.close()
+
+
+def test_scores_match_a_full_recompute():
+    index = TfidfIndex("incident", "cyber_incidents", "description")
+    index.add_documents([(1, "phishing mail invoice"), (2, "phishing link"), (3, "malware on laptop")])
+    before = index.query("phishing invoice", top_k=3)
+    index.add_documents([(4, "invoice fraud"), (2, "laptop stolen")])
+    index.remove_documents([3])
+
+    fresh = TfidfIndex("incident", "cyber_incidents", "description")
+    fresh.add_documents([(1, "phishing mail invoice"), (2, "laptop stolen"), (4, "invoice fraud")])
+    assert index.query("phishing invoice", top_k=3) == fresh.query("phishing invoice", top_k=3)
+    assert index.similar_to(1) == fresh.similar_to(1)
+    assert before != index.query("phishing invoice", top_k=3)
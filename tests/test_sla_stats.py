@@ -0,0 +1,24 @@
+from models.it_ticket import ITTicket
+
+
+def test_priorities_without_a_target_have_zero_breaches(db):
+    db.execute_many(
+        "INSERT INTO it_tickets (ticket_id, priority, status, category, subject, created_date, resolved_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("T1", "Urgent", "Resolved", "Access", "no target", "2024-03-01", "2024-03-20"),
+            ("T2", "High", "Resolved", "Access", "late", "2024-03-01", "2024-03-10"),
+            ("T3", "High", "Resolved", "Network", "on time", "2024-03-01", "2024-03-02"),
+        ],
+    )
+    model = ITTicket(0, "", "", "", "", db)
+
+    by_priority = model.get_sla_stats("priority").set_index("priority")
+    assert by_priority.loc["Urgent", "breaches"] == 0
+    assert by_priority.loc["Urgent", "breach_rate_pct"] == 0.0
+    assert by_priority.loc["High", "breaches"] == 1
+    assert by_priority.loc["High", "breach_rate_pct"] == 50.0
+
+    by_category = model.get_sla_stats("category").set_index("category")
+    assert by_category.loc["Access", "breaches"] == 1
+    assert by_category.loc["Network", "breaches"] == 0
+    assert not by_category[["breaches", "breach_rate_pct"]].isna().any().any()
@@ -0,0 +1,51 @@
+from services.ticket_assigner import TicketAssigner
+
+
+def test_assign_unassigned_only_returns_changed_rows(db, monkeypatch):
+    db.execute_many(
+        "INSERT INTO it_tickets (ticket_id, priority, status, category, subject, created_date) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"T{i}", "Low", "Open", "Network", "wifi", f"2024-03-0{i}") for i in range(1, 4)],
+    )
+    assigner = TicketAssigner(db, assignees=["Alice", "Bob"])
+    pick = assigner.pick_assignee
+
+    def pick_while_someone_assigns_by_hand(category):
+        #T2 is assigned by hand and T3 closed after they were read, before they are saved
+        db.execute_query("UPDATE it_tickets SET assigned_to = 'Carol' WHERE ticket_id = 'T2'")
+        db.execute_query("UPDATE it_tickets SET status = 'Closed' WHERE ticket_id = 'T3'")
+        return pick(category)
+
+    monkeypatch.setattr(assigner, "pick_assignee", pick_while_someone_assigns_by_hand)
+    assigned = assigner.assign_unassigned()
+
+    assert assigned["ticket_id"].tolist() == ["T1"]
+    rows = dict(db.fetch_all("SELECT ticket_id, assigned_to FROM it_tickets"))
+    assert rows == {"T1": assigned["assigned_to"].iloc[0], "T2": "Carol", "T3": None}
+    #the skipped tickets do not count against anyone's load
+    workload = assigner.get_workload().set_index("assigned_to")["open_tickets"]
+    assert workload[["Alice", "Bob"]].sum() == 1
+
+
+def test_reassign_releases_the_old_assignee_only_when_the_ticket_moves(db, monkeypatch):
+    db.execute_many(
+        "INSERT INTO it_tickets (ticket_id, priority, status, category, subject, created_date, assigned_to) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [("T1", "Low", "Open", "Network", "wifi", "2024-03-01", "Alice"),
+         ("T2", "Low", None, "Network", "no status", "2024-03-02", "Alice")],
+    )
+    assigner = TicketAssigner(db, assignees=["Bob"], affinity_weight=0)
+    #tickets without a status are open
+    assert assigner.get_workload().set_index("assigned_to").loc["Alice", "open_tickets"] == 2
+    pick = assigner.pick_assignee
+
+    def pick_while_t1_is_closed(category):
+        db.execute_query("UPDATE it_tickets SET status = 'Closed' WHERE ticket_id = 'T1'")
+        return pick(category)
+
+    monkeypatch.setattr(assigner, "pick_assignee", pick_while_t1_is_closed)
+    assigned = assigner.assign_tickets([1, 2])
+
+    assert assigned["ticket_id"].tolist() == ["T2"]
+    workload = assigner.get_workload().set_index("assigned_to")["open_tickets"]
+    #T1 never moved, so it still counts for Alice; T2 moved to Bob
+    assert workload["Alice"] == 1
+    assert workload["Bob"] == 1
@@ -0,0 +1,13 @@
+from models.user import User
+
+
+def test_admin_role_is_case_insensitive(db):
+    db.execute_many(
+        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+        [("Registered", "hash", "Admin"), ("Imported", "hash", "admin"), ("Analyst", "hash", "Analyst")],
+    )
+    user = User("", "", "", db)
+    assert user.is_admin("Registered")
+    assert user.is_admin("Imported")
+    assert not user.is_admin("Analyst")
+    assert not user.is_admin("Missing")
@@ -0,0 +1,32 @@
+import io
+import bcrypt
+from services.auth_manager import AuthManager
+from services.bcrypt_cost import BcryptCost
+from services.user_import import UserImporter
+
+
+def test_plaintext_passwords_keep_their_spaces_and_roles_are_normalized(db):
+    BcryptCost(db).set_cost(10)
+    source = io.StringIO(
+        "username, password, role\n"
+        "alice,  Leading#Space1 ,ADMIN\n"
+        "bob,Plain#Pass22,it specialist\n"
+        "carol,Other#Pass33,superuser\n"
+    )
+    report = UserImporter(db, workers=1).import_plaintext(source)
+
+    assert report.inserted == 2
+    assert report.rejected[["username", "reason"]].values.tolist() == [["Carol", "invalid role"]]
+    rows = {username: (password_hash, role) for username, password_hash, role in db.fetch_all("SELECT username, password_hash, role FROM users")}
+    assert rows["Alice"][1] == "Admin" and rows["Bob"][1] == "It Specialist"
+    #the password is hashed exactly as written, spaces included
+    assert bcrypt.checkpw(b"  Leading#Space1 ", rows["Alice"][0].encode("utf-8"))
+    assert AuthManager(db).login_user("Alice", "  Leading#Space1 ") is True
+
+
+def test_hashed_lines_are_trimmed_and_roles_normalized(db):
+    password_hash = bcrypt.hashpw(b"Secret#Pass1", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    source = io.StringIO(f"dave, {password_hash}, admin\n")
+    report = UserImporter(db, workers=1).import_hashed(source)
+    assert report.inserted == 1
+    assert db.fetch_one("SELECT password_hash, role FROM users WHERE username = 'Dave'") == (password_hash, "Admin")